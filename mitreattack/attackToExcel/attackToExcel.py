@@ -1,21 +1,69 @@
 """Functions to convert ATT&CK STIX data to Excel, as well as entrypoint for attackToExcel_cli."""
 
 import argparse
+import contextlib
+import json
+import math
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List
 
+import numpy as np
 import pandas as pd
 import requests
+import stix2
+import xlsxwriter
 from loguru import logger
 from stix2 import MemoryStore
+from stix2.serialization import STIXJSONEncoder
+
+from mitreattack import release_info
 
 # import mitreattack.attackToExcel.stixToDf as stixToDf
 from mitreattack.attackToExcel import stixToDf
+from mitreattack.attackToExcel.dataframeCache import DataFrameCache
+from mitreattack.attackToExcel.exportProfiler import ExportProfiler, profile_stage, profiled
+from mitreattack.stix20.columnar import import_pyarrow
+from mitreattack.worker_pool import get_worker_pool
 
 INVALID_CHARACTERS = ["\\", "/", "*", "[", "]", ":", "?"]
 SUB_CHARACTERS = ["\\", "/"]
 
+# object types of the dataframes built by build_dataframes, in the order they are returned
+DATAFRAME_TYPES = [
+    "techniques",
+    "tactics",
+    "software",
+    "groups",
+    "campaigns",
+    "assets",
+    "mitigations",
+    "matrices",
+    "relationships",
+    "datasources",
+]
+
+# domain data used by the worker processes of build_dataframes
+_worker_state = {}
+
+DOMAINS = ["enterprise-attack", "mobile-attack", "ics-attack"]
+
+# output formats of export, each written by write_<format>
+OUTPUT_FORMATS = ["xlsx", "csv", "parquet", "feather"]
+
+# the only columns of the Parquet and Feather files that are not string or categorical columns
+BOOLEAN_COLUMNS = {"is sub-technique"}
+
+
+def _get_cti_url(domain: str, version: str = None) -> str:
+    """Get the URL of a domain's STIX bundle on MITRE/CTI, for the given version or the latest version."""
+    if version:
+        return f"https://raw.githubusercontent.com/mitre/cti/ATT%26CK-{version}/{domain}/{domain}.json"
+    return f"https://raw.githubusercontent.com/mitre/cti/master/{domain}/{domain}.json"
+
 
+@profiled()
 def get_stix_data(domain: str, version: str = None, remote: str = None, stix_file: str = None) -> MemoryStore:
     """Download the ATT&CK STIX data for the given domain and version from MITRE/CTI (or just domain if a remote workbench is specified).
 
@@ -67,18 +115,77 @@ def get_stix_data(domain: str, version: str = None, remote: str = None, stix_fil
             mem_store = MemoryStore(stix_json)
         else:
             logger.info("Downloading ATT&CK data from github.com/mitre/cti")
-            if version:
-                url = f"https://raw.githubusercontent.com/mitre/cti/ATT%26CK-{version}/{domain}/{domain}.json"
-            else:
-                url = f"https://raw.githubusercontent.com/mitre/cti/master/{domain}/{domain}.json"
-
-            stix_json = requests.get(url).json()
+            stix_json = requests.get(_get_cti_url(domain=domain, version=version)).json()
             mem_store = MemoryStore(stix_data=stix_json["objects"])
 
     return mem_store
 
 
-def build_dataframes(src: MemoryStore, domain: str) -> Dict:
+def _build_object_dataframes(object_type: str, src, domain: str, context, relationships: Dict, cache_dir: str = None):
+    """Build the dataframes of a single ATT&CK type for build_dataframes."""
+    builders = {
+        "techniques": lambda: stixToDf.techniquesToDf(src, domain, relationships=relationships, context=context),
+        "tactics": lambda: stixToDf.tacticsToDf(src, context=context),
+        "software": lambda: stixToDf.softwareToDf(src, relationships=relationships, context=context),
+        "groups": lambda: stixToDf.groupsToDf(src, relationships=relationships, context=context),
+        "campaigns": lambda: stixToDf.campaignsToDf(src, relationships=relationships, context=context),
+        "assets": lambda: stixToDf.assetsToDf(src, relationships=relationships, context=context),
+        "mitigations": lambda: stixToDf.mitigationsToDf(src, relationships=relationships, context=context),
+        "matrices": lambda: stixToDf.matricesToDf(src, domain, context=context, cache_dir=cache_dir),
+        "relationships": lambda: relationships,
+        "datasources": lambda: stixToDf.datasourcesToDf(src, relationships=relationships, context=context),
+    }
+    return builders[object_type]()
+
+
+def _init_worker(stix_json: str, domain: str, relationships: Dict, cache_dir: str = None):
+    """Load the domain data in a worker process that did not inherit it from the parent process."""
+    src = MemoryStore(stix_data=json.loads(stix_json))
+    _worker_state.update(
+        src=src,
+        domain=domain,
+        context=stixToDf.StixIndexContext(src),
+        relationships=relationships,
+        cache_dir=cache_dir,
+    )
+
+
+def _build_in_worker(object_type: str):
+    return _build_object_dataframes(object_type, **_worker_state)
+
+
+def _build_object_types(
+    object_types: List, src, domain: str, context, relationships: Dict, workers: int = None, cache_dir: str = None
+):
+    """Build the dataframes of the given object types for build_dataframes, in worker processes if `workers` > 1."""
+    object_types = [object_type for object_type in object_types if object_type != "relationships"]
+    if not workers or workers <= 1 or len(object_types) <= 1:
+        return {
+            object_type: _build_object_dataframes(object_type, src, domain, context, relationships, cache_dir=cache_dir)
+            for object_type in object_types
+        }
+
+    max_workers = min(workers, len(object_types))
+    executor = get_worker_pool(
+        max_workers=max_workers,
+        worker_state=_worker_state,
+        state=dict(src=src, domain=domain, context=context, relationships=relationships, cache_dir=cache_dir),
+        initializer=_init_worker,
+        get_initargs=lambda: (json.dumps(src.query(), cls=STIXJSONEncoder), domain, relationships, cache_dir),
+    )
+
+    logger.info(f"Building dataframes with {max_workers} worker processes")
+    try:
+        with executor, profile_stage("build in worker processes", workers=max_workers):
+            futures = {object_type: executor.submit(_build_in_worker, object_type) for object_type in object_types}
+            # merge in a fixed order, regardless of which builders finish first
+            return {object_type: future.result() for object_type, future in futures.items()}
+    finally:
+        _worker_state.clear()
+
+
+@profiled()
+def build_dataframes(src: MemoryStore, domain: str, workers: int = None, cache_dir: str = None) -> Dict:
     """Build pandas dataframes for each attack type, and return a dictionary lookup for each type to the relevant dataframe.
 
     :returns:
@@ -89,28 +196,259 @@ def build_dataframes(src: MemoryStore, domain: str) -> Dict:
         MemoryStore or other stix2 DataSource object
     domain : str
         domain of ATT&CK src corresponds to, e.g "enterprise-attack"
+    workers : int, optional
+        number of worker processes to build the dataframes of the ATT&CK types in parallel, by default None, which
+        builds them one after the other in the current process. Where "fork" is the default multiprocessing start
+        method, worker processes are forked and share the data already loaded in `src`; otherwise each worker
+        process loads a copy of it.
+    cache_dir : str, optional
+        directory of a `DataFrameCache` to reuse the dataframes of previous builds from, by default None. If `src`
+        is unchanged, every dataframe is loaded from the cache. Otherwise only the dataframes of the ATT&CK types
+        whose objects or relationships changed are built, and the new dataframes are added to the cache. The
+        matrix layouts are cached in the same directory.
 
     Returns
     -------
     dict
         A dict lookup of each ATT&CK type to dataframes for the given type to be ingested by write_excel
     """
-    df = {
-        "techniques": stixToDf.techniquesToDf(src, domain),
-        "tactics": stixToDf.tacticsToDf(src),
-        "software": stixToDf.softwareToDf(src),
-        "groups": stixToDf.groupsToDf(src),
-        "campaigns": stixToDf.campaignsToDf(src),
-        "assets": stixToDf.assetsToDf(src),
-        "mitigations": stixToDf.mitigationsToDf(src),
-        "matrices": stixToDf.matricesToDf(src, domain),
-        "relationships": stixToDf.relationshipsToDf(src),
-        "datasources": stixToDf.datasourcesToDf(src)
-    }
-    return df
+    cache = None
+    if cache_dir:
+        cache = DataFrameCache(cache_dir)
+        with profile_stage("load cached bundle"):
+            object_hashes = cache.hash_objects(src)
+            bundle_key = cache.get_bundle_key(domain, object_hashes)
+            type_keys = cache.load(bundle_key)
+            cached = None
+            if type_keys is not None:
+                cached = {object_type: cache.load(type_key) for object_type, type_key in type_keys.items()}
+        if cached is not None and all(dataframes is not None for dataframes in cached.values()):
+            logger.info(f"Loaded all dataframes from cache: {cache_dir}")
+            return {object_type: cached[object_type] for object_type in DATAFRAME_TYPES}
+
+    # index the domain data and parse the relationships once, to be shared by the builders of each object type
+    with profile_stage("StixIndexContext"):
+        context = stixToDf.StixIndexContext(src)
+    relationships = stixToDf.relationshipsToDf(src, context=context)
+
+    built = {"relationships": relationships}
+    object_types = DATAFRAME_TYPES
+    if cache:
+        with profile_stage("load cached dataframes"):
+            type_keys = {
+                object_type: cache.get_type_key(object_type, domain, object_hashes, relationships)
+                for object_type in DATAFRAME_TYPES
+            }
+            cached = {object_type: cache.load(type_key) for object_type, type_key in type_keys.items()}
+        object_types = [object_type for object_type in DATAFRAME_TYPES if cached[object_type] is None]
+        built.update(
+            (object_type, cached[object_type]) for object_type in DATAFRAME_TYPES if object_type not in object_types
+        )
+        logger.info(f"Loaded dataframes from cache for {len(DATAFRAME_TYPES) - len(object_types)} ATT&CK types")
+
+    built.update(
+        _build_object_types(object_types, src, domain, context, relationships, workers=workers, cache_dir=cache_dir)
+    )
+
+    if cache:
+        with profile_stage("store cached dataframes"):
+            for object_type in object_types:
+                cache.store(type_keys[object_type], built[object_type])
+            cache.store(bundle_key, type_keys)
+
+    return {object_type: built[object_type] for object_type in DATAFRAME_TYPES}
+
+
+def _get_matrix_sheet_name(matrix: Dict, matrix_count: int) -> str:
+    """Get the sheet name of a matrix, which is named after the matrix if the domain has several matrices."""
+    sheetname = "matrix" if matrix_count == 1 else matrix["name"] + " matrix"
+    for character in INVALID_CHARACTERS:
+        sheetname = sheetname.replace(character, " or " if character in SUB_CHARACTERS else " ")
+
+    if len(sheetname) > 31:
+        sheetname = sheetname[0:28] + "..."
+    return sheetname
+
+
+def _format_matrix_sheet(book, sheet, matrix: Dict):
+    """Format a worksheet the unformatted matrix data has been written to for readability."""
+    # define column border styles
+    borderleft = book.add_format({"left": 1, "shrink": 1})
+    borderright = book.add_format({"right": 1, "shrink": 1})
+
+    # formats only need to be defined once: pointers stored here for subsequent uses
+    formats = {}
+
+    # set all columns to 20 width, and add text shrinking to fit
+    sheet.set_column(0, matrix["columns"], width=20)
+
+    # merge supertechniques and tactic headers if sub-techniques are present on a tactic
+    for merge_range in matrix["merge"]:
+        # sometimes merge ranges have formats to add to the merged range
+        if merge_range.format:
+            # add format to book if not defined
+            if merge_range.format["name"] not in formats:
+                formats[merge_range.format["name"]] = book.add_format(merge_range.format["format"])
+            # get saved format if already added
+            theformat = formats[merge_range.format["name"]]
+
+            # tactic header merge has additional behavior
+            if merge_range.format["name"] == "tacticHeader":
+                # also set border for entire column for grouping
+                sheet.set_column(
+                    merge_range.leftCol - 1,
+                    merge_range.leftCol - 1,
+                    width=20,  # set column widths to make matrix more readable
+                    cell_format=borderleft,  # left border around tactic
+                )
+                sheet.set_column(
+                    merge_range.rightCol - 1,
+                    merge_range.rightCol - 1,
+                    width=20,  # set column widths to make matrix more readable
+                    cell_format=borderright,  # right border around tactic
+                )
+        else:
+            theformat = None  # no format
+
+        # apply the merge
+        sheet.merge_range(merge_range.to_excel_format(), merge_range.data, theformat)
+
+
+def _write_rows(worksheets: List, dataframe: pd.DataFrame):
+    """Write a dataframe and its header row to xlsxwriter worksheets, in a single pass over its rows.
+
+    Rows are written in order, as required by xlsxwriter's constant_memory mode. Values are converted the way
+    `DataFrame.to_excel` converts them: missing values are left blank and NumPy scalars become Python values.
+    """
+    for worksheet in worksheets:
+        worksheet.write_row(0, 0, [str(column) for column in dataframe.columns])
+
+    for row, values in enumerate(dataframe.itertuples(index=False, name=None), start=1):
+        for col, value in enumerate(values):
+            if value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value)):
+                continue
+            if isinstance(value, np.generic):
+                value = value.item()
+            for worksheet in worksheets:
+                worksheet.write(row, col, value)
+
+
+def _write_object_workbook(fp: str, object_data: Dict, master_book=None, master_sheet_name: str = None):
+    """Write the dataframes of an ATT&CK type to their own workbook in xlsxwriter's constant_memory mode.
+
+    If `master_book` is given, the `master_sheet_name` dataframe is streamed into it at the same time.
+    """
+    # strings are not converted to hyperlinks, as in the files written by DataFrame.to_excel with openpyxl
+    with xlsxwriter.Workbook(fp, {"constant_memory": True, "strings_to_urls": False}) as book:
+        for sheet_name, dataframe in object_data.items():
+            logger.debug(f"Writing sheet to {fp}: {sheet_name}")
+            worksheets = [book.add_worksheet(sheet_name)]
+            if master_book is not None and sheet_name == master_sheet_name:
+                worksheets.append(master_book.add_worksheet(sheet_name))
+            _write_rows(worksheets, dataframe)
+
+
+def _write_matrix_workbook(fp: str, matrices: List, master_book=None):
+    """Write the matrices of a domain to their own workbook, and the main matrices to `master_book` if given."""
+    # Combine both matrix types
+    combined = matrices[0] + matrices[1]
+
+    # merged ranges span rows that have already been written, so matrices cannot use constant_memory mode
+    with xlsxwriter.Workbook(fp) as book:
+        for index, matrix in enumerate(combined):
+            sheetname = _get_matrix_sheet_name(matrix, len(combined))
+            books = [book]
+            # avoid printing subtype matrices to the master file
+            if master_book is not None and index < len(matrices[0]):
+                books.append(master_book)
+
+            for matrix_book in books:
+                logger.debug(f"Writing sheet to {matrix_book.filename}: {sheetname}")
+                sheet = matrix_book.add_worksheet(sheetname)
+                _write_rows([sheet], matrix["matrix"])
+                _format_matrix_sheet(matrix_book, sheet, matrix)
+
+
+def _write_excel_streaming(
+    dataframes: Dict, master_fp: str, output_directory: str, domain_version_string: str, workers: int = None
+) -> List:
+    """Write the ATT&CK dataset with xlsxwriter directly, for write_excel(constant_memory=True)."""
+    written_files = []
+    citations = []
+    executor = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+    futures = []
 
+    # shut the worker processes down even if writing the master workbook fails
+    try:
+        master_stage = profile_stage("write workbook", file=os.path.basename(master_fp))
+        with master_stage, xlsxwriter.Workbook(master_fp) as master_book:
+            for object_type, object_data in dataframes.items():
+                fp = os.path.join(output_directory, f"{domain_version_string}-{object_type}.xlsx")
 
-def write_excel(dataframes: Dict, domain: str, version: str = None, output_dir: str = ".") -> List:
+                if object_type != "matrices":
+                    if not object_data:
+                        logger.warning(f"No data for {object_type}. Skipping building an Excel file.")
+                        continue
+
+                    with profile_stage("write workbook", file=os.path.basename(fp)):
+                        if executor:
+                            # the workbook of the object type is written by a worker, while the main df is added here
+                            futures.append(executor.submit(_write_object_workbook, fp, object_data))
+                            logger.debug(f"Writing sheet to {master_fp}: {object_type}")
+                            _write_rows([master_book.add_worksheet(object_type)], object_data[object_type])
+                        else:
+                            _write_object_workbook(
+                                fp, object_data, master_book=master_book, master_sheet_name=object_type
+                            )
+                    written_files.append(fp)
+
+                    # add citations to master citations list
+                    if "citations" in object_data:
+                        citations.append(object_data["citations"])
+
+                else:  # handle matrix special formatting
+                    with profile_stage("write workbook", file=os.path.basename(fp)):
+                        if executor:
+                            futures.append(executor.submit(_write_matrix_workbook, fp, object_data))
+                            for matrix in object_data[0]:
+                                sheetname = _get_matrix_sheet_name(matrix, len(object_data[0]) + len(object_data[1]))
+                                logger.debug(f"Writing sheet to {master_fp}: {sheetname}")
+                                sheet = master_book.add_worksheet(sheetname)
+                                _write_rows([sheet], matrix["matrix"])
+                                _format_matrix_sheet(master_book, sheet, matrix)
+                        else:
+                            _write_matrix_workbook(fp, object_data, master_book=master_book)
+                    written_files.append(fp)
+
+            # remove duplicate citations and add sheet to master file
+            logger.debug(f"Writing sheet to {master_fp}: citations")
+            with profile_stage("citations"):
+                citations = (
+                    pd.concat(citations) if citations else pd.DataFrame(columns=["reference", "citation", "url"])
+                )
+                citations = citations.drop_duplicates(subset="reference", ignore_index=True).sort_values("reference")
+            _write_rows([master_book.add_worksheet("citations")], citations)
+
+        if executor:
+            with profile_stage("wait for worker processes"):
+                for future in futures:
+                    future.result()
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    return written_files
+
+
+@profiled()
+def write_excel(
+    dataframes: Dict,
+    domain: str,
+    version: str = None,
+    output_dir: str = ".",
+    constant_memory: bool = False,
+    workers: int = None,
+) -> List:
     """Given a set of dataframes from build_dataframes, write the ATT&CK dataset to output directory.
 
     Parameters
@@ -125,6 +463,14 @@ def write_excel(dataframes: Dict, domain: str, version: str = None, output_dir:
     output_dir : str, optional
         The directory to write the excel files to.
         If omitted writes to a subfolder of the current directory depending on specified domain and version, by default "."
+    constant_memory : bool, optional
+        Write the files with xlsxwriter directly instead of `DataFrame.to_excel`. The rows of each dataframe are
+        written once, to the file of its ATT&CK type and the master file at the same time, and the files of each
+        ATT&CK type are written in xlsxwriter's constant_memory mode, so that only one row is held in memory.
+        The master file keeps the default mode because its matrix sheets contain merged cells. By default False
+    workers : int, optional
+        With `constant_memory`, the number of worker processes to write the files of each ATT&CK type with while
+        the master file is written. By default None, which writes them in the current process
 
     Returns
     -------
@@ -132,8 +478,6 @@ def write_excel(dataframes: Dict, domain: str, version: str = None, output_dir:
         A list of filepaths corresponding to the files written by the function
     """
     logger.info("writing formatted files... ")
-    # master list of files that have been written
-    written_files = []
     # set up output directory
     if version:
         domain_version_string = f"{domain}-{version}"
@@ -144,9 +488,26 @@ def write_excel(dataframes: Dict, domain: str, version: str = None, output_dir:
         os.makedirs(output_directory)
     # master dataset file
     master_fp = os.path.join(output_directory, f"{domain_version_string}.xlsx")
-    with pd.ExcelWriter(master_fp, engine="xlsxwriter") as master_writer:
-        # master list of citations
-        citations = pd.DataFrame()
+
+    if constant_memory:
+        written_files = _write_excel_streaming(
+            dataframes=dataframes,
+            master_fp=master_fp,
+            output_directory=output_directory,
+            domain_version_string=domain_version_string,
+            workers=workers,
+        )
+        written_files.append(master_fp)
+        for thefile in written_files:
+            logger.info(f"Excel file created: {thefile}")
+        return written_files
+
+    # master list of files that have been written
+    written_files = []
+    master_stage = profile_stage("write workbook", file=os.path.basename(master_fp))
+    with master_stage, pd.ExcelWriter(master_fp, engine="xlsxwriter") as master_writer:
+        # master list of citations, concatenated once all object types are written
+        citations = []
 
         # write individual dataframes and add to master writer
         for object_type, object_data in dataframes.items():
@@ -157,102 +518,58 @@ def write_excel(dataframes: Dict, domain: str, version: str = None, output_dir:
                     logger.warning(f"No data for {object_type}. Skipping building an Excel file.")
                     continue
 
-                # write the dataframes for the object type into named sheets
-                with pd.ExcelWriter(fp) as object_writer:
-                    for sheet_name in object_data:
-                        logger.debug(f"Writing sheet to {fp}: {sheet_name}")
-                        object_data[sheet_name].to_excel(object_writer, sheet_name=sheet_name, index=False)
-                written_files.append(fp)
+                with profile_stage("write workbook", file=os.path.basename(fp)):
+                    # write the dataframes for the object type into named sheets
+                    with pd.ExcelWriter(fp) as object_writer:
+                        for sheet_name in object_data:
+                            logger.debug(f"Writing sheet to {fp}: {sheet_name}")
+                            object_data[sheet_name].to_excel(object_writer, sheet_name=sheet_name, index=False)
+                    written_files.append(fp)
 
-                # add citations to master citations list
-                if "citations" in object_data:
-                    citations = pd.concat([citations, object_data["citations"]])
+                    # add citations to master citations list
+                    if "citations" in object_data:
+                        citations.append(object_data["citations"])
 
-                # add main df to master dataset
-                logger.debug(f"Writing sheet to {master_fp}: {object_type}")
-                object_data[object_type].to_excel(master_writer, sheet_name=object_type, index=False)
+                    # add main df to master dataset
+                    logger.debug(f"Writing sheet to {master_fp}: {object_type}")
+                    object_data[object_type].to_excel(master_writer, sheet_name=object_type, index=False)
 
             else:  # handle matrix special formatting
-                with pd.ExcelWriter(fp, engine="xlsxwriter") as matrix_writer:
-                    # Combine both matrix types
-                    combined = object_data[0] + object_data[1]
-
-                    # some domains have multiple matrices
-                    for matrix in combined:
-                        # name them accordingly if there are multiple
-                        sheetname = "matrix" if len(combined) == 1 else matrix["name"] + " matrix"
-                        for character in INVALID_CHARACTERS:
-                            sheetname = sheetname.replace(character, " or " if character in SUB_CHARACTERS else " ")
-
-                        if len(sheetname) > 31:
-                            sheetname = sheetname[0:28] + "..."
-                        listing = []
-
-                        # avoid printing subtype matrices to the master file
-                        if matrix in object_data[0]:
-                            # write unformatted matrix data to master file
-                            logger.debug(f"Writing sheet to {master_fp}: {sheetname}")
-                            matrix["matrix"].to_excel(master_writer, sheet_name=sheetname, index=False)
-                            listing.append(master_writer)
-
-                        # write unformatted matrix to matrix file
-                        logger.debug(f"Writing sheet to {fp}: {sheetname}")
-                        matrix["matrix"].to_excel(matrix_writer, sheet_name=sheetname, index=False)
-                        listing.append(matrix_writer)
-
-                        # for each writer, format the matrix for readability
-                        for writer in listing:
-                            # define column border styles
-                            borderleft = writer.book.add_format({"left": 1, "shrink": 1})
-                            borderright = writer.book.add_format({"right": 1, "shrink": 1})
-
-                            # formats only need to be defined once: pointers stored here for subsequent uses
-                            formats = {}
-                            sheet = writer.sheets[sheetname]
-
-                            # set all columns to 20 width, and add text shrinking to fit
-                            sheet.set_column(0, matrix["columns"], width=20)
-
-                            # merge supertechniques and tactic headers if sub-techniques are present on a tactic
-                            for merge_range in matrix["merge"]:
-                                # sometimes merge ranges have formats to add to the merged range
-                                if merge_range.format:
-                                    # add format to book if not defined
-                                    if merge_range.format["name"] not in formats:
-                                        formats[merge_range.format["name"]] = writer.book.add_format(
-                                            merge_range.format["format"]
-                                        )
-                                    # get saved format if already added
-                                    theformat = formats[merge_range.format["name"]]
-
-                                    # tactic header merge has additional behavior
-                                    if merge_range.format["name"] == "tacticHeader":
-                                        # also set border for entire column for grouping
-                                        sheet.set_column(
-                                            merge_range.leftCol - 1,
-                                            merge_range.leftCol - 1,
-                                            width=20,  # set column widths to make matrix more readable
-                                            cell_format=borderleft,  # left border around tactic
-                                        )
-                                        sheet.set_column(
-                                            merge_range.rightCol - 1,
-                                            merge_range.rightCol - 1,
-                                            width=20,  # set column widths to make matrix more readable
-                                            cell_format=borderright,  # right border around tactic
-                                        )
-                                else:
-                                    theformat = None  # no format
-
-                                # apply the merge
-                                sheet.merge_range(merge_range.to_excel_format(), merge_range.data, theformat)
+                with profile_stage("write workbook", file=os.path.basename(fp)):
+                    with pd.ExcelWriter(fp, engine="xlsxwriter") as matrix_writer:
+                        # Combine both matrix types
+                        combined = object_data[0] + object_data[1]
+
+                        # some domains have multiple matrices
+                        for index, matrix in enumerate(combined):
+                            # name them accordingly if there are multiple
+                            sheetname = _get_matrix_sheet_name(matrix, len(combined))
+                            listing = []
+
+                            # avoid printing subtype matrices to the master file
+                            if index < len(object_data[0]):
+                                # write unformatted matrix data to master file
+                                logger.debug(f"Writing sheet to {master_fp}: {sheetname}")
+                                matrix["matrix"].to_excel(master_writer, sheet_name=sheetname, index=False)
+                                listing.append(master_writer)
+
+                            # write unformatted matrix to matrix file
+                            logger.debug(f"Writing sheet to {fp}: {sheetname}")
+                            matrix["matrix"].to_excel(matrix_writer, sheet_name=sheetname, index=False)
+                            listing.append(matrix_writer)
+
+                            # for each writer, format the matrix for readability
+                            for writer in listing:
+                                _format_matrix_sheet(writer.book, writer.sheets[sheetname], matrix)
 
                 written_files.append(fp)
 
         # remove duplicate citations and add sheet to master file
         logger.debug(f"Writing sheet to {master_fp}: citations")
-        citations.drop_duplicates(subset="reference", ignore_index=True).sort_values("reference").to_excel(
-            master_writer, sheet_name="citations", index=False
-        )
+        with profile_stage("citations"):
+            citations = pd.concat(citations) if citations else pd.DataFrame(columns=["reference", "citation", "url"])
+            citations = citations.drop_duplicates(subset="reference", ignore_index=True).sort_values("reference")
+        citations.to_excel(master_writer, sheet_name="citations", index=False)
 
     written_files.append(master_fp)
     for thefile in written_files:
@@ -260,6 +577,195 @@ def write_excel(dataframes: Dict, domain: str, version: str = None, output_dir:
     return written_files
 
 
+def _get_columnar_dataframe(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Convert a dataframe from build_dataframes to the stable schema of the columnar formats.
+
+    Every column is a string column, except for the boolean columns in `BOOLEAN_COLUMNS`, so that columns without
+    any values have the same type as in other domains and versions. The `stixToDf.CATEGORICAL_COLUMNS` of repetitive
+    values are categorical.
+    """
+    columns = {}
+    for column in dataframe.columns:
+        values = dataframe[column].reset_index(drop=True)
+        if column in BOOLEAN_COLUMNS:
+            columns[column] = values.astype(bool)
+        elif column in stixToDf.CATEGORICAL_COLUMNS:
+            columns[column] = values.astype("string").astype("category")
+        else:
+            columns[column] = values.astype("string")
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(dataframe)))
+
+
+@profiled("write columnar")
+def _write_columnar(dataframes: Dict, domain: str, version: str, output_dir: str, output_format: str) -> List:
+    """Write the dataframes from build_dataframes to files of a columnar format, one file per sheet."""
+    logger.info(f"writing {output_format} files... ")
+    if output_format in ("parquet", "feather"):
+        import_pyarrow()
+
+    written_files = []
+    domain_version_string = f"{domain}-{version}" if version else domain
+    output_directory = os.path.join(output_dir, domain_version_string)
+    os.makedirs(output_directory, exist_ok=True)
+
+    def write(dataframe: pd.DataFrame, name: str):
+        fp = os.path.join(output_directory, f"{domain_version_string}-{name}.{output_format}")
+        logger.debug(f"Writing {fp}")
+        with profile_stage("write file", file=os.path.basename(fp)):
+            if output_format == "csv":
+                dataframe.to_csv(fp, index=False)
+            elif output_format == "parquet":
+                _get_columnar_dataframe(dataframe).to_parquet(fp, index=False)
+            else:
+                _get_columnar_dataframe(dataframe).to_feather(fp)
+        written_files.append(fp)
+
+    citations = []
+    for object_type, object_data in dataframes.items():
+        if object_type == "matrices":
+            # matrices are laid out for reading rather than as tables, and are only written to Excel
+            logger.debug(f"Skipping matrices, which are not written to {output_format} files")
+            continue
+        if not object_data:
+            logger.warning(f"No data for {object_type}. Skipping building {output_format} files.")
+            continue
+
+        for sheet_name, dataframe in object_data.items():
+            write(
+                dataframe, object_type if sheet_name == object_type else f"{object_type}-{sheet_name.replace(' ', '-')}"
+            )
+
+        # add citations to master citations list
+        if "citations" in object_data:
+            citations.append(object_data["citations"])
+
+    # remove duplicate citations, as in the citations sheet of the master Excel file
+    with profile_stage("citations"):
+        citations = pd.concat(citations) if citations else pd.DataFrame(columns=["reference", "citation", "url"])
+        citations = citations.drop_duplicates(subset="reference", ignore_index=True).sort_values("reference")
+    write(citations, "citations")
+
+    for thefile in written_files:
+        logger.info(f"{output_format} file created: {thefile}")
+    return written_files
+
+
+def write_csv(dataframes: Dict, domain: str, version: str = None, output_dir: str = ".") -> List:
+    """Given a set of dataframes from build_dataframes, write the ATT&CK dataset to CSV files.
+
+    Each sheet of the Excel files is written to its own file, e.g. `enterprise-attack-techniques.csv` and
+    `enterprise-attack-techniques-procedure-examples.csv`, along with `enterprise-attack-citations.csv` for the
+    citations of every type. Matrices are not written.
+
+    Parameters
+    ----------
+    dataframes : dict
+        A dictionary of pandas dataframes as built by build_dataframes()
+    domain : str
+        Domain of ATT&CK the dataframes correspond to, e.g "enterprise-attack"
+    version : str, optional
+        The version of ATT&CK the dataframes correspond to, e.g "v8.1".
+        If omitted, the output files will not be labelled with the version number, by default None
+    output_dir : str, optional
+        The directory to write the files to, in a subfolder depending on specified domain and version, by default "."
+
+    Returns
+    -------
+    list
+        A list of filepaths corresponding to the files written by the function
+    """
+    return _write_columnar(dataframes, domain=domain, version=version, output_dir=output_dir, output_format="csv")
+
+
+def write_parquet(dataframes: Dict, domain: str, version: str = None, output_dir: str = ".") -> List:
+    """Given a set of dataframes from build_dataframes, write the ATT&CK dataset to Parquet files.
+
+    The files are laid out as by write_csv. Columns have the same type in every domain and version: columns of
+    repetitive values, such as "platforms" or "source type", are categorical and every other column is a string
+    column, except for "is sub-technique". Requires the optional `pyarrow` dependency.
+
+    Parameters
+    ----------
+    dataframes : dict
+        A dictionary of pandas dataframes as built by build_dataframes()
+    domain : str
+        Domain of ATT&CK the dataframes correspond to, e.g "enterprise-attack"
+    version : str, optional
+        The version of ATT&CK the dataframes correspond to, e.g "v8.1".
+        If omitted, the output files will not be labelled with the version number, by default None
+    output_dir : str, optional
+        The directory to write the files to, in a subfolder depending on specified domain and version, by default "."
+
+    Returns
+    -------
+    list
+        A list of filepaths corresponding to the files written by the function
+
+    Raises
+    ------
+    ImportError
+        Raised if pyarrow is not installed
+    """
+    return _write_columnar(dataframes, domain=domain, version=version, output_dir=output_dir, output_format="parquet")
+
+
+def write_feather(dataframes: Dict, domain: str, version: str = None, output_dir: str = ".") -> List:
+    """Given a set of dataframes from build_dataframes, write the ATT&CK dataset to Feather files.
+
+    The files are laid out as by write_csv, with the column types of write_parquet. Requires the optional `pyarrow`
+    dependency.
+
+    Parameters
+    ----------
+    dataframes : dict
+        A dictionary of pandas dataframes as built by build_dataframes()
+    domain : str
+        Domain of ATT&CK the dataframes correspond to, e.g "enterprise-attack"
+    version : str, optional
+        The version of ATT&CK the dataframes correspond to, e.g "v8.1".
+        If omitted, the output files will not be labelled with the version number, by default None
+    output_dir : str, optional
+        The directory to write the files to, in a subfolder depending on specified domain and version, by default "."
+
+    Returns
+    -------
+    list
+        A list of filepaths corresponding to the files written by the function
+
+    Raises
+    ------
+    ImportError
+        Raised if pyarrow is not installed
+    """
+    return _write_columnar(dataframes, domain=domain, version=version, output_dir=output_dir, output_format="feather")
+
+
+def _write_dataframes(
+    dataframes: Dict,
+    domain: str,
+    version: str,
+    output_dir: str,
+    output_format: str = "xlsx",
+    constant_memory: bool = False,
+    workers: int = None,
+) -> List:
+    """Write the dataframes from build_dataframes with the write function of the output format."""
+    if output_format == "xlsx":
+        return write_excel(
+            dataframes=dataframes,
+            domain=domain,
+            version=version,
+            output_dir=output_dir,
+            constant_memory=constant_memory,
+            workers=workers,
+        )
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}")
+    return _write_columnar(
+        dataframes, domain=domain, version=version, output_dir=output_dir, output_format=output_format
+    )
+
+
 def export(
     domain: str = "enterprise-attack",
     version: str = None,
@@ -267,6 +773,10 @@ def export(
     remote: str = None,
     stix_file: str = None,
     mem_store: MemoryStore = None,
+    workers: int = None,
+    constant_memory: bool = False,
+    output_format: str = "xlsx",
+    cache_dir: str = None,
 ):
     """Download ATT&CK data from MITRE/CTI and convert it to Excel spreadsheets.
 
@@ -293,11 +803,26 @@ def export(
         A STIX bundle containing ATT&CK data for a domain already loaded into memory.
         Mutually exclusive with `remote` and `stix_file`.
         By default None
+    workers : int, optional
+        Number of worker processes to build the dataframes with, see build_dataframes, and with `constant_memory`,
+        to write the files with, see write_excel. By default None, which builds them in the current process
+    constant_memory : bool, optional
+        Stream the dataframes into the Excel files with xlsxwriter's constant_memory mode, see write_excel.
+        By default False
+    output_format : str, optional
+        The format of the files to write, one of `OUTPUT_FORMATS`: "xlsx" for Excel spreadsheets, or "csv",
+        "parquet" or "feather" to write each sheet to its own file with write_csv, write_parquet or write_feather.
+        By default "xlsx"
+    cache_dir : str, optional
+        Directory to cache the dataframes in, to reuse them when the same data is exported again, see
+        build_dataframes. By default None
 
     Raises
     ------
     TypeError
         Raised when missing exactly one of `remote`, `stix_file`, or `mem_store`.
+    ValueError
+        Raised if `output_format` is not one of `OUTPUT_FORMATS`
     """
     if (
         (remote and stix_file and mem_store)
@@ -306,6 +831,8 @@ def export(
         or (stix_file and mem_store)
     ):
         raise TypeError("Exactly zero or one of `remote`, `stix_file`, and `mem_store` must be passed in.")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}")
 
     get_stix_from_github = remote is None and stix_file is None and mem_store is None
 
@@ -315,8 +842,170 @@ def export(
     logger.info(f"************ Exporting {domain} to Excel ************")
 
     # build dataframes
-    dataframes = build_dataframes(src=mem_store, domain=domain)
-    write_excel(dataframes=dataframes, domain=domain, version=version, output_dir=output_dir)
+    dataframes = build_dataframes(src=mem_store, domain=domain, workers=workers, cache_dir=cache_dir)
+    _write_dataframes(
+        dataframes=dataframes,
+        domain=domain,
+        version=version,
+        output_dir=output_dir,
+        output_format=output_format,
+        constant_memory=constant_memory,
+        workers=workers,
+    )
+
+
+def _load_stix_objects(domain: str, version: str = None, stix_dir: str = None) -> List:
+    """Load the STIX objects of a domain and version from a download directory, or from MITRE/CTI."""
+    if stix_dir:
+        stix_file = os.path.join(stix_dir, version or f"v{release_info.LATEST_VERSION}", f"{domain}.json")
+        logger.info(f"Loading STIX file from: {stix_file}")
+        with open(stix_file, "r", encoding="utf-8") as f:
+            return json.load(f)["objects"]
+
+    logger.info(f"Downloading ATT&CK {domain} {version or 'latest'} from github.com/mitre/cti")
+    return requests.get(_get_cti_url(domain=domain, version=version)).json()["objects"]
+
+
+def _export_releases(
+    domain: str,
+    versions: List,
+    output_dir: str,
+    stix_dir: str = None,
+    constant_memory: bool = False,
+    output_format: str = "xlsx",
+    cache_dir: str = None,
+) -> List[Dict]:
+    """Export releases of a domain one after the other, for export_batch.
+
+    Objects that are unchanged from the previous release are not parsed again. Only the objects of the previous
+    release are kept, so memory use does not grow with the number of releases.
+    """
+    timings = []
+    parsed_objects = {}
+    for version in versions:
+        start = time.perf_counter()
+        with profile_stage("load", domain=domain, version=version):
+            previous_objects, parsed_objects = parsed_objects, {}
+            for stix_object in _load_stix_objects(domain=domain, version=version, stix_dir=stix_dir):
+                key = (stix_object["id"], stix_object.get("modified", stix_object.get("created")))
+                parsed_object = previous_objects.get(key)
+                if parsed_object is None:
+                    parsed_object = stix2.parse(stix_object, allow_custom=True)
+                parsed_objects[key] = parsed_object
+            del previous_objects
+            mem_store = MemoryStore(stix_data=list(parsed_objects.values()))
+        loaded = time.perf_counter()
+
+        logger.info(f"************ Exporting {domain} {version or 'latest'} to Excel ************")
+        dataframes = build_dataframes(src=mem_store, domain=domain, cache_dir=cache_dir)
+        built = time.perf_counter()
+        files = _write_dataframes(
+            dataframes=dataframes,
+            domain=domain,
+            version=version,
+            output_dir=output_dir,
+            output_format=output_format,
+            constant_memory=constant_memory,
+        )
+        written = time.perf_counter()
+
+        timings.append(
+            {
+                "domain": domain,
+                "version": version,
+                "load": loaded - start,
+                "build": built - loaded,
+                "write": written - built,
+                "total": written - start,
+                "files": files,
+            }
+        )
+    return timings
+
+
+def export_batch(
+    domains: List[str] = None,
+    versions: List[str] = None,
+    output_dir: str = ".",
+    stix_dir: str = None,
+    workers: int = None,
+    constant_memory: bool = False,
+    output_format: str = "xlsx",
+    cache_dir: str = None,
+) -> List[Dict]:
+    """Export every combination of domains and versions of ATT&CK to Excel spreadsheets.
+
+    The releases of each domain are split into contiguous runs that are exported by a pool of worker processes.
+    Each worker exports the releases of its run in order, parsing only the objects that changed since the previous
+    release, and holds a single release in memory at a time.
+
+    Parameters
+    ----------
+    domains : List[str], optional
+        The domains of ATT&CK to export, by default all domains
+    versions : List[str], optional
+        The versions of ATT&CK to export, e.g ["v13.1", "v14.1"], by default only the latest version
+    output_dir : str, optional
+        The directory to write the excel files to, with a subfolder for each domain and version, by default "."
+    stix_dir : str, optional
+        A directory of releases downloaded with `download_attack_stix`, containing a `v<version>/<domain>.json`
+        file for each release. If omitted, the releases are downloaded from MITRE/CTI, by default None
+    workers : int, optional
+        Number of releases to export in parallel, by default None, which exports them one after the other
+    constant_memory : bool, optional
+        Stream the dataframes into the Excel files with xlsxwriter's constant_memory mode, see write_excel.
+        By default False
+    output_format : str, optional
+        The format of the files to write, one of `OUTPUT_FORMATS`: "xlsx" for Excel spreadsheets, or "csv",
+        "parquet" or "feather" to write each sheet to its own file with write_csv, write_parquet or write_feather.
+        By default "xlsx"
+    cache_dir : str, optional
+        Directory to cache the dataframes in, to reuse them when the same data is exported again, see
+        build_dataframes. By default None
+
+    Returns
+    -------
+    List[Dict]
+        The timings of each export, in the order of `domains` and `versions`: a dict with the "domain", "version",
+        "files" written, and the "load", "build", "write" and "total" time in seconds
+
+    Raises
+    ------
+    ValueError
+        Raised if `output_format` is not one of `OUTPUT_FORMATS`
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}")
+    domains = domains or DOMAINS
+    versions = [version if not version or version.startswith("v") else f"v{version}" for version in versions or [None]]
+    workers = workers if workers and workers > 1 else 1
+
+    # split the versions of each domain into runs, so that every worker has a similar number of releases to export
+    run_length = math.ceil(len(domains) * len(versions) / workers)
+    runs = [(domain, versions[i : i + run_length]) for domain in domains for i in range(0, len(versions), run_length)]
+
+    if workers == 1:
+        run_timings = [
+            _export_releases(domain, run, output_dir, stix_dir, constant_memory, output_format, cache_dir)
+            for domain, run in runs
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(runs))) as executor:
+            futures = [
+                executor.submit(
+                    _export_releases, domain, run, output_dir, stix_dir, constant_memory, output_format, cache_dir
+                )
+                for domain, run in runs
+            ]
+            run_timings = [future.result() for future in futures]
+
+    timings = [timing for run in run_timings for timing in run]
+    for timing in timings:
+        logger.info(
+            f"{timing['domain']} {timing['version'] or 'latest'}: {timing['total']:.1f}s "
+            f"(load {timing['load']:.1f}s, build {timing['build']:.1f}s, write {timing['write']:.1f}s)"
+        )
+    return timings
 
 
 def main():
@@ -356,11 +1045,103 @@ def main():
         default=None,
         help="Path to a local STIX file containing ATT&CK data for a domain, by default None",
     )
+    parser.add_argument(
+        "-workers",
+        type=int,
+        default=None,
+        help="number of worker processes to build the spreadsheets of each ATT&CK type in parallel, or to export the"
+        " releases of a batch export in parallel. If omitted, builds them one after the other",
+    )
+    parser.add_argument(
+        "-domains",
+        type=str,
+        nargs="+",
+        choices=DOMAINS,
+        default=None,
+        help="batch export: the domains of ATT&CK to convert. Combined with -versions, exports every version of"
+        " every domain",
+    )
+    parser.add_argument(
+        "-versions",
+        type=str,
+        nargs="+",
+        default=None,
+        help="batch export: the versions of ATT&CK to convert, e.g v13.1 v14.1",
+    )
+    parser.add_argument(
+        "-stix-dir",
+        type=str,
+        default=None,
+        help="batch export: a directory of releases downloaded with download_attack_stix to convert instead of"
+        " downloading them from MITRE/CTI",
+    )
+    parser.add_argument(
+        "-constant-memory",
+        action="store_true",
+        help="stream the spreadsheets into the excel files row by row with xlsxwriter's constant_memory mode, using"
+        " less memory for large domains",
+    )
+    parser.add_argument(
+        "-format",
+        type=str,
+        choices=OUTPUT_FORMATS,
+        default="xlsx",
+        help="format of the files to write: excel spreadsheets, or a csv, parquet or feather file for each sheet of the"
+        " spreadsheets. Parquet and feather require pyarrow",
+    )
+    parser.add_argument(
+        "-cache-dir",
+        type=str,
+        default=None,
+        help="directory to cache the spreadsheet data in. Exporting data that is already in the cache skips building"
+        " it again, and only the ATT&CK types affected by a change to the data are built again",
+    )
+    parser.add_argument(
+        "-profile",
+        type=str,
+        default=None,
+        help="path of a JSON report to write with the wall time, CPU time and peak memory of each stage of the"
+        " export. Measuring memory slows the export down, and stages run by worker processes are not broken down",
+    )
+    parser.add_argument(
+        "-cprofile",
+        type=str,
+        default=None,
+        help="path to write cProfile statistics of the export to, to be read with pstats or snakeviz",
+    )
     args = parser.parse_args()
 
-    export(
-        domain=args.domain, version=args.version, output_dir=args.output, remote=args.remote, stix_file=args.stix_file
-    )
+    profiler = None
+    if args.profile or args.cprofile:
+        profiler = ExportProfiler(cprofile_path=args.cprofile, trace_memory=bool(args.profile))
+
+    with profiler or contextlib.nullcontext():
+        if args.domains or args.versions or args.stix_dir:
+            export_batch(
+                domains=args.domains or [args.domain],
+                versions=args.versions or [args.version],
+                output_dir=args.output,
+                stix_dir=args.stix_dir,
+                workers=args.workers,
+                constant_memory=args.constant_memory,
+                output_format=args.format,
+                cache_dir=args.cache_dir,
+            )
+        else:
+            export(
+                domain=args.domain,
+                version=args.version,
+                output_dir=args.output,
+                remote=args.remote,
+                stix_file=args.stix_file,
+                workers=args.workers,
+                constant_memory=args.constant_memory,
+                output_format=args.format,
+                cache_dir=args.cache_dir,
+            )
+
+    if args.profile:
+        profiler.write_report(args.profile)
 
 
 if __name__ == "__main__":
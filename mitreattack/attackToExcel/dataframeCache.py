@@ -0,0 +1,168 @@
+"""Content-addressed on-disk cache of the dataframes built by attackToExcel.build_dataframes."""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from importlib import metadata
+from typing import Dict
+
+import pandas as pd
+from stix2.serialization import STIXJSONEncoder
+
+# bump when the cached dataframes change in a way the library version does not capture
+CACHE_FORMAT_VERSION = 1
+
+# object type => (STIX types its dataframes are built from, ATT&CK types of the relationships included in them).
+# "subtechnique-of" stands for the subtechnique-of relationships, which are not part of the parsed relationships.
+# The relationships of every ATT&CK type are included in the "relationships" dataframes.
+DEPENDENCIES = {
+    "techniques": (["attack-pattern", "x-mitre-tactic", "subtechnique-of"], ["technique"]),
+    "tactics": (["x-mitre-tactic"], []),
+    "software": (["malware", "tool"], ["software"]),
+    "groups": (["intrusion-set"], ["group"]),
+    "campaigns": (["campaign"], ["campaign"]),
+    "assets": (["x-mitre-asset"], ["asset"]),
+    "mitigations": (["course-of-action"], ["mitigation"]),
+    "matrices": (["x-mitre-matrix", "x-mitre-tactic", "attack-pattern", "subtechnique-of"], []),
+    "relationships": ([], None),
+    "datasources": (["x-mitre-data-source", "x-mitre-data-component"], ["datacomponent"]),
+}
+
+
+def _get_library_version() -> str:
+    """Get the installed version of mitreattack-python."""
+    try:
+        return metadata.version("mitreattack-python")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _hash_dataframe(dataframe: pd.DataFrame) -> str:
+    """Get a SHA-256 hash of the columns, index and values of a dataframe."""
+    sha256_hash = hashlib.sha256(json.dumps([str(column) for column in dataframe.columns]).encode("utf-8"))
+    sha256_hash.update(pd.util.hash_pandas_object(dataframe, index=True).to_numpy().tobytes())
+    return sha256_hash.hexdigest()
+
+
+class DataFrameCache:
+    """Directory of dataframes built by build_dataframes, addressed by the content they were built from.
+
+    The dataframes of each object type are cached under a key hashing the domain, the library version, and only the
+    STIX objects and parsed relationships they are built from, so that when a bundle changes, only the dataframes of
+    the object types affected by the change have to be built again. Each bundle is also recorded under a key hashing
+    all of its objects, so that an unchanged bundle is loaded without parsing it at all.
+
+    Cached dataframes are pickled, so a cache directory must only be shared with trusted users.
+    """
+
+    def __init__(self, cache_dir: str):
+        """Initialize the cache, creating `cache_dir` if it does not exist.
+
+        Parameters
+        ----------
+        cache_dir : str
+            the directory to store the cached dataframes in
+        """
+        self.cache_dir = cache_dir
+        self.library_version = _get_library_version()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def hash_objects(self, src) -> Dict[str, str]:
+        """Hash the STIX objects of a bundle, grouped by the STIX types in `DEPENDENCIES`.
+
+        Parameters
+        ----------
+        src : MemoryStore
+            MemoryStore or other stix2 DataSource object holding the domain data
+
+        Returns
+        -------
+        Dict[str, str]
+            STIX type => SHA-256 hash of the objects of the type in the order of `src`, including revoked and
+            deprecated objects, and "bundle" => SHA-256 hash of every object
+        """
+        hashes = {"bundle": hashlib.sha256()}
+        for stix_object in src.query():
+            object_hash = hashlib.sha256(
+                json.dumps(stix_object, cls=STIXJSONEncoder, sort_keys=True).encode("utf-8")
+            ).digest()
+            hashes["bundle"].update(object_hash)
+
+            stix_type = stix_object["type"]
+            if stix_type == "relationship" and stix_object["relationship_type"] == "subtechnique-of":
+                stix_type = "subtechnique-of"
+            hashes.setdefault(stix_type, hashlib.sha256()).update(object_hash)
+        return {stix_type: sha256_hash.hexdigest() for stix_type, sha256_hash in hashes.items()}
+
+    def _make_key(self, *parts) -> str:
+        key = [CACHE_FORMAT_VERSION, self.library_version, *parts]
+        return hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+
+    def get_bundle_key(self, domain: str, object_hashes: Dict[str, str]) -> str:
+        """Get the key of a bundle, as returned by `hash_objects`, for a domain."""
+        return self._make_key("bundle", domain, object_hashes["bundle"])
+
+    def get_type_key(self, object_type: str, domain: str, object_hashes: Dict[str, str], relationships: Dict) -> str:
+        """Get the key of the dataframes of an object type.
+
+        Parameters
+        ----------
+        object_type : str
+            the object type, one of the keys of `DEPENDENCIES`
+        domain : str
+            domain of ATT&CK the bundle corresponds to, e.g "enterprise-attack"
+        object_hashes : Dict[str, str]
+            the hashes of the objects of the bundle, as returned by `hash_objects`
+        relationships : Dict
+            the parsed relationships of the bundle, as returned by `stixToDf.relationshipsToDf(src)`
+
+        Returns
+        -------
+        str
+            the key of the dataframes
+        """
+        stix_types, related_terms = DEPENDENCIES[object_type]
+        parts = [object_type, domain, [object_hashes.get(stix_type) for stix_type in stix_types]]
+        if related_terms is not None and not related_terms:
+            return self._make_key(*parts)
+
+        relationship_df = relationships["relationships"]
+        if related_terms:
+            mask = relationship_df["source type"].isin(related_terms) | relationship_df["target type"].isin(
+                related_terms
+            )
+            relationship_df = relationship_df[mask]
+        parts.append(_hash_dataframe(relationship_df))
+        if "citations" in relationships:
+            parts.append(_hash_dataframe(relationships["citations"]))
+        return self._make_key(*parts)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pickle")
+
+    def load(self, key: str):
+        """Load a cached value, or return None if there is no value for the key."""
+        path = self._get_path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def store(self, key: str, value):
+        """Store a value in the cache.
+
+        The value is written to a temporary file that is then renamed, so that concurrent exports never read a
+        partially written value.
+        """
+        path = self._get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
@@ -0,0 +1,180 @@
+"""Wall time, CPU time and peak memory of the stages of an attackToExcel export."""
+
+import cProfile
+import datetime
+import functools
+import json
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from loguru import logger
+
+# the profiler of the export running in this process, if any
+_active_profiler = None
+
+
+@contextmanager
+def profile_stage(name: str, **details):
+    """Record a stage of the export with the active `ExportProfiler`, if any.
+
+    Parameters
+    ----------
+    name : str
+        name of the stage, e.g "techniquesToDf"
+    **details
+        additional JSON values to record with the stage, e.g the ATT&CK type written
+    """
+    if _active_profiler is None:
+        yield
+        return
+    with _active_profiler.stage(name, **details):
+        yield
+
+
+def profiled(name: str = None):
+    """Record each call of the decorated function as a stage of the export, named after the function by default."""
+
+    def decorator(function):
+        stage_name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with profile_stage(stage_name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class ExportProfiler:
+    """Record the wall time, CPU time and peak memory of each stage of the exports run inside it.
+
+    Stages are nested: the stages of building the dataframes of an ATT&CK type, such as the `relationshipsToDf`
+    calls of its builder, are recorded inside the stage of the builder. Only the current process is measured, so
+    the stages run by worker processes are only recorded as a whole, if at all.
+
+    Peak memory is measured with `tracemalloc`, which slows the export down. It is the most memory allocated by
+    Python and NumPy at any point of a stage, in bytes, and includes the memory allocated before the stage.
+    """
+
+    def __init__(self, cprofile_path: str = None, trace_memory: bool = True):
+        """Initialize the profiler.
+
+        Parameters
+        ----------
+        cprofile_path : str, optional
+            path to also dump `cProfile` statistics of the exports to, to be read with `pstats`, by default None
+        trace_memory : bool, optional
+            measure the peak memory of each stage with `tracemalloc`, by default True
+        """
+        self.cprofile_path = cprofile_path
+        self.trace_memory = trace_memory
+        self.report = None
+        self._stack = []
+        self._cprofile = None
+        self._started_tracing = False
+        # the stage of the whole export, and its record
+        self._root_stage = None
+        self._root_record = None
+
+    def _get_memory(self) -> tuple:
+        """Get the current and peak memory traced since the last reset, or (None, None) if memory is not traced."""
+        if not self.trace_memory:
+            return None, None
+        return tracemalloc.get_traced_memory()
+
+    @contextmanager
+    def stage(self, name: str, **details):
+        """Record a stage of the export.
+
+        Parameters
+        ----------
+        name : str
+            name of the stage
+        **details
+            additional JSON values to record with the stage
+        """
+        record = {"name": name, **details, "wall_time": None, "cpu_time": None, "start_memory": None}
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None:
+            parent.setdefault("stages", []).append(record)
+        if self.trace_memory:
+            if parent is not None:
+                # the peak of the parent so far, before it is reset for this stage
+                parent["peak_memory"] = max(parent["peak_memory"], self._get_memory()[1])
+            tracemalloc.reset_peak()
+        record["start_memory"] = self._get_memory()[0]
+        record["peak_memory"] = record["start_memory"]
+
+        self._stack.append(record)
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_time"] = time.perf_counter() - start_wall
+            record["cpu_time"] = time.process_time() - start_cpu
+            if self.trace_memory:
+                record["peak_memory"] = max(record["peak_memory"], self._get_memory()[1])
+                if parent is not None:
+                    parent["peak_memory"] = max(parent["peak_memory"], record["peak_memory"])
+            # keep the nested stages last, for readability
+            if "stages" in record:
+                record["stages"] = record.pop("stages")
+            self._stack.pop()
+
+    def __enter__(self):
+        """Start profiling the exports run in this process."""
+        global _active_profiler
+        if _active_profiler is not None:
+            raise RuntimeError("Another ExportProfiler is already active")
+        _active_profiler = self
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.cprofile_path:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+        self._root_stage = self.stage("export", started=datetime.datetime.now().isoformat(timespec="seconds"))
+        self._root_record = self._root_stage.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop profiling, and dump the cProfile statistics if requested."""
+        global _active_profiler
+        try:
+            # an exception of the export is recorded in the report, and raised once profiling has stopped
+            self._root_stage.__exit__(None, None, None)
+            if exc_type is not None:
+                self._root_record["error"] = repr(exc_value)
+            self.report = {"python": platform.python_version(), "platform": platform.platform(), **self._root_record}
+        finally:
+            if self._cprofile:
+                self._cprofile.disable()
+                self._cprofile.dump_stats(self.cprofile_path)
+                logger.info(f"cProfile statistics written to: {self.cprofile_path}")
+                self._cprofile = None
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+            _active_profiler = None
+        return False
+
+    def write_report(self, path: str):
+        """Write the report of the profiled exports to a JSON file.
+
+        Parameters
+        ----------
+        path : str
+            path of the JSON file to write
+        """
+        if self.report is None:
+            raise RuntimeError("The profiler has not finished profiling an export")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report, f, indent=2)
+        logger.info(f"Profile report written to: {path}")
@@ -3,16 +3,18 @@
 import copy
 import datetime
 import re
+from collections import defaultdict
 from itertools import chain
 
 import numpy as np
 import pandas as pd
 from loguru import logger
-from stix2 import Filter, MemoryStore
 from tqdm import tqdm
 
+from mitreattack.attackToExcel.exportProfiler import profiled
 from mitreattack.constants import MITRE_ATTACK_ID_SOURCE_NAMES
-from mitreattack.stix20 import MitreAttackData
+from mitreattack.stix20.columnar import get_attack_id
+from mitreattack.stix20.matrix_layout import MatrixLayoutCache
 
 # Lookup module for Platforms - each matrix has a list of possible platforms, and each platform with multiple
 #   subplatforms has a corresponding entry. This allows for a pseudo-recursive lookup of subplatforms, as the presence
@@ -47,6 +49,72 @@ MATRIX_PLATFORMS_LOOKUP = {
 }
 
 
+# columns of repetitive values, which are categorical so that each distinct value is only stored once, and shared by
+# the dataframes selected from the relationships
+CATEGORICAL_COLUMNS = {
+    "domain",
+    "version",
+    "type",
+    "platforms",
+    "tactics",
+    "sectors",
+    "collection layers",
+    "created",
+    "last modified",
+    "mapping type",
+    "source type",
+    "source ID",
+    "source name",
+    "source ref",
+    "target type",
+    "target ID",
+    "target name",
+    "target ref",
+}
+# columns of long text, which keep the strings of the STIX objects as object columns instead of copying them, so that
+# the text is shared with the STIX objects and between the dataframes selected from the relationships
+SHARED_TEXT_COLUMNS = {"description", "detection", "mapping description"}
+
+
+def _make_dataframe(columns):
+    """Build a dataframe from a dict of column lists, storing repetitive and long text columns compactly.
+
+    :param columns: a dict of column name => list of values, with NaN for missing values
+    :returns: a dataframe with categorical `CATEGORICAL_COLUMNS` and object `SHARED_TEXT_COLUMNS`
+    """
+    data = {}
+    for column, values in columns.items():
+        if column in CATEGORICAL_COLUMNS:
+            data[column] = pd.Categorical(values)
+        elif column in SHARED_TEXT_COLUMNS:
+            data[column] = pd.Series(values, dtype=object)
+        else:
+            data[column] = values
+    return pd.DataFrame(data)
+
+
+def _rows_to_dataframe(rows):
+    """Build a dataframe from a list of row dicts with `_make_dataframe`.
+
+    As with `pd.DataFrame(rows)`, the columns are in the order they first appear in a row and are NaN in the rows
+    without them.
+
+    :param rows: a list of dicts of column name => value
+    :returns: the dataframe
+    """
+    columns = {}
+    for row_number, row in enumerate(rows):
+        for column, value in row.items():
+            values = columns.get(column)
+            if values is None:
+                values = columns[column] = [np.nan] * row_number
+            values.append(value)
+        for values in columns.values():
+            if len(values) == row_number:
+                values.append(np.nan)
+    return _make_dataframe(columns)
+
+
 def remove_revoked_deprecated(stix_objects):
     """Remove any revoked or deprecated objects from queries made to the data source."""
     # Note we use .get() because the property may not be present in the JSON data. The default is False
@@ -81,29 +149,101 @@ def format_date(date):
     return f"{date.strftime('%d')} {date.strftime('%B')} {date.strftime('%Y')}"
 
 
-def get_citations(objects):
-    """Given a list of STIX objects, return a pandas dataframe for the citations on the objects."""
+def _get_object_citations(sdo):
+    """Given a STIX object, return a list of dicts for the citations on the object."""
     citations = []
-    for sdo in objects:
-        if "external_references" in sdo:
-            for ref in sdo["external_references"]:
-                if (
-                    "external_id" not in ref
-                    and "description" in ref
-                    and not ref["description"].startswith("(Citation: ")
-                ):
-                    citation = {
-                        "reference": ref["source_name"],
-                        "citation": ref["description"],
-                    }
-                    if "url" in ref:
-                        citation["url"] = ref["url"]
-
-                    citations.append(citation)
+    if "external_references" in sdo:
+        for ref in sdo["external_references"]:
+            if "external_id" not in ref and "description" in ref and not ref["description"].startswith("(Citation: "):
+                citation = {
+                    "reference": ref["source_name"],
+                    "citation": ref["description"],
+                }
+                if "url" in ref:
+                    citation["url"] = ref["url"]
 
+                citations.append(citation)
+    return citations
+
+
+def get_citations(objects):
+    """Given a list of STIX objects, return a pandas dataframe for the citations on the objects."""
+    citations = list(chain.from_iterable(_get_object_citations(sdo) for sdo in objects))
     return pd.DataFrame(citations).drop_duplicates(subset="reference", ignore_index=True)
 
 
+class StixIndexContext:
+    """Lookups shared by the stixToDf builders, built with a single pass over the domain data.
+
+    Each builder otherwise queries the data source for its object types, tactics and sub-technique relationships
+    and walks the external references of its objects for citations. Build the context once per domain and pass it
+    to each builder with `context=` to share this work between them.
+    """
+
+    def __init__(self, src):
+        """Index the domain data.
+
+        :param src: MemoryStore or other stix2 DataSource object holding the domain data
+        """
+        self.src = src
+        # STIX type => objects of the type that are not revoked or deprecated
+        self._objects_by_type = defaultdict(list)
+        # STIX type => citations of the objects in self._objects_by_type
+        self._citations_by_type = defaultdict(list)
+        # STIX ID => latest version of the object, including revoked and deprecated objects
+        self.objects_by_id = {}
+        # parent technique STIX ID => subtechnique-of relationships of its sub-techniques
+        self.subtechnique_relationships = defaultdict(list)
+        # sub-technique STIX ID => parent technique STIX ID
+        parent_refs = {}
+
+        for stix_object in src.query():
+            latest = self.objects_by_id.get(stix_object["id"])
+            if latest is None or str(stix_object.get("modified", "")) > str(latest.get("modified", "")):
+                self.objects_by_id[stix_object["id"]] = stix_object
+
+            if stix_object["type"] == "relationship" and stix_object["relationship_type"] == "subtechnique-of":
+                self.subtechnique_relationships[stix_object["target_ref"]].append(stix_object)
+                parent_refs.setdefault(stix_object["source_ref"], stix_object["target_ref"])
+
+            if remove_revoked_deprecated([stix_object]):
+                self._objects_by_type[stix_object["type"]].append(stix_object)
+                self._citations_by_type[stix_object["type"]].extend(_get_object_citations(stix_object))
+
+        # sub-technique STIX ID => parent technique
+        self.parent_techniques = {
+            subtechnique_id: self.objects_by_id.get(parent_id) for subtechnique_id, parent_id in parent_refs.items()
+        }
+        # tactic shortname => tactic name
+        self.tactic_names = {
+            tactic["x_mitre_shortname"]: tactic["name"] for tactic in self.get_objects("x-mitre-tactic")
+        }
+        # tactic shortname => techniques in the tactic
+        self.techniques_by_tactic = defaultdict(list)
+        for technique in self.get_objects("attack-pattern"):
+            for shortname in dict.fromkeys(kcp["phase_name"] for kcp in technique.get("kill_chain_phases", [])):
+                self.techniques_by_tactic[shortname].append(technique)
+        # STIX ID => ATT&CK ID
+        self.attack_ids = {stix_id: get_attack_id(stix_object) for stix_id, stix_object in self.objects_by_id.items()}
+
+    def get_objects(self, *stix_types):
+        """Get the objects of the given STIX types that are not revoked or deprecated.
+
+        :param stix_types: STIX types of the objects, e.g "tool", "malware"
+        :returns: list of the objects, in the order of the given types
+        """
+        return list(chain.from_iterable(self._objects_by_type.get(stix_type, []) for stix_type in stix_types))
+
+    def get_citations(self, *stix_types):
+        """Get the citations of the objects of the given STIX types that are not revoked or deprecated.
+
+        :param stix_types: STIX types of the objects, e.g "tool", "malware"
+        :returns: a pandas dataframe of the citations, as returned by `get_citations()`
+        """
+        citations = chain.from_iterable(self._citations_by_type.get(stix_type, []) for stix_type in stix_types)
+        return pd.DataFrame(list(citations)).drop_duplicates(subset="reference", ignore_index=True)
+
+
 def parseBaseStix(sdo):
     """Given an SDO, return a dict of field names:values that are common across all ATT&CK STIX types."""
     row = {}
@@ -133,38 +273,30 @@ def parseBaseStix(sdo):
     return row
 
 
-def techniquesToDf(src, domain):
+@profiled()
+def techniquesToDf(src, domain, relationships=None, context=None):
     """Parse STIX techniques from the given data and return corresponding pandas dataframes.
 
     :param src: MemoryStore or other stix2 DataSource object holding the domain data
     :param domain: domain of ATT&CK src corresponds to, e.g "enterprise-attack"
+    :param relationships: optional, the result of `relationshipsToDf(src)`, to select the related relationships from
+        instead of parsing them again
+    :param context: optional, a `StixIndexContext` of src, to share lookups between builders instead of querying
+        src again
     :returns: a lookup of labels (descriptors/names) to dataframes
     """
-    techniques = src.query([Filter("type", "=", "attack-pattern")])
-    techniques = remove_revoked_deprecated(techniques)
+    if context is None:
+        context = StixIndexContext(src)
+    techniques = context.get_objects("attack-pattern")
     technique_rows = []
 
-    tactics = src.query([Filter("type", "=", "x-mitre-tactic")])
-    tactics = remove_revoked_deprecated(tactics)
-    tactic_names = {}
-    for tactic in tactics:
-        x_mitre_shortname = tactic["x_mitre_shortname"]
-        tactic_names[x_mitre_shortname] = tactic["name"]
-
-    all_sub_techniques = src.query(
-        [
-            Filter("type", "=", "relationship"),
-            Filter("relationship_type", "=", "subtechnique-of"),
-        ]
-    )
-    all_sub_techniques = MemoryStore(stix_data=all_sub_techniques)
+    tactic_names = context.tactic_names
 
     for technique in tqdm(techniques, desc="parsing techniques"):
         # get parent technique if sub-technique
         subtechnique = "x_mitre_is_subtechnique" in technique and technique["x_mitre_is_subtechnique"]
         if subtechnique:
-            subtechnique_of = all_sub_techniques.query([Filter("source_ref", "=", technique["id"])])[0]
-            parent = src.get(subtechnique_of["target_ref"])
+            parent = context.parent_techniques[technique["id"]]
 
         # base STIX properties
         row = parseBaseStix(technique)
@@ -242,12 +374,12 @@ def techniquesToDf(src, domain):
 
         technique_rows.append(row)
 
-    citations = get_citations(techniques)
+    citations = context.get_citations("attack-pattern")
     dataframes = {
-        "techniques": pd.DataFrame(technique_rows).sort_values("name"),
+        "techniques": _rows_to_dataframe(technique_rows).sort_values("name"),
     }
     # add relationships
-    codex = relationshipsToDf(src, relatedType="technique")
+    codex = relationshipsToDf(src, relatedType="technique", relationships=relationships, context=context)
     dataframes.update(codex)
     # add relationship references
     dataframes["techniques"]["relationship citations"] = _get_relationship_citations(dataframes["techniques"], codex)
@@ -263,22 +395,26 @@ def techniquesToDf(src, domain):
     return dataframes
 
 
-def tacticsToDf(src):
+@profiled()
+def tacticsToDf(src, context=None):
     """Parse STIX tactics from the given data and return corresponding pandas dataframes.
 
     :param src: MemoryStore or other stix2 DataSource object holding the domain data
+    :param context: optional, a `StixIndexContext` of src, to share lookups between builders instead of querying
+        src again
     :returns: a lookup of labels (descriptors/names) to dataframes
     """
-    tactics = src.query([Filter("type", "=", "x-mitre-tactic")])
-    tactics = remove_revoked_deprecated(tactics)
+    if context is None:
+        context = StixIndexContext(src)
+    tactics = context.get_objects("x-mitre-tactic")
 
     tactic_rows = []
     for tactic in tqdm(tactics, desc="parsing tactics"):
         tactic_rows.append(parseBaseStix(tactic))
 
-    citations = get_citations(tactics)
+    citations = context.get_citations("x-mitre-tactic")
     dataframes = {
-        "tactics": pd.DataFrame(tactic_rows).sort_values("name"),
+        "tactics": _rows_to_dataframe(tactic_rows).sort_values("name"),
     }
     if not citations.empty:
         dataframes["citations"] = citations.sort_values("reference")
@@ -286,24 +422,22 @@ def tacticsToDf(src):
     return dataframes
 
 
-def datasourcesToDf(src):
+@profiled()
+def datasourcesToDf(src, relationships=None, context=None):
     """Parse STIX Data Sources and their Data components from the given data and return corresponding pandas dataframes.
 
     :param src: MemoryStore or other stix2 DataSource object holding the domain data
+    :param relationships: optional, the result of `relationshipsToDf(src)`, to select the related relationships from
+        instead of parsing them again
+    :param context: optional, a `StixIndexContext` of src, to share lookups between builders instead of querying
+        src again
     :returns: a lookup of labels (descriptors/names) to dataframes
     """
-    data = list(
-        chain.from_iterable(  # software are the union of the tool and malware types
-            src.query(f)
-            for f in [
-                Filter("type", "=", "x-mitre-data-component"),
-                Filter("type", "=", "x-mitre-data-source"),
-            ]
-        )
-    )
+    if context is None:
+        context = StixIndexContext(src)
+    refined = context.get_objects("x-mitre-data-component", "x-mitre-data-source")
     dataframes = {}
-    if data:
-        refined = remove_revoked_deprecated(data)
+    if refined:
         data_object_rows = []
         source_lookup = dict()
         for x in refined:
@@ -328,8 +462,8 @@ def datasourcesToDf(src):
                 row["description"] = data_object["description"]
             data_object_rows.append(row)
 
-        citations = get_citations(refined)
-        tempa = pd.DataFrame(data_object_rows).sort_values("name")
+        citations = context.get_citations("x-mitre-data-component", "x-mitre-data-source")
+        tempa = _rows_to_dataframe(data_object_rows).sort_values("name")
         dataframes["datasources"] = tempa.reindex(
             columns=[
                 "name",
@@ -347,7 +481,9 @@ def datasourcesToDf(src):
             ]
         )
         # add relationships
-        dataframes.update(relationshipsToDf(src, relatedType="datasource"))
+        dataframes.update(
+            relationshipsToDf(src, relatedType="datasource", relationships=relationships, context=context)
+        )
         # add/merge citations
         if not citations.empty:
             if "citations" in dataframes:  # append to existing citations from references
@@ -362,18 +498,20 @@ def datasourcesToDf(src):
     return dataframes
 
 
-def softwareToDf(src):
+@profiled()
+def softwareToDf(src, relationships=None, context=None):
     """Parse STIX software from the given data and return corresponding pandas dataframes.
 
     :param src: MemoryStore or other stix2 DataSource object holding the domain data
+    :param relationships: optional, the result of `relationshipsToDf(src)`, to select the related relationships from
+        instead of parsing them again
+    :param context: optional, a `StixIndexContext` of src, to share lookups between builders instead of querying
+        src again
     :returns: a lookup of labels (descriptors/names) to dataframes
     """
-    software = list(
-        chain.from_iterable(  # software are the union of the tool and malware types
-            src.query(f) for f in [Filter("type", "=", "tool"), Filter("type", "=", "malware")]
-        )
-    )
-    software = remove_revoked_deprecated(software)
+    if context is None:
+        context = StixIndexContext(src)
+    software = context.get_objects("tool", "malware")  # software are the union of the tool and malware types
     software_rows = []
     for soft in tqdm(software, desc="parsing software"):
         # add common STIx fields
@@ -387,12 +525,12 @@ def softwareToDf(src):
 
         software_rows.append(row)
 
-    citations = get_citations(software)
+    citations = context.get_citations("tool", "malware")
     dataframes = {
-        "software": pd.DataFrame(software_rows).sort_values("name"),
+        "software": _rows_to_dataframe(software_rows).sort_values("name"),
     }
     # add relationships
-    codex = relationshipsToDf(src, relatedType="software")
+    codex = relationshipsToDf(src, relatedType="software", relationships=relationships, context=context)
     dataframes.update(codex)
     # add relationship references
     dataframes["software"]["relationship citations"] = _get_relationship_citations(dataframes["software"], codex)
@@ -408,14 +546,20 @@ def softwareToDf(src):
     return dataframes
 
 
-def groupsToDf(src):
+@profiled()
+def groupsToDf(src, relationships=None, context=None):
     """Parse STIX groups from the given data and return corresponding pandas dataframes.
 
     :param src: MemoryStore or other stix2 DataSource object holding the domain data
+    :param relationships: optional, the result of `relationshipsToDf(src)`, to select the related relationships from
+        instead of parsing them again
+    :param context: optional, a `StixIndexContext` of src, to share lookups between builders instead of querying
+        src again
     :returns: a lookup of labels (descriptors/names) to dataframes
     """
-    groups = src.query([Filter("type", "=", "intrusion-set")])
-    groups = remove_revoked_deprecated(groups)
+    if context is None:
+        context = StixIndexContext(src)
+    groups = context.get_objects("intrusion-set")
     group_rows = []
     for group in tqdm(groups, desc="parsing groups"):
         row = parseBaseStix(group)
@@ -437,12 +581,12 @@ def groupsToDf(src):
 
         group_rows.append(row)
 
-    citations = get_citations(groups)
+    citations = context.get_citations("intrusion-set")
     dataframes = {
-        "groups": pd.DataFrame(group_rows).sort_values("name"),
+        "groups": _rows_to_dataframe(group_rows).sort_values("name"),
     }
     # add relationships
-    codex = relationshipsToDf(src, relatedType="group")
+    codex = relationshipsToDf(src, relatedType="group", relationships=relationships, context=context)
     dataframes.update(codex)
     # add relationship references
     dataframes["groups"]["relationship citations"] = _get_relationship_citations(dataframes["groups"], codex)
@@ -459,14 +603,20 @@ def groupsToDf(src):
     return dataframes
 
 
-def campaignsToDf(src):
+@profiled()
+def campaignsToDf(src, relationships=None, context=None):
     """Parse STIX campaigns from the given data and return corresponding pandas dataframes.
 
     :param src: MemoryStore or other stix2 DataSource object holding the domain data
+    :param relationships: optional, the result of `relationshipsToDf(src)`, to select the related relationships from
+        instead of parsing them again
+    :param context: optional, a `StixIndexContext` of src, to share lookups between builders instead of querying
+        src again
     :returns: a lookup of labels (descriptors/names) to dataframes
     """
-    campaigns = src.query([Filter("type", "=", "campaign")])
-    campaigns = remove_revoked_deprecated(campaigns)
+    if context is None:
+        context = StixIndexContext(src)
+    campaigns = context.get_objects("campaign")
 
     dataframes = {}
     if campaigns:
@@ -496,12 +646,12 @@ def campaignsToDf(src):
 
             campaign_rows.append(row)
 
-        citations = get_citations(campaigns)
+        citations = context.get_citations("campaign")
         dataframes = {
-            "campaigns": pd.DataFrame(campaign_rows).sort_values("name"),
+            "campaigns": _rows_to_dataframe(campaign_rows).sort_values("name"),
         }
         # add relationships
-        codex = relationshipsToDf(src, relatedType="campaign")
+        codex = relationshipsToDf(src, relatedType="campaign", relationships=relationships, context=context)
         dataframes.update(codex)
 
         # add relationship references
@@ -522,14 +672,20 @@ def campaignsToDf(src):
     return dataframes
 
 
-def assetsToDf(src):
+@profiled()
+def assetsToDf(src, relationships=None, context=None):
     """Parse STIX assets from the given data and return corresponding pandas dataframes.
 
     :param src: MemoryStore or other stix2 DataSource object holding the domain data
+    :param relationships: optional, the result of `relationshipsToDf(src)`, to select the related relationships from
+        instead of parsing them again
+    :param context: optional, a `StixIndexContext` of src, to share lookups between builders instead of querying
+        src again
     :returns: a lookup of labels (descriptors/names) to dataframes
     """
-    assets = src.query([Filter("type", "=", "x-mitre-asset")])
-    assets = remove_revoked_deprecated(assets)
+    if context is None:
+        context = StixIndexContext(src)
+    assets = context.get_objects("x-mitre-asset")
 
     dataframes = {}
     if assets:
@@ -557,12 +713,12 @@ def assetsToDf(src):
 
             asset_rows.append(row)
 
-        citations = get_citations(assets)
+        citations = context.get_citations("x-mitre-asset")
         dataframes = {
-            "assets": pd.DataFrame(asset_rows).sort_values("name"),
+            "assets": _rows_to_dataframe(asset_rows).sort_values("name"),
         }
         # add relationships
-        codex = relationshipsToDf(src, relatedType="asset")
+        codex = relationshipsToDf(src, relatedType="asset", relationships=relationships, context=context)
         dataframes.update(codex)
         # add relationship references
         dataframes["assets"]["relationship citations"] = _get_relationship_citations(dataframes["assets"], codex)
@@ -581,24 +737,30 @@ def assetsToDf(src):
     return dataframes
 
 
-def mitigationsToDf(src):
+@profiled()
+def mitigationsToDf(src, relationships=None, context=None):
     """Parse STIX mitigations from the given data and return corresponding pandas dataframes.
 
     :param src: MemoryStore or other stix2 DataSource object holding the domain data
+    :param relationships: optional, the result of `relationshipsToDf(src)`, to select the related relationships from
+        instead of parsing them again
+    :param context: optional, a `StixIndexContext` of src, to share lookups between builders instead of querying
+        src again
     :returns: a lookup of labels (descriptors/names) to dataframes
     """
-    mitigations = src.query([Filter("type", "=", "course-of-action")])
-    mitigations = remove_revoked_deprecated(mitigations)
+    if context is None:
+        context = StixIndexContext(src)
+    mitigations = context.get_objects("course-of-action")
     mitigation_rows = []
     for mitigation in tqdm(mitigations, desc="parsing mitigations"):
         mitigation_rows.append(parseBaseStix(mitigation))
 
-    citations = get_citations(mitigations)
+    citations = context.get_citations("course-of-action")
     dataframes = {
-        "mitigations": pd.DataFrame(mitigation_rows).sort_values("name"),
+        "mitigations": _rows_to_dataframe(mitigation_rows).sort_values("name"),
     }
     # add relationships
-    codex = relationshipsToDf(src, relatedType="mitigation")
+    codex = relationshipsToDf(src, relatedType="mitigation", relationships=relationships, context=context)
     dataframes.update(codex)
     # add relationship references
     dataframes["mitigations"]["relationship citations"] = _get_relationship_citations(dataframes["mitigations"], codex)
@@ -645,7 +807,15 @@ class CellRange:
 
 
 def build_technique_and_sub_columns(
-    src, techniques, columns, merge_data_handle, matrix_grid_handle, tactic_name, platform=None
+    src,
+    techniques,
+    columns,
+    merge_data_handle,
+    matrix_grid_handle,
+    tactic_name,
+    platform=None,
+    context=None,
+    subtechniques=None,
 ):
     """Build technique and subtechnique columns for a given matrix and attach them to the appropriate object listings.
 
@@ -657,44 +827,45 @@ def build_technique_and_sub_columns(
                                 columns will be appended here)
     :param tactic_name: The name of the corresponding tactic for this column
     :param platform: [Optional] The name of a platform to filter subtechniques by
+    :param context: [Optional] A `StixIndexContext` of src, to look up sub-techniques in
+    :param subtechniques: [Optional] The sub-techniques of each technique, as in a `TacticColumn` of a matrix layout,
+                                already filtered by platform and sorted. If given, src and context are not used.
 
     :return: Nothing (meta - modifies the passed in merge_data_handle and matrix_grid_handle objects)
     """
     techniques_column = []
     subtechniques_column = []
 
-    all_sub_techniques = src.query(
-        [
-            Filter("type", "=", "relationship"),
-            Filter("relationship_type", "=", "subtechnique-of"),
-        ]
-    )
-    all_sub_techniques = MemoryStore(stix_data=all_sub_techniques)
+    if subtechniques is None:
+        if context is None:
+            context = StixIndexContext(src)
+        subtechniques = {}
+        for technique in techniques:
+            # sub-technique relationships
+            subtechnique_ofs = context.subtechnique_relationships.get(technique["id"], [])
+            if len(subtechnique_ofs) > 0:
+                technique_subtechniques = [context.objects_by_id.get(rel["source_ref"]) for rel in subtechnique_ofs]
+                if platform:
+                    technique_subtechniques = filter_platforms(
+                        technique_subtechniques,
+                        MATRIX_PLATFORMS_LOOKUP[platform] if platform in MATRIX_PLATFORMS_LOOKUP else [platform],
+                    )
+                technique_subtechniques = remove_revoked_deprecated(technique_subtechniques)
+                subtechniques[technique["id"]] = sorted(technique_subtechniques, key=lambda x: x["name"])
 
     for technique in techniques:
         techniques_column.append(technique["name"])
 
-        # sub-technique relationships
-        subtechnique_ofs = all_sub_techniques.query([Filter("target_ref", "=", technique["id"])])
-
         # if there are sub-techniques on the tactic
-        if len(subtechnique_ofs) > 0:
+        if technique["id"] in subtechniques:
             # top of row range to merge
             technique_top = len(techniques_column) + 1
 
-            subtechniques = [src.get(rel["source_ref"]) for rel in subtechnique_ofs]
-            if platform:
-                subtechniques = filter_platforms(
-                    subtechniques,
-                    MATRIX_PLATFORMS_LOOKUP[platform] if platform in MATRIX_PLATFORMS_LOOKUP else [platform],
-                )
-
-            subtechniques = remove_revoked_deprecated(subtechniques)
-            subtechniques = sorted(subtechniques, key=lambda x: x["name"])
-            for i in range(len(subtechniques)):  # for each sub-technique
+            technique_subtechniques = subtechniques[technique["id"]]
+            for i in range(len(technique_subtechniques)):  # for each sub-technique
                 if i != 0:
                     techniques_column.append("")  # first sub-technique is parallel to the technique in the layout
-                subtechniques_column.append(subtechniques[i]["name"])
+                subtechniques_column.append(technique_subtechniques[i]["name"])
             technique_bottom = len(techniques_column) + 1  # bottom of row range to merge
             if technique_top != technique_bottom:  # more than 1 sub-technique
                 merge_data_handle.append(
@@ -780,11 +951,18 @@ def build_parsed_DF_matrix(matrix_grid, columns, merge, parsed_dict):
     return parsed
 
 
-def matricesToDf(src, domain):
+@profiled()
+def matricesToDf(src, domain, context=None, cache_dir=None):
     """Parse STIX matrices from the given data and return parsed matrix structures.
 
+    The tactic columns, techniques and sub-techniques of the matrices are laid out by
+    `mitreattack.stix20.matrix_layout.MatrixLayoutCache`, which shares them with the navlayers exporters.
+
     :param src: MemoryStore or other stix2 DataSource object holding the domain data
     :param domain: domain of ATT&CK src corresponds to, e.g "enterprise-attack"
+    :param context: optional, a `StixIndexContext` of src, to lay out the matrices from its objects instead of
+        querying src again
+    :param cache_dir: optional, directory to cache the matrix layouts in, in addition to memory
     :returns: [{ matrix, name, description, merge, border }, ... ] where
         matrix is a pandas dataframe of the matrix
         name is the name of the matrix
@@ -792,12 +970,22 @@ def matricesToDf(src, domain):
         merge is a list of CellRange objects that need to be merged for formatting of the sub-techniques in the matrix
         columns is the number of columns in the data
     """
-    matrices = src.query([Filter("type", "=", "x-mitre-matrix")])
-    matrices = remove_revoked_deprecated(matrices)
+    stix_objects = context.objects_by_id.values() if context else None
+    layout_cache = MatrixLayoutCache(src, cache_dir=cache_dir, stix_objects=stix_objects)
+    layouts = layout_cache.get_layouts()
+    # In order to support "groups" of platforms, each platform is checked against the lookup a second time. If an
+    # second entry can be found, the platforms of that entry will be used, otherwise, the singular platform will be.
+    platform_layouts = {
+        platform: layout_cache.get_layouts(
+            MATRIX_PLATFORMS_LOOKUP[platform] if platform in MATRIX_PLATFORMS_LOOKUP else [platform]
+        )
+        for platform in MATRIX_PLATFORMS_LOOKUP[domain]
+    }
     matrices_parsed = []
     sub_matrices_parsed = []
 
-    for matrix in tqdm(matrices, desc="parsing matrices"):
+    for matrix_index, layout in enumerate(tqdm(layouts, desc="parsing matrices")):
+        matrix = layout.matrix
         sub_matrices_grid = dict()
         sub_matrices_merges = dict()
         sub_matrices_columns = dict()
@@ -807,7 +995,7 @@ def matricesToDf(src, domain):
             sub_matrices_columns[entry] = []
 
         parsed = {
-            "name": matrix["name"] if len(matrices) == 1 else f"{domain.split('-')[0].capitalize()} {matrix['name']}",
+            "name": matrix["name"] if len(layouts) == 1 else f"{domain.split('-')[0].capitalize()} {matrix['name']}",
             "description": matrix["description"],
         }
 
@@ -815,56 +1003,34 @@ def matricesToDf(src, domain):
         merge = []  # list of CellRange objects to merge later
 
         columns = []  # column names
-        for tactic_ref in tqdm(matrix["tactic_refs"], desc="processing matrix tactics"):
-            tactic = src.get(tactic_ref)
+        for column_index, column in enumerate(tqdm(layout.columns, desc="processing matrix tactics")):
+            tactic = column.tactic
             columns.append(tactic["name"])  # add tactic header
 
-            # parse techniques in tactic
-            techniques = list(
-                filter(
-                    lambda t: not ("x_mitre_is_subtechnique" in t and t["x_mitre_is_subtechnique"]),
-                    src.query(
-                        [
-                            Filter("type", "=", "attack-pattern"),
-                            Filter(
-                                "kill_chain_phases.phase_name",
-                                "=",
-                                tactic["x_mitre_shortname"],
-                            ),
-                        ]
-                    ),
-                )
-            )
-            techniques = remove_revoked_deprecated(techniques)
-            techniques = sorted(techniques, key=lambda x: x["name"])
             # add techniques
             build_technique_and_sub_columns(
                 src=src,
-                techniques=techniques,
+                techniques=column.techniques,
                 columns=columns,
                 merge_data_handle=merge,
                 matrix_grid_handle=matrix_grid,
                 tactic_name=tactic["name"],
+                subtechniques=column.subtechniques,
             )
 
             for platform in MATRIX_PLATFORMS_LOOKUP[domain]:
-                # In order to support "groups" of platforms, each platform is checked against the lookup a second time.
-                # If an second entry can be found, the results from that query will be used, otherwise, the singular
-                # platform will be.
-                a_techs = filter_platforms(
-                    techniques,
-                    MATRIX_PLATFORMS_LOOKUP[platform] if platform in MATRIX_PLATFORMS_LOOKUP else [platform],
-                )
-                if a_techs:
+                platform_column = platform_layouts[platform][matrix_index].columns[column_index]
+                if platform_column.techniques:
                     sub_matrices_columns[platform].append(tactic["name"])
                     build_technique_and_sub_columns(
                         src=src,
-                        techniques=a_techs,
+                        techniques=platform_column.techniques,
                         columns=sub_matrices_columns[platform],
                         merge_data_handle=sub_matrices_merges[platform],
                         matrix_grid_handle=sub_matrices_grid[platform],
                         tactic_name=tactic["name"],
                         platform=platform,
+                        subtechniques=platform_column.subtechniques,
                     )
 
         # square the grid because pandas doesn't like jagged columns
@@ -890,7 +1056,7 @@ def matricesToDf(src, domain):
         for submatrix in sub_matrices_grid:
             if sub_matrices_grid[submatrix]:  # make sure we found matches for something
                 local = copy.deepcopy(parsed)
-                local["name"] = f"{submatrix}" if len(matrices) == 1 else f"{submatrix} {matrix['name']}"
+                local["name"] = f"{submatrix}" if len(layouts) == 1 else f"{submatrix} {matrix['name']}"
                 local["description"] = local["description"].split(":")[0] + f": {submatrix}"
                 subparsed = build_parsed_DF_matrix(
                     sub_matrices_grid[submatrix],
@@ -904,25 +1070,34 @@ def matricesToDf(src, domain):
     return matrices_parsed, sub_matrices_parsed
 
 
-def relationshipsToDf(src, relatedType=None):
-    """Parse STIX relationships from the given data and return corresponding pandas dataframes.
-
-    :param src: MemoryStore or other stix2 DataSource object holding the domain data
-    :param relatedType: optional, singular attack type to only return relationships with, e.g "mitigation"
-    :returns: a lookup of labels (descriptors/names) to dataframes
+# columns of the relationship dataframes, in the order they are added to each row
+RELATIONSHIP_COLUMNS = [
+    "source ID",
+    "source name",
+    "source ref",
+    "source type",
+    "mapping type",
+    "target ID",
+    "target name",
+    "target ref",
+    "target type",
+    "mapping description",
+    "STIX ID",
+    "created",
+    "last modified",
+]
+# columns only added to a relationship's row if the relationship has the property
+OPTIONAL_RELATIONSHIP_COLUMNS = ["mapping description", "created", "last modified"]
+
+
+@profiled("parse relationships")
+def _parse_relationships(context):
+    """Parse all STIX relationships from the given data into a single dataframe.
+
+    :param context: a `StixIndexContext` of the domain data
+    :returns: a tuple of the relationships dataframe, sorted for display, and the citations dataframe of the
+        relationships. The index of the relationships dataframe is the order the relationships were parsed in.
     """
-    # Helper lookups
-    attackToStixTerm = {
-        "technique": ["attack-pattern"],
-        "tactic": ["x-mitre-tactic"],
-        "software": ["tool", "malware"],
-        "group": ["intrusion-set"],
-        "campaign": ["campaign"],
-        "asset": ["x-mitre-asset"],
-        "mitigation": ["course-of-action"],
-        "matrix": ["x-mitre-matrix"],
-        "datasource": ["x-mitre-data-component"],
-    }
     stixToAttackTerm = {
         "attack-pattern": "technique",
         "x-mitre-tactic": "tactic",
@@ -937,17 +1112,22 @@ def relationshipsToDf(src, relatedType=None):
         "x-mitre-asset": "asset",
     }
 
-    mitre_attack_data = MitreAttackData(src=src)
+    # build the columns of the dataframe directly, one list per column, instead of a dict per relationship
+    columns = {column: [] for column in RELATIONSHIP_COLUMNS}
+    # each distinct date is only formatted once
+    formatted_dates = {}
+
+    def format_relationship_date(date):
+        formatted = formatted_dates.get(date)
+        if formatted is None:
+            formatted = formatted_dates[date] = format_date(date)
+        return formatted
 
     # get master list of relationships
-    relationships = src.query([Filter("type", "=", "relationship")])
-    relationships = remove_revoked_deprecated(relationships)
-    relationship_rows = []  # build list of rows for dataframe
-    # tqdm description depends on the related type and parameters
-    iterdesc = "parsing all relationships" if not relatedType else f"parsing relationships for type={relatedType}"
-    for relationship in tqdm(relationships, desc=iterdesc):
-        source = src.get(relationship["source_ref"])  # source object of the relationship
-        target = src.get(relationship["target_ref"])  # target object of the relationship
+    relationships = context.get_objects("relationship")
+    for relationship in tqdm(relationships, desc="parsing all relationships"):
+        source = context.objects_by_id.get(relationship["source_ref"])  # source object of the relationship
+        target = context.objects_by_id.get(relationship["target_ref"])  # target object of the relationship
 
         # filter if related objects don't exist or are revoked or deprecated
         if not source or source.get("x_mitre_deprecated", False) is True or source.get("revoked", False) is True:
@@ -961,49 +1141,35 @@ def relationshipsToDf(src, relatedType=None):
         if relationship["relationship_type"] == "subtechnique-of":
             continue
 
-        # filter out relationships not with relatedType
-        if relatedType:
-            related = False
-
-            # try all stix types for the ATT&CK type
-            for stixTerm in attackToStixTerm[relatedType]:
-                # if any stix type is part of the relationship
-                if source["type"] == stixTerm or target["type"] == stixTerm:
-                    related = True
-                    break
-
-            if not related:
-                # skip this relationship if the types don't match
-                continue
-
         # add mapping data
-        row = {}
-
-        row["source ID"] = mitre_attack_data.get_attack_id(stix_id=source["id"])
-        row["source name"] = source.get("name")
-        row["source ref"] = source.get("id")
-        row["source type"] = stixToAttackTerm.get(source["type"])
+        columns["source ID"].append(context.attack_ids[source["id"]])
+        columns["source name"].append(source.get("name"))
+        columns["source ref"].append(source.get("id"))
+        columns["source type"].append(stixToAttackTerm.get(source["type"]))
 
         # mapping type goes between the source/target data
-        row["mapping type"] = relationship["relationship_type"]
+        columns["mapping type"].append(relationship["relationship_type"])
 
-        row["target ID"] = mitre_attack_data.get_attack_id(stix_id=target["id"])
-        row["target name"] = target.get("name")
-        row["target ref"] = target.get("id")
-        row["target type"] = stixToAttackTerm.get(target["type"])
+        columns["target ID"].append(context.attack_ids[target["id"]])
+        columns["target name"].append(target.get("name"))
+        columns["target ref"].append(target.get("id"))
+        columns["target type"].append(stixToAttackTerm.get(target["type"]))
 
-        if "description" in relationship:  # add description of relationship to the end of the row
-            row["mapping description"] = relationship["description"]
+        # add description of relationship to the end of the row
+        columns["mapping description"].append(relationship.get("description", np.nan))
         # add required fields for workbench import: relationship stix id, created, and modified
-        row["STIX ID"] = relationship["id"]
-        if "created" in relationship:
-            row["created"] = format_date(relationship["created"])
-        if "modified" in relationship:
-            row["last modified"] = format_date(relationship["modified"])
-        relationship_rows.append(row)
-
-    citations = get_citations(relationships)
-    relationships = pd.DataFrame(relationship_rows).sort_values(
+        columns["STIX ID"].append(relationship["id"])
+        columns["created"].append(
+            format_relationship_date(relationship["created"]) if "created" in relationship else np.nan
+        )
+        columns["last modified"].append(
+            format_relationship_date(relationship["modified"]) if "modified" in relationship else np.nan
+        )
+
+    citations = context.get_citations("relationship")
+    relationships = _make_dataframe(columns)
+    # drop the optional columns no relationship has, and order the columns as they were first added to a row
+    relationships = _select_relationships(relationships, pd.Series(True, index=relationships.index)).sort_values(
         [
             "mapping type",
             "source type",
@@ -1016,6 +1182,68 @@ def relationshipsToDf(src, relatedType=None):
             "last modified",
         ]
     )
+    return relationships, citations
+
+
+def _select_relationships(relationships, mask):
+    """Select rows of a relationships dataframe from `_parse_relationships`.
+
+    The result is the same as parsing only the selected relationships: optional columns (e.g. the description)
+    only exist if a selected relationship has them, and the columns are in the order they are first added.
+
+    :param relationships: dataframe of relationships from `_parse_relationships`
+    :param mask: boolean Series of the rows to select
+    :returns: the selected relationships
+    """
+    selected = relationships[mask]
+    # the first parsed row that added each column; optional columns no selected row added are dropped
+    parse_order = selected.index.to_numpy()
+    first_row = {}
+    for column in selected.columns:
+        if column not in OPTIONAL_RELATIONSHIP_COLUMNS:
+            first_row[column] = parse_order.min()
+        elif selected[column].notna().any():
+            first_row[column] = parse_order[selected[column].notna().to_numpy()].min()
+    columns = sorted(first_row, key=lambda column: (first_row[column], RELATIONSHIP_COLUMNS.index(column)))
+    return selected[columns]
+
+
+@profiled()
+def relationshipsToDf(src, relatedType=None, relationships=None, context=None):
+    """Parse STIX relationships from the given data and return corresponding pandas dataframes.
+
+    :param src: MemoryStore or other stix2 DataSource object holding the domain data
+    :param relatedType: optional, singular attack type to only return relationships with, e.g "mitigation"
+    :param relationships: optional, the result of `relationshipsToDf(src)`. If given, the relationships for
+        `relatedType` are selected from it instead of being parsed again from `src`.
+    :param context: optional, a `StixIndexContext` of src, to share lookups between builders instead of querying
+        src again
+    :returns: a lookup of labels (descriptors/names) to dataframes
+    """
+    # Helper lookups
+    attackToAttackTerms = {
+        "technique": ["technique"],
+        "tactic": ["tactic"],
+        "software": ["software"],
+        "group": ["group"],
+        "campaign": ["campaign"],
+        "asset": ["asset"],
+        "mitigation": ["mitigation"],
+        "matrix": ["matrix"],
+        "datasource": ["datacomponent"],
+    }
+
+    if relationships is None:
+        relationships, citations = _parse_relationships(context or StixIndexContext(src))
+    else:
+        citations = relationships.get("citations", pd.DataFrame())
+        relationships = relationships["relationships"]
+
+    if relatedType:
+        # filter out relationships not with relatedType
+        related_terms = attackToAttackTerms[relatedType]
+        mask = relationships["source type"].isin(related_terms) | relationships["target type"].isin(related_terms)
+        relationships = _select_relationships(relationships, mask)
 
     # return all relationships and citations
     if not relatedType:
@@ -1109,6 +1337,7 @@ def relationshipsToDf(src, relatedType=None):
         return dataframes
 
 
+@profiled("relationship citations")
 def _get_relationship_citations(object_dataframe, relationship_df):
     """Extract citations for each _object_ in the relationship dataframe.
 
@@ -1119,20 +1348,27 @@ def _get_relationship_citations(object_dataframe, relationship_df):
     :return: Array of strings, with each string being placed relative to the object listing, and containing all
         relevant citations
     """
-    object_listing = [x for x in object_dataframe["ID"]]
-    new_citations = []
-    for z in [x for x in relationship_df if x != "citations"]:
-        subset = []
-        for y in object_listing:
-            mask = relationship_df[z].values == y
-            filtered = relationship_df[z].loc[mask]
-            temp = set()
-            for description in filter(lambda x: x == x, filtered["mapping description"].tolist()):
-                [temp.add(x) for x in re.findall(r"\(Citation: (.*?)\)", description)]
-            subset.append(",".join([f"(Citation: {z})" for z in temp]))
-        if not new_citations:
-            new_citations = subset
-        else:
-            for i in range(0, len(new_citations)):
-                new_citations[i] = ",".join([new_citations[i], subset[i]])
-    return new_citations
+    citations_by_sheet = []
+    for sheet_name, sheet in relationship_df.items():
+        if sheet_name == "citations":
+            continue
+        # an object's citations are those of every relationship in the sheet with a cell equal to the object's ID
+        citations_by_value = {}
+        for row, description in zip(sheet.itertuples(index=False, name=None), sheet["mapping description"]):
+            # missing descriptions are NaN
+            if not isinstance(description, str):
+                continue
+            citations = re.findall(r"\(Citation: (.*?)\)", description)
+            if not citations:
+                continue
+            for value in set(row):
+                # NaN is not equal to any ID
+                if value == value:
+                    citations_by_value.setdefault(value, {}).update(dict.fromkeys(citations))
+        citations_by_sheet.append(
+            [
+                ",".join(f"(Citation: {citation})" for citation in citations_by_value.get(object_id, ()))
+                for object_id in object_dataframe["ID"]
+            ]
+        )
+    return [",".join(object_citations) for object_citations in zip(*citations_by_sheet)]
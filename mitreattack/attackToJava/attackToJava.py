@@ -14,7 +14,7 @@ from pprint import pprint
 INVALID_CHARACTERS = ["\\", "/", "*", "[", "]", ":", "?"]
 SUB_CHARACTERS = ["\\", "/"]
 
-from mitreattack.attackToExcel import attackToExcel
+from mitreattack.attackToExcel import attackToExcel, stixToDf
 from mitreattack.attackToJava import stixToJava
 from mitreattack.attackToJava import getJavaImports
 
@@ -89,9 +89,12 @@ def export(
         else:
             mem_store = attackToExcel.get_stix_data(domain=domain, version=version, remote=remote)            
 
-        stixToJava.stixToTactics(stix_data=mem_store, package_name=package_name, domain=domain, verbose_class=verbose_class,output_dir=output_dir)
+        # Index the domain once for both tactics and techniques
+        context = stixToDf.StixIndexContext(mem_store)
 
-        stixToJava.stixToTechniques(all_data_sources,all_defenses_bypassed,all_platforms,stix_data=mem_store, package_name=package_name, domain=domain, verbose_class=verbose_class,output_dir=output_dir)
+        stixToJava.stixToTactics(stix_data=mem_store, package_name=package_name, domain=domain, verbose_class=verbose_class,output_dir=output_dir, context=context)
+
+        stixToJava.stixToTechniques(all_data_sources,all_defenses_bypassed,all_platforms,stix_data=mem_store, package_name=package_name, domain=domain, verbose_class=verbose_class,output_dir=output_dir, context=context)
 
     logger.info(f"************ Generating import statements for easy use ************")
 
@@ -1,5 +1,5 @@
 from mitreattack.attackToExcel import stixToDf
-from stix2 import Filter, MemoryStore
+from stix2 import MemoryStore
 
 
 from pprint import pprint
@@ -158,7 +158,7 @@ def writeJinja2Template(templateEnv,template_name: str, output_file: str, fields
         f.write(outputText)
 
 
-def stixToTactics(stix_data: MemoryStore, package_name: str, domain: str , verbose_class: bool = False, output_dir: str ="."):
+def stixToTactics(stix_data: MemoryStore, package_name: str, domain: str , verbose_class: bool = False, output_dir: str =".", context: stixToDf.StixIndexContext = None):
 
     package_root_dir = os.path.join(output_dir,"src","main","java", package_name.replace(".", os.sep) )
 
@@ -169,8 +169,9 @@ def stixToTactics(stix_data: MemoryStore, package_name: str, domain: str , verbo
     package_dir = os.path.join(package_root_dir, "tactic" )
     os.makedirs(package_dir, exist_ok=True)
 
-    tactics = stix_data.query([Filter("type", "=", "x-mitre-tactic")])
-    tactics = stixToDf.remove_revoked_deprecated(tactics)
+    if context is None:
+        context = stixToDf.StixIndexContext(stix_data)
+    tactics = context.get_objects("x-mitre-tactic")
 
     tactic_rows = []
     for tactic in tactics:
@@ -207,11 +208,12 @@ def stixToTactics(stix_data: MemoryStore, package_name: str, domain: str , verbo
         writeJinja2Template(templateEnv, "GenericTactic.jinja2", os.path.join(package_dir,f"Generic{tactic['class_name']}.java"), tactic)
             
 
-def stixToTechniques(all_data_sources:SortedDict, all_defenses_bypassed:SortedDict ,all_platforms:SortedDict ,stix_data: MemoryStore,package_name: str, domain , verbose_class: bool = False, output_dir: str ="."):
+def stixToTechniques(all_data_sources:SortedDict, all_defenses_bypassed:SortedDict ,all_platforms:SortedDict ,stix_data: MemoryStore,package_name: str, domain , verbose_class: bool = False, output_dir: str =".", context: stixToDf.StixIndexContext = None):
     """Parse STIX techniques from the given data and write corresponding Java classes
 
     :param stix_data: MemoryStore or other stix2 DataSource object holding the domain data
     :param domain: domain of ATT&CK stix_data corresponds to, e.g "enterprise-attack"
+    :param context: optional, a `StixIndexContext` of stix_data, shared with other builders of the same domain
     """
 
     package_root_dir = os.path.join(output_dir,"src","main","java", package_name.replace(".", os.sep) )
@@ -220,32 +222,19 @@ def stixToTechniques(all_data_sources:SortedDict, all_defenses_bypassed:SortedDi
 
     domain_package_dir = os.path.join(package_root_dir, domain_bare )
 
-    techniques = stix_data.query([Filter("type", "=", "attack-pattern")])
-    techniques =stixToDf.remove_revoked_deprecated(techniques)
+    if context is None:
+        context = stixToDf.StixIndexContext(stix_data)
+    techniques = context.get_objects("attack-pattern")
     technique_rows = []
 
-    tactics = stix_data.query([Filter("type", "=", "x-mitre-tactic")])
-    tactics =stixToDf.remove_revoked_deprecated(tactics)
-    tactic_names = {}
-    for tactic in tactics:
-        x_mitre_shortname = tactic["x_mitre_shortname"]
-        tactic_names[x_mitre_shortname] = tactic["name"]
-
-    all_sub_techniques = stix_data.query(
-        [
-            Filter("type", "=", "relationship"),
-            Filter("relationship_type", "=", "subtechnique-of"),
-        ]
-    )
-    all_sub_techniques = MemoryStore(stix_data=all_sub_techniques)
+    tactic_names = context.tactic_names
 
     for technique in techniques:
         # get parent technique if sub-technique
         #pprint(technique)
         subtechnique = "x_mitre_is_subtechnique" in technique and technique["x_mitre_is_subtechnique"]
         if subtechnique:
-            subtechnique_of = all_sub_techniques.query([Filter("source_ref", "=", technique["id"])])[0]
-            parent = stix_data.get(subtechnique_of["target_ref"])
+            parent = context.parent_techniques[technique["id"]]
 
         # base STIX properties
         row =stixToDf.parseBaseStix(technique)
@@ -1,16 +1,21 @@
 """A helper script to generate changelogs between different versions of ATT&CK."""
 
 import argparse
+import copy
 import datetime
 import difflib
+import hashlib
 import json
 import os
 import re
 import sys
 import textwrap
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Union
 
 import markdown
 import requests
@@ -24,6 +29,8 @@ from stix2 import Filter, MemoryStore
 from tqdm import tqdm
 
 from mitreattack import release_info
+from mitreattack.diffStix.releaseCache import ReleaseCache
+from mitreattack.worker_pool import get_worker_pool
 
 # explanation of modification types to data objects for legend in layer files
 date = datetime.datetime.today()
@@ -35,6 +42,21 @@ layer_defaults = [
     os.path.join("output", f"{this_month}_Updates_Pre.json"),
 ]
 
+# keys added to the new STIX objects when finding their changes, in the order they are added in
+change_annotation_keys = [
+    "detailed_diff",
+    "revoked_by",
+    "previous_version",
+    "version_change",
+    "description_change_table",
+    "changelog_mitigations",
+    "changelog_detections",
+    "changelog_relationships",
+]
+
+# DiffStix object used by the worker processes of DiffStix.load_data
+_worker_state = {}
+
 
 @dataclass
 class AttackObjectVersion:
@@ -75,6 +97,9 @@ class DiffStix(object):
         use_mitre_cti: bool = False,
         verbose: bool = False,
         include_contributors: bool = False,
+        workers: int = None,
+        release_data: Dict[str, Dict[str, dict]] = None,
+        cache_dir: str = None,
     ):
         """Construct a new DiffStix object.
 
@@ -100,6 +125,18 @@ class DiffStix(object):
             Print progress bar and status messages to stdout, by default False
         include_contributors : bool, optional
             Include contributor information for new contributors, by default False
+        workers : int, optional
+            Number of worker processes to load the domains and find the changes of each domain and object type in
+            parallel, by default None, which does everything in the current process. The `stix_datastore` of domains
+            loaded in worker processes is None, as STIX objects cannot be sent between processes.
+        release_data : Dict[str, Dict[str, dict]], optional
+            Data of the old and new releases already loaded with `load_release_domain`, as
+            {"old": {domain: domain data}, "new": {domain: domain data}}, to compare instead of loading `old` and
+            `new`, by default None. The new STIX objects are annotated with their changes, so the new release must not
+            be shared with another DiffStix object.
+        cache_dir : str, optional
+            Directory to cache the parsed releases loaded from `old` and `new` in, by default None. Unchanged
+            releases are then loaded from the cache, and their `stix_datastore` is None.
         """
         self.domains = domains
         self.layers = layers
@@ -112,6 +149,8 @@ class DiffStix(object):
         self.use_mitre_cti = use_mitre_cti
         self.verbose = verbose
         self.include_contributors = include_contributors
+        self.workers = workers
+        self.cache_dir = cache_dir
 
         self.domain_to_domain_label = {
             "enterprise-attack": "Enterprise",
@@ -158,6 +197,12 @@ class DiffStix(object):
         # will hold information of contributors of the new release {... {"contributor_credit/name_as_key": counter]} ...}
         self.release_contributors = {}
 
+        # (domain, object type, STIX ID) of the objects whose description may have changed, in the order the
+        # objects were found, until their tables are numbered by assign_description_change_anchors()
+        self.description_changes = []
+        # (domain, object type, STIX ID) => anchor number of the description change table of the object
+        self.description_change_anchors = {}
+
         # data gets loaded into here in the load_data() function. All other functionalities rely on this data structure
         self.data = {
             "old": {},
@@ -184,213 +229,512 @@ class DiffStix(object):
 
         for domain in self.domains:
             for datastore_version in ["old", "new"]:
-                self.data[datastore_version][domain] = {
-                    "attack_objects": {
-                        # self.types
-                        # "techniques": {},
-                        # ...
-                    },
-                    "attack_release_version": None,  # "X.Y"
-                    "stix_datastore": None,  # <stix.MemoryStore>
-                    "relationships": {
-                        "subtechniques": {},
-                        "revoked-by": {},
-                    },
-                }
-
-                for _type in self.types:
-                    self.data[datastore_version][domain]["attack_objects"][_type] = {}
+                if release_data:
+                    self.data[datastore_version][domain] = release_data[datastore_version][domain]
+                else:
+                    self.data[datastore_version][domain] = get_empty_domain_data(types=self.types)
+        self._preloaded = bool(release_data)
 
         self.load_data()
 
+    def _copy_without_datastores(self) -> "DiffStix":
+        """Get a copy of this object that can be sent to worker processes, without the STIX datastores."""
+        diff_stix = copy.copy(self)
+        diff_stix.data = dict(self.data)
+        for datastore_version in ["old", "new"]:
+            diff_stix.data[datastore_version] = {
+                domain: {**domain_data, "stix_datastore": None}
+                for domain, domain_data in self.data[datastore_version].items()
+            }
+        return diff_stix
+
+    def _get_executor(self, max_workers: int) -> ProcessPoolExecutor:
+        """Get a pool of worker processes sharing this object, forked where "fork" is the default start method."""
+        return get_worker_pool(
+            max_workers=max_workers,
+            worker_state=_worker_state,
+            state={"diff_stix": self},
+            initializer=_init_worker,
+            get_initargs=lambda: (self._copy_without_datastores(),),
+        )
+
     def load_data(self):
-        """Load data from files into data dict."""
-        for domain in track(self.domains, description="Loading domains"):
-            self.load_domain(domain=domain)
-
-        for domain in track(self.domains, description="Finding changes by domain"):
-            for obj_type in self.types:
-                logger.debug(f"Loading: [{domain:17}]/{obj_type}")
-
-                old_attack_objects = self.data["old"][domain]["attack_objects"][obj_type]
-                new_attack_objects = self.data["new"][domain]["attack_objects"][obj_type]
-
-                intersection = old_attack_objects.keys() & new_attack_objects.keys()
-                additions = new_attack_objects.keys() - old_attack_objects.keys()
-                deletions = old_attack_objects.keys() - new_attack_objects.keys()
-
-                # sets to store the ids of objects for each section
-                major_version_changes = set()
-                minor_version_changes = set()
-                other_version_changes = set()
-                patches = set()
-                revocations = set()
-                deprecations = set()
-                unchanged = set()
-
-                # find changes, revocations and deprecations
-                for stix_id in intersection:
-                    old_stix_obj = old_attack_objects[stix_id]
-                    new_stix_obj = new_attack_objects[stix_id]
-                    attack_id = get_attack_id(new_stix_obj)
-
-                    ddiff = DeepDiff(old_stix_obj, new_stix_obj, ignore_order=True, verbose_level=2)
-                    detailed_diff = ddiff.to_json()
-                    new_stix_obj["detailed_diff"] = detailed_diff
-
-                    ########################################
-                    # Newly revoked objects
-                    ########################################
-                    if new_stix_obj.get("revoked"):
-                        # only work with newly revoked objects
-                        if not old_stix_obj.get("revoked"):
-                            if stix_id not in self.data["new"][domain]["relationships"]["revoked-by"]:
-                                logger.error(f"[{stix_id}] revoked object has no revoked-by relationship")
-                                continue
-
-                            revoked_by_key = self.data["new"][domain]["relationships"]["revoked-by"][stix_id][0][
-                                "target_ref"
-                            ]
-                            if revoked_by_key not in new_attack_objects:
-                                logger.error(
-                                    f"{stix_id} revoked by {revoked_by_key}, but {revoked_by_key} not found in new STIX bundle!!"
-                                )
-                                continue
-
-                            revoking_object = new_attack_objects[revoked_by_key]
-                            new_stix_obj["revoked_by"] = revoking_object
-
-                            revocations.add(stix_id)
-
-                    ##########################
-                    # Newly deprecated objects
-                    ##########################
-                    elif new_stix_obj.get("x_mitre_deprecated"):
-                        # if previously deprecated, not a change
-                        if not old_stix_obj.get("x_mitre_deprecated"):
-                            deprecations.add(stix_id)
-
-                    #############################################################
-                    # Objects shared between old and new STIX bundles by STIX IDs
-                    #############################################################
-                    else:
-                        # Verify if there are new contributors on the object
-                        self.update_contributors(old_object=old_stix_obj, new_object=new_stix_obj)
-
-                        old_version = get_attack_object_version(old_stix_obj)
-                        new_version = get_attack_object_version(new_stix_obj)
-                        new_stix_obj["previous_version"] = old_version
-
-                        if is_major_version_change(old_version=old_version, new_version=new_version):
-                            major_version_changes.add(stix_id)
-                        elif is_minor_version_change(old_version=old_version, new_version=new_version):
-                            minor_version_changes.add(stix_id)
-                        elif is_other_version_change(old_version=old_version, new_version=new_version):
-                            logger.warning(
-                                f"{stix_id} - Unexpected version increase {old_version} → {new_version}. [{attack_id}] {new_stix_obj['name']}"
-                            )
-                            other_version_changes.add(stix_id)
-                        elif is_patch_change(old_stix_obj=old_stix_obj, new_stix_obj=new_stix_obj):
-                            patches.add(stix_id)
-                        else:
-                            unchanged.add(stix_id)
-
-                        if new_version != old_version:
-                            new_stix_obj["version_change"] = f"{old_version} → {new_version}"
-
-                        # Description changes
-                        #####################
-                        old_lines = old_stix_obj["description"].replace("\n", " ").splitlines()
-                        new_lines = new_stix_obj["description"].replace("\n", " ").splitlines()
-                        old_lines_unique = [line for line in old_lines if line not in new_lines]
-                        new_lines_unique = [line for line in new_lines if line not in old_lines]
-                        if old_lines_unique or new_lines_unique:
-                            html_diff = difflib.HtmlDiff(wrapcolumn=60)
-                            html_diff._legend = ""
-                            delta = html_diff.make_table(old_lines, new_lines, "Old Description", "New Description")
-                            new_stix_obj["description_change_table"] = delta
-
-                        # Relationship changes
-                        ######################
-                        if new_stix_obj["type"] == "attack-pattern":
-                            self.find_technique_mitigation_changes(new_stix_obj, domain)
-                            self.find_technique_detection_changes(new_stix_obj, domain)
-
-                #############
-                # New objects
-                #############
-                for stix_id in additions:
-                    new_stix_obj = new_attack_objects[stix_id]
-                    attack_id = get_attack_id(new_stix_obj)
-
-                    # Add contributions from additions
-                    self.update_contributors(old_object=None, new_object=new_stix_obj)
-
-                    # verify version is 1.0
-                    x_mitre_version = get_attack_object_version(stix_obj=new_stix_obj)
-                    if not version_increment_is_valid(None, x_mitre_version, "additions"):
-                        logger.warning(
-                            f"{stix_id} - Unexpected new version. Expected 1.0, but is {x_mitre_version}. [{attack_id}] {new_stix_obj['name']}"
+        """Load data from files into data dict.
+
+        With `self.workers`, each version of each domain is loaded, and the changes of each domain and object type
+        are found, in worker processes. The changes are then merged in the same order as without worker processes.
+        """
+        if not self.workers or self.workers <= 1:
+            if not self._preloaded:
+                for domain in track(self.domains, description="Loading domains"):
+                    self.load_domain(domain=domain)
+
+            for domain in track(self.domains, description="Finding changes by domain"):
+                for obj_type in self.types:
+                    changes = self.find_changes(domain=domain, obj_type=obj_type)
+                    self.merge_changes(domain=domain, obj_type=obj_type, changes=changes)
+            self.load_relationship_changes()
+            return
+
+        datastores = []
+        if not self._preloaded:
+            datastores = [
+                (domain, datastore_version) for domain in self.domains for datastore_version in ["old", "new"]
+            ]
+        tasks = [(domain, obj_type) for domain in self.domains for obj_type in self.types]
+        logger.info(f"Finding changes with {self.workers} worker processes")
+        try:
+            if datastores:
+                with self._get_executor(max_workers=min(self.workers, len(datastores))) as executor:
+                    futures = {datastore: executor.submit(_load_in_worker, *datastore) for datastore in datastores}
+                    for (domain, datastore_version), future in track(futures.items(), description="Loading domains"):
+                        self.data[datastore_version][domain] = future.result()
+
+            with self._get_executor(max_workers=min(self.workers, len(tasks))) as executor:
+                futures = {task: executor.submit(_find_changes_in_worker, *task) for task in tasks}
+                # merge in a fixed order, regardless of which worker finishes first
+                for (domain, obj_type), future in track(futures.items(), description="Finding changes by domain"):
+                    self.merge_changes(domain=domain, obj_type=obj_type, changes=future.result())
+        finally:
+            _worker_state.clear()
+        self.load_relationship_changes()
+
+    def find_changes(self, domain: str, obj_type: str) -> dict:
+        """Find the changes of the objects of a type in a domain.
+
+        The new STIX objects are annotated with their changes, which are also returned so that the changes found in
+        a worker process can be merged into this object with `merge_changes`.
+
+        Parameters
+        ----------
+        domain : str
+            An ATT&CK domain from the following list ["enterprise-attack", "mobile-attack", "ics-attack"]
+        obj_type : str
+            An ATT&CK object type, e.g. "techniques"
+
+        Returns
+        -------
+        dict
+            "sections": section => STIX IDs of the objects in the section, "annotations": STIX ID => keys added to
+            the new STIX object, with the STIX ID of the "revoked_by" object, and "contributors": new contributor =>
+            number of objects they contributed to
+        """
+        logger.debug(f"Loading: [{domain:17}]/{obj_type}")
+
+        old_attack_objects = self.data["old"][domain]["attack_objects"][obj_type]
+        new_attack_objects = self.data["new"][domain]["attack_objects"][obj_type]
+        old_object_hashes = self.data["old"][domain]["object_hashes"]
+        new_object_hashes = self.data["new"][domain]["object_hashes"]
+        contributors = {}
+
+        intersection = old_attack_objects.keys() & new_attack_objects.keys()
+        additions = new_attack_objects.keys() - old_attack_objects.keys()
+        deletions = old_attack_objects.keys() - new_attack_objects.keys()
+
+        # sets to store the ids of objects for each section
+        major_version_changes = set()
+        minor_version_changes = set()
+        other_version_changes = set()
+        patches = set()
+        revocations = set()
+        deprecations = set()
+        unchanged = set()
+
+        # find changes, revocations and deprecations
+        for stix_id in intersection:
+            old_stix_obj = old_attack_objects[stix_id]
+            new_stix_obj = new_attack_objects[stix_id]
+            attack_id = get_attack_id(new_stix_obj)
+
+            ########################################################################
+            # Objects with the same content, which are unchanged or still revoked or
+            # deprecated. Most objects are unchanged between releases.
+            ########################################################################
+            if old_object_hashes[stix_id] == new_object_hashes[stix_id]:
+                if not (new_stix_obj.get("revoked") or new_stix_obj.get("x_mitre_deprecated")):
+                    new_stix_obj["previous_version"] = get_attack_object_version(old_stix_obj)
+                    unchanged.add(stix_id)
+                    # the relationships of an unchanged technique can still change
+                    if new_stix_obj["type"] == "attack-pattern":
+                        self.find_technique_mitigation_changes(new_stix_obj, domain)
+                        self.find_technique_detection_changes(new_stix_obj, domain)
+                continue
+
+            ########################################
+            # Newly revoked objects
+            ########################################
+            if new_stix_obj.get("revoked"):
+                # only work with newly revoked objects
+                if not old_stix_obj.get("revoked"):
+                    if stix_id not in self.data["new"][domain]["relationships"]["revoked-by"]:
+                        logger.error(f"[{stix_id}] revoked object has no revoked-by relationship")
+                        continue
+
+                    revoked_by_key = self.data["new"][domain]["relationships"]["revoked-by"][stix_id][0]["target_ref"]
+                    if revoked_by_key not in new_attack_objects:
+                        logger.error(
+                            f"{stix_id} revoked by {revoked_by_key}, but {revoked_by_key} not found in new STIX bundle!!"
                         )
+                        continue
 
-                #################
-                # Deleted objects
-                #################
-                for stix_id in deletions:
-                    old_stix_obj = old_attack_objects[stix_id]
-                    attack_id = get_attack_id(old_stix_obj)
-
-                #############################
-                # Create self.data["changes"]
-                #############################
-                if obj_type not in self.data["changes"]:
-                    self.data["changes"][obj_type] = {}
-
-                # sorted(groupings, key=lambda grouping: grouping["parent"]["name"])
-                # sorted(additions, key=lambda stix_object: stix_object["name"])
-
-                self.data["changes"][obj_type][domain] = {
-                    "additions": sorted(
-                        [new_attack_objects[stix_id] for stix_id in additions],
-                        key=lambda stix_object: stix_object["name"],
-                    ),
-                    "major_version_changes": sorted(
-                        [new_attack_objects[stix_id] for stix_id in major_version_changes],
-                        key=lambda stix_object: stix_object["name"],
-                    ),
-                    "minor_version_changes": sorted(
-                        [new_attack_objects[stix_id] for stix_id in minor_version_changes],
-                        key=lambda stix_object: stix_object["name"],
-                    ),
-                    "other_version_changes": sorted(
-                        [new_attack_objects[stix_id] for stix_id in other_version_changes],
-                        key=lambda stix_object: stix_object["name"],
-                    ),
-                    "patches": sorted(
-                        [new_attack_objects[stix_id] for stix_id in patches],
-                        key=lambda stix_object: stix_object["name"],
-                    ),
-                    "revocations": sorted(
-                        [new_attack_objects[stix_id] for stix_id in revocations],
-                        key=lambda stix_object: stix_object["name"],
-                    ),
-                    "deprecations": sorted(
-                        [new_attack_objects[stix_id] for stix_id in deprecations],
-                        key=lambda stix_object: stix_object["name"],
-                    ),
-                    "deletions": sorted(
-                        [old_attack_objects[stix_id] for stix_id in deletions],
-                        key=lambda stix_object: stix_object["name"],
-                    ),
-                }
+                    revoking_object = new_attack_objects[revoked_by_key]
+                    new_stix_obj["revoked_by"] = revoking_object
+
+                    revocations.add(stix_id)
+
+            ##########################
+            # Newly deprecated objects
+            ##########################
+            elif new_stix_obj.get("x_mitre_deprecated"):
+                # if previously deprecated, not a change
+                if not old_stix_obj.get("x_mitre_deprecated"):
+                    deprecations.add(stix_id)
+
+            #############################################################
+            # Objects shared between old and new STIX bundles by STIX IDs
+            #############################################################
+            else:
+                # Verify if there are new contributors on the object
+                self.update_contributors(
+                    old_object=old_stix_obj, new_object=new_stix_obj, release_contributors=contributors
+                )
+
+                old_version = get_attack_object_version(old_stix_obj)
+                new_version = get_attack_object_version(new_stix_obj)
+                new_stix_obj["previous_version"] = old_version
+
+                if is_major_version_change(old_version=old_version, new_version=new_version):
+                    major_version_changes.add(stix_id)
+                elif is_minor_version_change(old_version=old_version, new_version=new_version):
+                    minor_version_changes.add(stix_id)
+                elif is_other_version_change(old_version=old_version, new_version=new_version):
+                    logger.warning(
+                        f"{stix_id} - Unexpected version increase {old_version} → {new_version}. [{attack_id}] {new_stix_obj['name']}"
+                    )
+                    other_version_changes.add(stix_id)
+                elif is_patch_change(old_stix_obj=old_stix_obj, new_stix_obj=new_stix_obj):
+                    patches.add(stix_id)
+                else:
+                    unchanged.add(stix_id)
+
+                if new_version != old_version:
+                    new_stix_obj["version_change"] = f"{old_version} → {new_version}"
+
+                # Relationship changes
+                ######################
+                if new_stix_obj["type"] == "attack-pattern":
+                    self.find_technique_mitigation_changes(new_stix_obj, domain)
+                    self.find_technique_detection_changes(new_stix_obj, domain)
+
+        #############
+        # New objects
+        #############
+        for stix_id in additions:
+            new_stix_obj = new_attack_objects[stix_id]
+            attack_id = get_attack_id(new_stix_obj)
+
+            # Add contributions from additions
+            self.update_contributors(old_object=None, new_object=new_stix_obj, release_contributors=contributors)
+
+            # verify version is 1.0
+            x_mitre_version = get_attack_object_version(stix_obj=new_stix_obj)
+            if not version_increment_is_valid(None, x_mitre_version, "additions"):
+                logger.warning(
+                    f"{stix_id} - Unexpected new version. Expected 1.0, but is {x_mitre_version}. [{attack_id}] {new_stix_obj['name']}"
+                )
+
+        sections = {
+            "additions": additions,
+            "major_version_changes": major_version_changes,
+            "minor_version_changes": minor_version_changes,
+            "other_version_changes": other_version_changes,
+            "patches": patches,
+            "revocations": revocations,
+            "deprecations": deprecations,
+            "deletions": deletions,
+        }
+        # only keep unchanged objects if we want to display them later
+        if self.unchanged:
+            sections["unchanged"] = unchanged
+
+        annotations = {}
+        for stix_id in intersection:
+            new_stix_obj = new_attack_objects[stix_id]
+            annotations[stix_id] = {key: new_stix_obj[key] for key in change_annotation_keys if key in new_stix_obj}
+            if "revoked_by" in new_stix_obj:
+                annotations[stix_id]["revoked_by"] = new_stix_obj["revoked_by"]["id"]
+
+        return {
+            # lists rather than sets, which keep their order when sent back from worker processes
+            "sections": {section: list(stix_ids) for section, stix_ids in sections.items()},
+            "annotations": annotations,
+            "contributors": contributors,
+        }
+
+    def merge_changes(self, domain: str, obj_type: str, changes: dict):
+        """Add the changes of the objects of a type in a domain, as returned by `find_changes`, to self.data.
+
+        Parameters
+        ----------
+        domain : str
+            An ATT&CK domain from the following list ["enterprise-attack", "mobile-attack", "ics-attack"]
+        obj_type : str
+            An ATT&CK object type, e.g. "techniques"
+        changes : dict
+            The changes returned by `find_changes`
+        """
+        old_attack_objects = self.data["old"][domain]["attack_objects"][obj_type]
+        new_attack_objects = self.data["new"][domain]["attack_objects"][obj_type]
+
+        for stix_id, annotations in changes["annotations"].items():
+            new_stix_obj = new_attack_objects[stix_id]
+            annotations = dict(annotations)
+            if "revoked_by" in annotations:
+                annotations["revoked_by"] = new_attack_objects[annotations["revoked_by"]]
+
+            # Description changes of objects that are not revoked or deprecated, which are only rendered for the
+            # detailed outputs. Objects with the same content hash in both releases have the same description.
+            if "previous_version" in annotations and (
+                self.data["old"][domain]["object_hashes"][stix_id] != self.data["new"][domain]["object_hashes"][stix_id]
+            ):
+                self.description_changes.append((domain, obj_type, stix_id))
+
+            add_change_annotations(stix_object=new_stix_obj, annotations=annotations)
+
+        for contributor, count in changes["contributors"].items():
+            self.release_contributors[contributor] = self.release_contributors.get(contributor, 0) + count
+
+        #############################
+        # Create self.data["changes"]
+        #############################
+        if obj_type not in self.data["changes"]:
+            self.data["changes"][obj_type] = {}
+
+        sections = changes["sections"]
+        self.data["changes"][obj_type][domain] = {}
+        for section in [
+            "additions",
+            "major_version_changes",
+            "minor_version_changes",
+            "other_version_changes",
+            "patches",
+            "revocations",
+            "deprecations",
+        ]:
+            self.data["changes"][obj_type][domain][section] = sorted(
+                [new_attack_objects[stix_id] for stix_id in sections[section]],
+                key=lambda stix_object: stix_object["name"],
+            )
+        self.data["changes"][obj_type][domain]["deletions"] = sorted(
+            [old_attack_objects[stix_id] for stix_id in sections["deletions"]],
+            key=lambda stix_object: stix_object["name"],
+        )
+
+        # only create unchanged data if we want to display it later
+        if "unchanged" in sections:
+            self.data["changes"][obj_type][domain]["unchanged"] = [
+                new_attack_objects[stix_id] for stix_id in sections["unchanged"]
+            ]
+
+        logger.debug(f"Loaded:  [{domain:17}]/{obj_type}")
+
+    def find_detailed_diff(self, domain: str, obj_type: str, new_stix_obj: dict) -> Optional[str]:
+        """Find the detailed differences between the old and new version of an ATT&CK object with DeepDiff.
+
+        Parameters
+        ----------
+        domain : str
+            An ATT&CK domain from the following list ["enterprise-attack", "mobile-attack", "ics-attack"]
+        obj_type : str
+            An ATT&CK object type, e.g. "techniques"
+        new_stix_obj : dict
+            The new version of the ATT&CK object.
+
+        Returns
+        -------
+        Optional[str]
+            The differences as JSON, "{}" if the object has the same content hash in both releases, or None if the
+            object is not in the old release.
+        """
+        stix_id = new_stix_obj["id"]
+        old_attack_objects = self.data["old"][domain]["attack_objects"][obj_type]
+        if stix_id not in old_attack_objects:
+            return None
+        if self.data["old"][domain]["object_hashes"][stix_id] == self.data["new"][domain]["object_hashes"][stix_id]:
+            return "{}"
+        return get_detailed_diff(old_stix_obj=old_attack_objects[stix_id], new_stix_obj=new_stix_obj)
+
+    def load_detailed_diffs(self):
+        """Add the detailed differences found by DeepDiff to the changed objects found in both releases.
+
+        DeepDiff is slow, so the differences are only found for the objects of the detailed HTML and JSON outputs.
+        The writers of those outputs find them one section at a time with `iter_detailed_changes` instead.
+        """
+        for obj_type, domains in self.data["changes"].items():
+            for domain, sections in domains.items():
+                stix_objects = []
+                for section, section_objects in sections.items():
+                    if section in ["additions", "deletions"]:
+                        continue
+                    stix_objects.extend(section_objects)
+                    # revoking objects are part of the objects they revoke
+                    if section == "revocations":
+                        stix_objects.extend(stix_object["revoked_by"] for stix_object in section_objects)
+
+                for new_stix_obj in stix_objects:
+                    if "detailed_diff" in new_stix_obj:
+                        continue
+                    detailed_diff = self.find_detailed_diff(domain=domain, obj_type=obj_type, new_stix_obj=new_stix_obj)
+                    if detailed_diff is not None:
+                        add_change_annotations(stix_object=new_stix_obj, annotations={"detailed_diff": detailed_diff})
+
+    def assign_description_change_anchors(self):
+        """Assign anchor numbers to the description change tables of the objects found since the last call.
+
+        The tables are numbered in the order the objects were found, so that every output numbers the tables the
+        same regardless of when, where and in which order they are rendered.
+        """
+        anchor_number = len(self.description_change_anchors)
+        for domain, obj_type, stix_id in self.description_changes:
+            old_stix_obj = self.data["old"][domain]["attack_objects"][obj_type][stix_id]
+            new_stix_obj = self.data["new"][domain]["attack_objects"][obj_type][stix_id]
+            if description_changed(old_stix_obj=old_stix_obj, new_stix_obj=new_stix_obj):
+                self.description_change_anchors[(domain, obj_type, stix_id)] = anchor_number
+                anchor_number += 1
+        self.description_changes = []
+
+    @contextmanager
+    def description_table_executor(self):
+        """Get worker processes to render description change tables in with `self.workers`, or None without."""
+        if not self.workers or self.workers <= 1:
+            yield None
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            yield executor
+
+    def render_description_change_tables(
+        self, description_changes: List[tuple], executor: Optional[ProcessPoolExecutor] = None
+    ) -> List[str]:
+        """Render the description change tables of objects numbered by `assign_description_change_anchors`.
+
+        Parameters
+        ----------
+        description_changes : List[tuple]
+            (domain, object type, STIX ID) of each object
+        executor : ProcessPoolExecutor, optional
+            Worker processes to render the tables in, by default None, which renders them in this process
+
+        Returns
+        -------
+        List[str]
+            The table of each object
+        """
+        tasks = []
+        for domain, obj_type, stix_id in description_changes:
+            anchor_number = self.description_change_anchors[(domain, obj_type, stix_id)]
+            old_stix_obj = self.data["old"][domain]["attack_objects"][obj_type][stix_id]
+            new_stix_obj = self.data["new"][domain]["attack_objects"][obj_type][stix_id]
+            tasks.append((anchor_number, old_stix_obj["description"], new_stix_obj["description"]))
+
+        if executor is None or len(tasks) <= 1:
+            tables = _render_description_change_tables(tasks)
+        else:
+            # a few chunks per worker, as each table is quick to render but slow to send between processes alone
+            chunk_size = -(-len(tasks) // (self.workers * 4))
+            chunks = [tasks[start : start + chunk_size] for start in range(0, len(tasks), chunk_size)]
+            tables = [table for chunk in executor.map(_render_description_change_tables, chunks) for table in chunk]
+        return tables
+
+    def load_description_change_tables(self):
+        """Add the HTML tables of the changes in their description to the objects whose description changed.
+
+        The tables are only rendered for the detailed HTML and JSON outputs, and with `self.workers` they are
+        rendered in worker processes. The writers of those outputs render them one section at a time with
+        `iter_detailed_changes` instead.
+        """
+        self.assign_description_change_anchors()
+        description_changes = [
+            (domain, obj_type, stix_id)
+            for domain, obj_type, stix_id in self.description_change_anchors
+            if "description_change_table" not in self.data["new"][domain]["attack_objects"][obj_type][stix_id]
+        ]
+        if not description_changes:
+            return
+
+        with self.description_table_executor() as executor:
+            tables = self.render_description_change_tables(description_changes, executor=executor)
+        for (domain, obj_type, stix_id), table in zip(description_changes, tables):
+            new_stix_obj = self.data["new"][domain]["attack_objects"][obj_type][stix_id]
+            add_change_annotations(stix_object=new_stix_obj, annotations={"description_change_table": table})
+
+    def iter_detailed_changes(
+        self,
+        object_type: str,
+        domain: str,
+        section: str,
+        stix_objects: List[dict],
+        executor: Optional[ProcessPoolExecutor] = None,
+    ) -> Iterator[dict]:
+        """Get the objects of a section with their detailed differences and description change tables.
+
+        The differences and tables are only found for the given objects, and added to copies of them, so that
+        writing an output only holds the differences and tables of one section at a time.
+
+        Parameters
+        ----------
+        object_type : str
+            An ATT&CK object type, e.g. "techniques"
+        domain : str
+            An ATT&CK domain from the following list ["enterprise-attack", "mobile-attack", "ics-attack"]
+        section : str
+            The section of changes of the objects, e.g. "additions"
+        stix_objects : List[dict]
+            The objects of the section, e.g. from `get_section_changes`
+        executor : ProcessPoolExecutor, optional
+            Worker processes to render the description change tables in, by default None
 
-                # only create unchanged data if we want to display it later
-                if self.unchanged:
-                    self.data["changes"][obj_type][domain]["unchanged"] = [
-                        new_attack_objects[stix_id] for stix_id in unchanged
-                    ]
+        Returns
+        -------
+        Iterator[dict]
+            The objects, in the same order, as they are annotated by `load_detailed_diffs` and
+            `load_description_change_tables`
+        """
+        self.assign_description_change_anchors()
+        annotated_objects = list(stix_objects)
+        # revoking objects are part of the objects they revoke
+        if section == "revocations":
+            annotated_objects.extend(stix_object["revoked_by"] for stix_object in stix_objects)
+        description_changes = list(
+            dict.fromkeys(
+                (domain, object_type, stix_object["id"])
+                for stix_object in annotated_objects
+                if (domain, object_type, stix_object["id"]) in self.description_change_anchors
+                and "description_change_table" not in stix_object
+            )
+        )
+        tables = dict(
+            zip(description_changes, self.render_description_change_tables(description_changes, executor=executor))
+        )
 
-                logger.debug(f"Loaded:  [{domain:17}]/{obj_type}")
+        def annotate(stix_object: dict) -> dict:
+            annotations = {}
+            table = tables.get((domain, object_type, stix_object["id"]))
+            if table is not None:
+                annotations["description_change_table"] = table
+            if section not in ["additions", "deletions"] and "detailed_diff" not in stix_object:
+                detailed_diff = self.find_detailed_diff(domain=domain, obj_type=object_type, new_stix_obj=stix_object)
+                if detailed_diff is not None:
+                    annotations["detailed_diff"] = detailed_diff
+            if not annotations:
+                return stix_object
+            stix_object = dict(stix_object)
+            add_change_annotations(stix_object=stix_object, annotations=annotations)
+            return stix_object
+
+        for stix_object in stix_objects:
+            if section == "revocations":
+                stix_object = {**stix_object, "revoked_by": annotate(stix_object["revoked_by"])}
+            yield annotate(stix_object)
 
     def find_technique_mitigation_changes(self, new_stix_obj: dict, domain: str):
         """Find changes in the relationships between Techniques and Mitigations.
@@ -405,24 +749,24 @@ class DiffStix(object):
         stix_id = new_stix_obj["id"]
         all_old_domain_mitigations = self.data["old"][domain]["attack_objects"]["mitigations"]
         all_new_domain_mitigations = self.data["new"][domain]["attack_objects"]["mitigations"]
+        old_relationships_by_target = self.data["old"][domain]["relationships_by_target"]
+        new_relationships_by_target = self.data["new"][domain]["relationships_by_target"]
         old_mitigations = {}
         new_mitigations = {}
 
-        for _, mitigation_relationship in self.data["old"][domain]["relationships"]["mitigations"].items():
+        for mitigation_relationship in old_relationships_by_target["mitigations"].get(stix_id, []):
             if mitigation_relationship.get("x_mitre_deprecated") or mitigation_relationship.get("revoked"):
                 continue
-            if stix_id == mitigation_relationship["target_ref"]:
-                old_mitigation_id = mitigation_relationship["source_ref"]
-                old_mitigation = all_old_domain_mitigations[old_mitigation_id]
-                old_mitigations[old_mitigation["id"]] = old_mitigation
+            old_mitigation_id = mitigation_relationship["source_ref"]
+            old_mitigation = all_old_domain_mitigations[old_mitigation_id]
+            old_mitigations[old_mitigation["id"]] = old_mitigation
 
-        for _, mitigation_relationship in self.data["new"][domain]["relationships"]["mitigations"].items():
+        for mitigation_relationship in new_relationships_by_target["mitigations"].get(stix_id, []):
             if mitigation_relationship.get("x_mitre_deprecated") or mitigation_relationship.get("revoked"):
                 continue
-            if stix_id == mitigation_relationship["target_ref"]:
-                new_mitigation_id = mitigation_relationship["source_ref"]
-                new_mitigation = all_new_domain_mitigations[new_mitigation_id]
-                new_mitigations[new_mitigation["id"]] = new_mitigation
+            new_mitigation_id = mitigation_relationship["source_ref"]
+            new_mitigation = all_new_domain_mitigations[new_mitigation_id]
+            new_mitigations[new_mitigation["id"]] = new_mitigation
 
         shared_mitigations = old_mitigations.keys() & new_mitigations.keys()
         brand_new_mitigations = new_mitigations.keys() - old_mitigations.keys()
@@ -464,34 +808,34 @@ class DiffStix(object):
         all_old_domain_datacomponents = self.data["old"][domain]["attack_objects"]["datacomponents"]
         all_new_domain_datasources = self.data["new"][domain]["attack_objects"]["datasources"]
         all_new_domain_datacomponents = self.data["new"][domain]["attack_objects"]["datacomponents"]
+        old_relationships_by_target = self.data["old"][domain]["relationships_by_target"]
+        new_relationships_by_target = self.data["new"][domain]["relationships_by_target"]
         old_detections = {}
         new_detections = {}
 
-        for _, detection_relationship in self.data["old"][domain]["relationships"]["detections"].items():
+        for detection_relationship in old_relationships_by_target["detections"].get(stix_id, []):
             if detection_relationship.get("x_mitre_deprecated") or detection_relationship.get("revoked"):
                 continue
-            if stix_id == detection_relationship["target_ref"]:
-                old_datacomponent_id = detection_relationship["source_ref"]
-                old_datacomponent = all_old_domain_datacomponents[old_datacomponent_id]
-                old_datasource_id = old_datacomponent["x_mitre_data_source_ref"]
-                old_datasource = all_old_domain_datasources[old_datasource_id]
-                old_datasource_attack_id = get_attack_id(stix_obj=old_datasource)
-                old_detections[
-                    old_datacomponent_id
-                ] = f"{old_datasource_attack_id}: {old_datasource['name']} ({old_datacomponent['name']})"
-
-        for _, detection_relationship in self.data["new"][domain]["relationships"]["detections"].items():
+            old_datacomponent_id = detection_relationship["source_ref"]
+            old_datacomponent = all_old_domain_datacomponents[old_datacomponent_id]
+            old_datasource_id = old_datacomponent["x_mitre_data_source_ref"]
+            old_datasource = all_old_domain_datasources[old_datasource_id]
+            old_datasource_attack_id = get_attack_id(stix_obj=old_datasource)
+            old_detections[old_datacomponent_id] = (
+                f"{old_datasource_attack_id}: {old_datasource['name']} ({old_datacomponent['name']})"
+            )
+
+        for detection_relationship in new_relationships_by_target["detections"].get(stix_id, []):
             if detection_relationship.get("x_mitre_deprecated") or detection_relationship.get("revoked"):
                 continue
-            if stix_id == detection_relationship["target_ref"]:
-                new_datacomponent_id = detection_relationship["source_ref"]
-                new_datacomponent = all_new_domain_datacomponents[new_datacomponent_id]
-                new_datasource_id = new_datacomponent["x_mitre_data_source_ref"]
-                new_datasource = all_new_domain_datasources[new_datasource_id]
-                new_datasource_attack_id = get_attack_id(stix_obj=new_datasource)
-                new_detections[
-                    new_datacomponent_id
-                ] = f"{new_datasource_attack_id}: {new_datasource['name']} ({new_datacomponent['name']})"
+            new_datacomponent_id = detection_relationship["source_ref"]
+            new_datacomponent = all_new_domain_datacomponents[new_datacomponent_id]
+            new_datasource_id = new_datacomponent["x_mitre_data_source_ref"]
+            new_datasource = all_new_domain_datasources[new_datasource_id]
+            new_datasource_attack_id = get_attack_id(stix_obj=new_datasource)
+            new_detections[new_datacomponent_id] = (
+                f"{new_datasource_attack_id}: {new_datasource['name']} ({new_datacomponent['name']})"
+            )
 
         shared_detections = old_detections.keys() & new_detections.keys()
         brand_new_detections = new_detections.keys() - old_detections.keys()
@@ -503,6 +847,86 @@ class DiffStix(object):
             "dropped": sorted([f"{old_detections[stix_id]}" for stix_id in dropped_detections]),
         }
 
+    def find_relationship_changes(self, domain: str) -> Dict[str, dict]:
+        """Find the relationships of every type added, removed and changed in a domain, by the objects they relate.
+
+        Relationships are compared by their source, type and target rather than by their STIX ID, so the work done
+        grows with the number of relationships of the releases, not with the number of objects times relationships.
+
+        Parameters
+        ----------
+        domain : str
+            An ATT&CK domain from the following list ["enterprise-attack", "mobile-attack", "ics-attack"]
+
+        Returns
+        -------
+        Dict[str, dict]
+            STIX ID of each object in both releases with relationship changes => "new", "dropped" and "changed":
+            the relationships it is the source or target of, sorted by type, source and target. Each relationship
+            is a dict of its "source_ref", "relationship_type" and "target_ref", with the ATT&CK ID and name of
+            its "source" and "target".
+        """
+        old_attack_objects = {
+            stix_id: stix_object
+            for attack_objects in self.data["old"][domain]["attack_objects"].values()
+            for stix_id, stix_object in attack_objects.items()
+        }
+        new_attack_objects = {
+            stix_id: stix_object
+            for attack_objects in self.data["new"][domain]["attack_objects"].values()
+            for stix_id, stix_object in attack_objects.items()
+        }
+
+        def get_label(stix_id: str, attack_objects: Dict[str, dict]) -> str:
+            stix_object = attack_objects.get(stix_id)
+            if not stix_object:
+                return stix_id
+            attack_id = get_attack_id(stix_obj=stix_object)
+            name = stix_object.get("name", stix_id)
+            return f"{attack_id}: {name}" if attack_id else name
+
+        relationship_changes = {}
+        keys = diff_relationships(
+            old_hashes=self.data["old"][domain]["relationship_hashes"],
+            new_hashes=self.data["new"][domain]["relationship_hashes"],
+        )
+        for change_type, change_keys in keys.items():
+            # dropped relationships are described with the objects of the old release
+            attack_objects = old_attack_objects if change_type == "dropped" else new_attack_objects
+            for source_ref, relationship_type, target_ref in change_keys:
+                relationship = {
+                    "source_ref": source_ref,
+                    "relationship_type": relationship_type,
+                    "target_ref": target_ref,
+                    "source": get_label(stix_id=source_ref, attack_objects=attack_objects),
+                    "target": get_label(stix_id=target_ref, attack_objects=attack_objects),
+                }
+                for stix_id in {source_ref, target_ref}:
+                    # relationships of added and deleted objects are changes of the objects themselves
+                    if stix_id in old_attack_objects and stix_id in new_attack_objects:
+                        object_changes = relationship_changes.setdefault(
+                            stix_id, {"new": [], "dropped": [], "changed": []}
+                        )
+                        object_changes[change_type].append(relationship)
+
+        for object_changes in relationship_changes.values():
+            for relationships in object_changes.values():
+                relationships.sort(key=lambda r: (r["relationship_type"], r["source"], r["target"]))
+        return relationship_changes
+
+    def load_relationship_changes(self):
+        """Annotate the new STIX objects of every domain with their relationship changes, as "changelog_relationships"."""
+        for domain in self.domains:
+            new_attack_objects = self.data["new"][domain]["attack_objects"]
+            for stix_id, relationship_changes in self.find_relationship_changes(domain=domain).items():
+                for attack_objects in new_attack_objects.values():
+                    if stix_id in attack_objects:
+                        add_change_annotations(
+                            stix_object=attack_objects[stix_id],
+                            annotations={"changelog_relationships": relationship_changes},
+                        )
+                        break
+
     def load_domain(self, domain: str):
         """Load data from directory according to domain.
 
@@ -512,21 +936,28 @@ class DiffStix(object):
             An ATT&CK domain from the following list ["enterprise-attack", "mobile-attack", "ics-attack"]
         """
         for datastore_version in ["old", "new"]:
-            # only allow github.com/mitre/cti to be used for the old STIX domain
-            if self.use_mitre_cti and datastore_version == "old":
-                data_store = self.get_datastore_from_mitre_cti(domain=domain, datastore_version=datastore_version)
-            else:
-                directory = self.old if datastore_version == "old" else self.new
-                stix_file = os.path.join(directory, f"{domain}.json")
+            self.load_datastore(domain=domain, datastore_version=datastore_version)
 
-                attack_version = release_info.get_attack_version(domain=domain, stix_file=stix_file)
-                self.data[datastore_version][domain]["attack_release_version"] = attack_version
-
-                data_store = MemoryStore()
-                data_store.load_from_file(stix_file)
+    def load_datastore(self, domain: str, datastore_version: str):
+        """Load a version of a domain from its directory, or from the MITRE CTI repo.
 
+        Parameters
+        ----------
+        domain : str
+            An ATT&CK domain from the following list ["enterprise-attack", "mobile-attack", "ics-attack"]
+        datastore_version : str
+            The comparative version of the ATT&CK datastore. Choices are either "old" or "new".
+        """
+        # only allow github.com/mitre/cti to be used for the old STIX domain
+        if self.use_mitre_cti and datastore_version == "old":
+            data_store = self.get_datastore_from_mitre_cti(domain=domain, datastore_version=datastore_version)
             self.data[datastore_version][domain]["stix_datastore"] = data_store
             self.parse_extra_data(data_store=data_store, domain=domain, datastore_version=datastore_version)
+        else:
+            directory = self.old if datastore_version == "old" else self.new
+            self.data[datastore_version][domain] = load_release_domain(
+                directory=directory, domain=domain, cache_dir=self.cache_dir
+            )
 
     def get_datastore_from_mitre_cti(self, domain: str, datastore_version: str) -> stix2.MemoryStore:
         """Load data from MITRE CTI repo according to domain.
@@ -578,72 +1009,11 @@ class DiffStix(object):
         datastore_version : str
             The comparative version of the ATT&CK datastore. Choices are either "old" or "new".
         """
-        attack_type_to_stix_filter = {
-            "techniques": [Filter("type", "=", "attack-pattern")],
-            "software": [Filter("type", "=", "malware"), Filter("type", "=", "tool")],
-            "groups": [Filter("type", "=", "intrusion-set")],
-            "campaigns": [Filter("type", "=", "campaign")],
-            "assets": [Filter("type", "=", "x-mitre-asset")],
-            "mitigations": [Filter("type", "=", "course-of-action")],
-            "datasources": [Filter("type", "=", "x-mitre-data-source")],
-            "datacomponents": [Filter("type", "=", "x-mitre-data-component")],
-        }
-        for object_type, stix_filters in attack_type_to_stix_filter.items():
-            raw_data = []
-            for stix_filter in stix_filters:
-                temp_filtered_list = data_store.query(stix_filter)
-                raw_data.extend(temp_filtered_list)
-
-            raw_data = deep_copy_stix(raw_data)
-            self.data[datastore_version][domain]["attack_objects"][object_type] = {
-                attack_object["id"]: attack_object for attack_object in raw_data
-            }
-
-        subtechnique_relationships = data_store.query(
-            [
-                Filter("type", "=", "relationship"),
-                Filter("relationship_type", "=", "subtechnique-of"),
-            ]
-        )
-        self.data[datastore_version][domain]["relationships"]["subtechniques"] = {
-            relationship["id"]: relationship for relationship in subtechnique_relationships
-        }
+        parse_domain_data(data_store=data_store, domain_data=self.data[datastore_version][domain])
 
-        revoked_by_relationships = data_store.query(
-            [
-                Filter("type", "=", "relationship"),
-                Filter("relationship_type", "=", "revoked-by"),
-            ]
-        )
-
-        # use list in case STIX object was revoked more than once
-        for relationship in revoked_by_relationships:
-            source_id = relationship["source_ref"]
-            if source_id not in self.data[datastore_version][domain]["relationships"]["revoked-by"]:
-                self.data[datastore_version][domain]["relationships"]["revoked-by"][source_id] = []
-            self.data[datastore_version][domain]["relationships"]["revoked-by"][source_id].append(relationship)
-
-        mitigating_relationships = data_store.query(
-            [
-                Filter("type", "=", "relationship"),
-                Filter("relationship_type", "=", "mitigates"),
-            ]
-        )
-        self.data[datastore_version][domain]["relationships"]["mitigations"] = {
-            relationship["id"]: relationship for relationship in mitigating_relationships
-        }
-
-        detection_relationships = data_store.query(
-            [
-                Filter("type", "=", "relationship"),
-                Filter("relationship_type", "=", "detects"),
-            ]
-        )
-        self.data[datastore_version][domain]["relationships"]["detections"] = {
-            relationship["id"]: relationship for relationship in detection_relationships
-        }
-
-    def update_contributors(self, old_object: Optional[dict], new_object: dict):
+    def update_contributors(
+        self, old_object: Optional[dict], new_object: dict, release_contributors: Optional[dict] = None
+    ):
         """Update contributors list if new object has contributors.
 
         Parameters
@@ -652,7 +1022,12 @@ class DiffStix(object):
             An ATT&CK STIX Domain Object (SDO).
         new_object : dict
             An ATT&CK STIX Domain Object (SDO).
+        release_contributors : Optional[dict], optional
+            Counter of contributors to update, by default self.release_contributors
         """
+        if release_contributors is None:
+            release_contributors = self.release_contributors
+
         if new_object.get("x_mitre_contributors"):
             new_object_contributors = set(new_object["x_mitre_contributors"])
 
@@ -668,10 +1043,10 @@ class DiffStix(object):
 
             # Update counter of contributor to track contributions
             for new_contributor in new_contributors:
-                if self.release_contributors.get(new_contributor):
-                    self.release_contributors[new_contributor] += 1
+                if release_contributors.get(new_contributor):
+                    release_contributors[new_contributor] += 1
                 else:
-                    self.release_contributors[new_contributor] = 1
+                    release_contributors[new_contributor] = 1
 
     def get_groupings(self, object_type: str, stix_objects: List, section: str, domain: str) -> List[Dict[str, object]]:
         """Group STIX objects together within a section.
@@ -699,6 +1074,9 @@ class DiffStix(object):
         """
         datastore_version = "old" if section == "deletions" else "new"
         subtechnique_relationships = self.data[datastore_version][domain]["relationships"]["subtechniques"]
+        subtechnique_relationships_by_target = self.data[datastore_version][domain]["relationships_by_target"][
+            "subtechniques"
+        ]
         techniques = self.data[datastore_version][domain]["attack_objects"]["techniques"]
         datacomponents = self.data[datastore_version][domain]["attack_objects"]["datacomponents"]
         datasources = self.data[datastore_version][domain]["attack_objects"]["datasources"]
@@ -719,7 +1097,9 @@ class DiffStix(object):
 
                 if is_subtechnique:
                     children[stix_object["id"]] = stix_object
-                elif has_subtechniques(stix_object=stix_object, subtechnique_relationships=subtechnique_relationships):
+                elif has_subtechniques(
+                    stix_object=stix_object, subtechnique_relationships_by_target=subtechnique_relationships_by_target
+                ):
                     parents.append(stix_object)
                 else:
                     childless.append(stix_object)
@@ -816,15 +1196,14 @@ class DiffStix(object):
         dict
             The parent STIX object, if one can be found. Otherwise an empty dictionary is returned.
         """
-        subtechnique_relationships = self.data[datastore_version][domain]["relationships"]["subtechniques"]
+        subtechnique_relationships = self.data[datastore_version][domain]["relationships_by_source"]["subtechniques"]
         techniques = self.data[datastore_version][domain]["attack_objects"]["techniques"]
         datasources = self.data[datastore_version][domain]["attack_objects"]["datasources"]
 
         if stix_object.get("x_mitre_is_subtechnique"):
-            for subtechnique_relationship in subtechnique_relationships.values():
-                if subtechnique_relationship["source_ref"] == stix_object["id"]:
-                    parent_id = subtechnique_relationship["target_ref"]
-                    return techniques[parent_id]
+            for subtechnique_relationship in subtechnique_relationships.get(stix_object["id"], [])[:1]:
+                parent_id = subtechnique_relationship["target_ref"]
+                return techniques[parent_id]
         elif stix_object["type"] == "x-mitre-data-component":
             return datasources[stix_object.get("x_mitre_data_source_ref")]
 
@@ -927,8 +1306,7 @@ class DiffStix(object):
             Key for change types used in Markdown output.
         """
         # end first line with \ to avoid the empty line from dedent()
-        key = textwrap.dedent(
-            f"""\
+        key = textwrap.dedent(f"""\
             ## Key
 
             * New objects: {self.section_descriptions["additions"]}
@@ -939,32 +1317,44 @@ class DiffStix(object):
             * Object revocations: {self.section_descriptions["revocations"]}
             * Object deprecations: {self.section_descriptions["deprecations"]}
             * Object deletions: {self.section_descriptions["deletions"]}
-            """
-        )
+            """)
 
         return key
 
     def get_markdown_string(self):
         """Return a markdown string summarizing detected differences."""
+        return "".join(self.iter_markdown())
+
+    def iter_markdown(self) -> Iterator[str]:
+        """Generate the markdown summarizing detected differences section by section.
+
+        Each chunk ends at the end of a markdown block, so that the chunks can also be converted to HTML one by one,
+        and the markdown of all the changes is never held in memory at once.
+
+        Yields
+        ------
+        str
+            The markdown of the key, the title of an object type, the title of a domain, a section of changes or the
+            contributors
+        """
         logger.info("Generating markdown output")
-        content = ""
 
         if self.show_key:
             key_content = self.get_md_key()
-            content = f"{key_content}\n\n"
+            yield f"{key_content}\n\n"
 
         for object_type in self.types:
-            domains = ""
+            # e.g "techniques"
+            yield f"## {self.attack_type_to_title[object_type]}\n\n"
 
             for domain in self.data["changes"][object_type]:
                 # e.g "Enterprise"
-                domains += f"### {self.domain_to_domain_label[domain]}\n\n"
+                yield f"### {self.domain_to_domain_label[domain]}\n\n"
                 # Skip mobile section for data sources
                 if domain == "mobile-attack" and object_type == "datasource":
                     logger.debug("Skipping - ATT&CK for Mobile does not support data sources")
-                    domains += "ATT&CK for Mobile does not support data sources\n\n"
+                    yield "ATT&CK for Mobile does not support data sources\n\n"
                     continue
-                domain_sections = ""
                 for section, stix_objects in self.data["changes"][object_type][domain].items():
                     header = f"#### {self.section_headers[object_type][section]}"
                     if stix_objects:
@@ -977,19 +1367,11 @@ class DiffStix(object):
                         section_items = self.get_markdown_section_data(
                             groupings=groupings, section=section, domain=domain
                         )
-                        domain_sections += f"{header}\n\n{section_items}\n"
-
-                # add domain sections
-                domains += f"{domain_sections}"
-
-            # e.g "techniques"
-            content += f"## {self.attack_type_to_title[object_type]}\n\n{domains}"
+                        yield f"{header}\n\n{section_items}\n"
 
         # Add contributors if requested by argument
         if self.include_contributors:
-            content += self.get_contributor_section()
-
-        return content
+            yield self.get_contributor_section()
 
     def get_layers_dict(self):
         """Return ATT&CK Navigator layers in dict format summarizing detected differences.
@@ -1074,6 +1456,8 @@ class DiffStix(object):
     def get_changes_dict(self):
         """Return dict format summarizing detected differences."""
         logger.info("Generating changes info")
+        self.load_description_change_tables()
+        self.load_detailed_diffs()
 
         changes_dict = {}
         for domain in self.domains:
@@ -1083,45 +1467,301 @@ class DiffStix(object):
             for domain, sections in domains.items():
                 changes_dict[domain][object_type] = {}
 
-                for section, stix_objects in sections.items():
-                    groupings = self.get_groupings(
-                        object_type=object_type,
-                        stix_objects=stix_objects,
-                        section=section,
-                        domain=domain,
+                for section in sections:
+                    changes_dict[domain][object_type][section] = self.get_section_changes(
+                        object_type=object_type, domain=domain, section=section
                     )
-                    # new_values includes parents & children mixed
-                    # (e.g. techniques/sub-techniques, data sources/components)
-                    new_values = cleanup_values(groupings=groupings)
-                    changes_dict[domain][object_type][section] = new_values
 
         # always add contributors
-        changes_dict["new-contributors"] = []
+        changes_dict["new-contributors"] = self.get_new_contributors()
+
+        return changes_dict
+
+    def get_section_changes(self, object_type: str, domain: str, section: str) -> List[dict]:
+        """Get the changed objects of a section, as listed in the JSON outputs.
+
+        Parameters
+        ----------
+        object_type : str
+            An ATT&CK object type, e.g. "techniques"
+        domain : str
+            An ATT&CK domain from the following list ["enterprise-attack", "mobile-attack", "ics-attack"]
+        section : str
+            A section of changes, e.g. "additions"
+
+        Returns
+        -------
+        List[dict]
+            The objects of the section, with their parents and children mixed
+            (e.g. techniques/sub-techniques, data sources/components)
+        """
+        groupings = self.get_groupings(
+            object_type=object_type,
+            stix_objects=self.data["changes"][object_type][domain][section],
+            section=section,
+            domain=domain,
+        )
+        return cleanup_values(groupings=groupings)
+
+    def get_new_contributors(self) -> List[str]:
+        """Get the contributors that are only found in the new STIX data, sorted by name, without ATT&CK."""
+        new_contributors = []
         sorted_contributors = sorted(self.release_contributors, key=lambda v: v.lower())
         for contributor in sorted_contributors:
             # do not include ATT&CK as contributor
             if contributor == "ATT&CK":
                 continue
-            changes_dict["new-contributors"].append(contributor)
+            new_contributors.append(contributor)
+        return new_contributors
 
-        return changes_dict
+
+def _init_worker(diff_stix: DiffStix):
+    """Share a DiffStix object with a worker process that did not inherit it from the parent process."""
+    _worker_state["diff_stix"] = diff_stix
+
+
+def _load_in_worker(domain: str, datastore_version: str) -> dict:
+    """Load a version of a domain in a worker process, and return its data without the STIX datastore."""
+    diff_stix = _worker_state["diff_stix"]
+    diff_stix.load_datastore(domain=domain, datastore_version=datastore_version)
+    return {**diff_stix.data[datastore_version][domain], "stix_datastore": None}
 
 
-def has_subtechniques(stix_object: dict, subtechnique_relationships: List[dict]) -> bool:
+def _find_changes_in_worker(domain: str, obj_type: str) -> dict:
+    return _worker_state["diff_stix"].find_changes(domain=domain, obj_type=obj_type)
+
+
+def _init_chain_worker(releases_data: List[Dict[str, dict]]):
+    """Share the loaded releases with a worker process that did not inherit them from the parent process."""
+    _worker_state["releases_data"] = releases_data
+
+
+def _write_chained_changelog_in_worker(**kwargs) -> Optional[str]:
+    return _write_chained_changelog(releases_data=_worker_state["releases_data"], **kwargs)
+
+
+def get_empty_domain_data(types: List[str] = None) -> dict:
+    """Get the data structure of a release of a domain, before it is loaded.
+
+    Parameters
+    ----------
+    types : List[str], optional
+        The ATT&CK object types to hold, e.g. "techniques", by default None. The objects of every type are added
+        by `parse_domain_data` either way.
+
+    Returns
+    -------
+    dict
+        The data of the domain, without objects
+    """
+    domain_data = {
+        "attack_objects": {
+            # types
+            # "techniques": {},
+            # ...
+        },
+        "attack_release_version": None,  # "X.Y"
+        "stix_datastore": None,  # <stix.MemoryStore>
+        "object_hashes": {},  # {stix_id: SHA-256 hash of the object's content}
+        "relationships": {
+            "subtechniques": {},
+            "revoked-by": {},
+        },
+        # relationships of "subtechniques", "mitigations" and "detections" indexed by their source and target
+        # {"subtechniques": {source_ref: [<relationship>, ...]}, ...}
+        "relationships_by_source": {},
+        # {"subtechniques": {target_ref: [<relationship>, ...]}, ...}
+        "relationships_by_target": {},
+        # relationships of every type that are not revoked or deprecated, by their source, type and target
+        # {(source_ref, relationship_type, target_ref): SHA-256 hash of the relationships' content}
+        "relationship_hashes": {},
+    }
+
+    for _type in types or []:
+        domain_data["attack_objects"][_type] = {}
+
+    return domain_data
+
+
+def parse_domain_data(data_store: stix2.MemoryStore, domain_data: dict):
+    """Parse STIX datastore objects and relationships into the data of a release of a domain.
+
+    Parameters
+    ----------
+    data_store : stix2.MemoryStore
+        STIX MemoryStore object representing an ATT&CK domain.
+    domain_data : dict
+        The data of the domain to fill, from `get_empty_domain_data`
+    """
+    attack_type_to_stix_filter = {
+        "techniques": [Filter("type", "=", "attack-pattern")],
+        "software": [Filter("type", "=", "malware"), Filter("type", "=", "tool")],
+        "groups": [Filter("type", "=", "intrusion-set")],
+        "campaigns": [Filter("type", "=", "campaign")],
+        "assets": [Filter("type", "=", "x-mitre-asset")],
+        "mitigations": [Filter("type", "=", "course-of-action")],
+        "datasources": [Filter("type", "=", "x-mitre-data-source")],
+        "datacomponents": [Filter("type", "=", "x-mitre-data-component")],
+    }
+    for object_type, stix_filters in attack_type_to_stix_filter.items():
+        raw_data = []
+        for stix_filter in stix_filters:
+            temp_filtered_list = data_store.query(stix_filter)
+            raw_data.extend(temp_filtered_list)
+
+        raw_data = deep_copy_stix(raw_data)
+        domain_data["attack_objects"][object_type] = {attack_object["id"]: attack_object for attack_object in raw_data}
+        for attack_object in raw_data:
+            domain_data["object_hashes"][attack_object["id"]] = get_stix_object_hash(attack_object)
+
+    # relationships are copied to dicts too, which can be sent between processes unlike STIX objects
+    subtechnique_relationships = data_store.query(
+        [
+            Filter("type", "=", "relationship"),
+            Filter("relationship_type", "=", "subtechnique-of"),
+        ]
+    )
+    subtechnique_relationships = deep_copy_stix(subtechnique_relationships)
+    domain_data["relationships"]["subtechniques"] = {
+        relationship["id"]: relationship for relationship in subtechnique_relationships
+    }
+
+    revoked_by_relationships = data_store.query(
+        [
+            Filter("type", "=", "relationship"),
+            Filter("relationship_type", "=", "revoked-by"),
+        ]
+    )
+    revoked_by_relationships = deep_copy_stix(revoked_by_relationships)
+
+    # use list in case STIX object was revoked more than once
+    for relationship in revoked_by_relationships:
+        source_id = relationship["source_ref"]
+        if source_id not in domain_data["relationships"]["revoked-by"]:
+            domain_data["relationships"]["revoked-by"][source_id] = []
+        domain_data["relationships"]["revoked-by"][source_id].append(relationship)
+
+    mitigating_relationships = data_store.query(
+        [
+            Filter("type", "=", "relationship"),
+            Filter("relationship_type", "=", "mitigates"),
+        ]
+    )
+    mitigating_relationships = deep_copy_stix(mitigating_relationships)
+    domain_data["relationships"]["mitigations"] = {
+        relationship["id"]: relationship for relationship in mitigating_relationships
+    }
+
+    detection_relationships = data_store.query(
+        [
+            Filter("type", "=", "relationship"),
+            Filter("relationship_type", "=", "detects"),
+        ]
+    )
+    detection_relationships = deep_copy_stix(detection_relationships)
+    domain_data["relationships"]["detections"] = {
+        relationship["id"]: relationship for relationship in detection_relationships
+    }
+
+    # index the relationships once, rather than scanning all of them for each object
+    for relationship_type in ["subtechniques", "mitigations", "detections"]:
+        relationships = domain_data["relationships"][relationship_type]
+        domain_data["relationships_by_source"][relationship_type] = index_relationships(
+            relationships=relationships, ref="source_ref"
+        )
+        domain_data["relationships_by_target"][relationship_type] = index_relationships(
+            relationships=relationships, ref="target_ref"
+        )
+
+    # key every relationship by what it relates rather than by its STIX ID, which can differ between releases
+    keyed_relationships = {}
+    for relationship in deep_copy_stix(data_store.query([Filter("type", "=", "relationship")])):
+        if relationship.get("x_mitre_deprecated") or relationship.get("revoked"):
+            continue
+        key = (relationship["source_ref"], relationship["relationship_type"], relationship["target_ref"])
+        keyed_relationships.setdefault(key, []).append(relationship)
+    for key, relationships in keyed_relationships.items():
+        if len(relationships) > 1:
+            # duplicate relationships are hashed together, in an order that does not depend on the bundle
+            relationships = sorted(relationships, key=lambda relationship: relationship["id"])
+            domain_data["relationship_hashes"][key] = get_stix_object_hash(relationships)
+        else:
+            domain_data["relationship_hashes"][key] = get_stix_object_hash(relationships[0])
+
+
+def load_release_domain(directory: str, domain: str, keep_datastore: bool = True, cache_dir: str = None) -> dict:
+    """Load a domain of a release from its directory.
+
+    Parameters
+    ----------
+    directory : str
+        Directory to load the STIX data of the release from
+    domain : str
+        An ATT&CK domain from the following list ["enterprise-attack", "mobile-attack", "ics-attack"]
+    keep_datastore : bool, optional
+        Keep the STIX MemoryStore in the "stix_datastore" of the data, by default True. Without it, the data only
+        holds dicts, which take less memory and can be sent between processes.
+    cache_dir : str, optional
+        Directory to cache the parsed data of the release in with `ReleaseCache`, by default None. The data is
+        loaded from the cache while the STIX file is unchanged, and the STIX datastore is then not kept.
+
+    Returns
+    -------
+    dict
+        The data of the domain
+    """
+    stix_file = os.path.join(directory, f"{domain}.json")
+    stix_hash = release_info.get_stix_hash(stix_file=stix_file)
+
+    cache = None
+    if cache_dir:
+        cache = ReleaseCache(cache_dir)
+        cache_key = cache.get_key(domain=domain, stix_hash=stix_hash)
+        domain_data = cache.load(cache_key)
+        if domain_data is not None:
+            logger.debug(f"Loaded {stix_file} from cache: {cache_dir}")
+            return domain_data
+
+    domain_data = get_empty_domain_data()
+    domain_data["attack_release_version"] = release_info.get_attack_version(
+        domain=domain, stix_file=stix_file, stix_hash=stix_hash
+    )
+
+    data_store = MemoryStore()
+    data_store.load_from_file(stix_file)
+    parse_domain_data(data_store=data_store, domain_data=domain_data)
+    if cache:
+        cache.store(cache_key, domain_data)
+    if keep_datastore:
+        domain_data["stix_datastore"] = data_store
+    return domain_data
+
+
+def has_subtechniques(
+    stix_object: dict,
+    subtechnique_relationships: Dict[str, dict] = None,
+    subtechnique_relationships_by_target: Dict[str, List[dict]] = None,
+) -> bool:
     """Return true or false depending on whether the SDO has sub-techniques.
 
     Parameters
     ----------
     stix_object : dict
         An ATT&CK STIX Domain Object (SDO).
-    subtechnique_relationships : List[dict]
-        List of STIX Relationship Object (SRO) dictionaries.
+    subtechnique_relationships : Dict[str, dict], optional
+        STIX Relationship Object (SRO) dictionaries by STIX ID, which are all scanned.
+    subtechnique_relationships_by_target : Dict[str, List[dict]], optional
+        STIX Relationship Object (SRO) dictionaries indexed by their target_ref with index_relationships(), used
+        instead of subtechnique_relationships when given.
 
     Returns
     -------
     bool
         Returns True if the stix_object has Subtechniques.
     """
+    if subtechnique_relationships_by_target is not None:
+        return bool(subtechnique_relationships_by_target.get(stix_object["id"]))
+
     for relationship in subtechnique_relationships.values():
         if relationship["target_ref"] == stix_object["id"]:
             return True
@@ -1129,6 +1769,51 @@ def has_subtechniques(stix_object: dict, subtechnique_relationships: List[dict])
     return False
 
 
+def index_relationships(relationships: Dict[str, dict], ref: str) -> Dict[str, List[dict]]:
+    """Index relationships by their source or target.
+
+    Parameters
+    ----------
+    relationships : Dict[str, dict]
+        STIX Relationship Object (SRO) dictionaries by STIX ID.
+    ref : str
+        The property to index the relationships by, either "source_ref" or "target_ref".
+
+    Returns
+    -------
+    Dict[str, List[dict]]
+        The relationships of each source or target, in the order of `relationships`.
+    """
+    index = {}
+    for relationship in relationships.values():
+        index.setdefault(relationship[ref], []).append(relationship)
+    return index
+
+
+def diff_relationships(old_hashes: Dict[tuple, str], new_hashes: Dict[tuple, str]) -> Dict[str, set]:
+    """Find the relationships added, removed and changed between two releases.
+
+    Parameters
+    ----------
+    old_hashes : Dict[tuple, str]
+        The "relationship_hashes" of the old release of a domain.
+    new_hashes : Dict[tuple, str]
+        The "relationship_hashes" of the new release of a domain.
+
+    Returns
+    -------
+    Dict[str, set]
+        "new", "dropped" and "changed": the (source_ref, relationship_type, target_ref) keys of the relationships
+        only in the new release, only in the old release, and in both releases with different content.
+    """
+    shared = old_hashes.keys() & new_hashes.keys()
+    return {
+        "new": new_hashes.keys() - old_hashes.keys(),
+        "dropped": old_hashes.keys() - new_hashes.keys(),
+        "changed": {key for key in shared if old_hashes[key] != new_hashes[key]},
+    }
+
+
 def get_placard_version_string(stix_object: dict, section: str) -> str:
     """Get the HTML version representation of the ATT&CK STIX object.
 
@@ -1302,11 +1987,7 @@ def is_patch_change(old_stix_obj: dict, new_stix_obj: dict) -> bool:
             return True
 
     # description changed, even though modified date didn't
-    old_lines = old_stix_obj["description"].replace("\n", " ").splitlines()
-    new_lines = new_stix_obj["description"].replace("\n", " ").splitlines()
-    old_lines_unique = [line for line in old_lines if line not in new_lines]
-    new_lines_unique = [line for line in new_lines if line not in old_lines]
-    if old_lines_unique or new_lines_unique:
+    if description_changed(old_stix_obj=old_stix_obj, new_stix_obj=new_stix_obj):
         logger.warning(
             f"{stix_id} - {attack_id} has a description change "
             "without the version being incremented or the last modified date changing"
@@ -1317,17 +1998,151 @@ def is_patch_change(old_stix_obj: dict, new_stix_obj: dict) -> bool:
     return False
 
 
-def get_relative_url_from_stix(stix_object: dict) -> Optional[str]:
-    """Parse the website url from a stix object.
+def add_change_annotations(stix_object: dict, annotations: dict):
+    """Add keys describing the changes of an ATT&CK object to it, in the order of `change_annotation_keys`.
 
     Parameters
     ----------
     stix_object : dict
         An ATT&CK STIX Domain Object (SDO).
+    annotations : dict
+        The keys to add, from `change_annotation_keys`.
+    """
+    annotations = {
+        **{key: stix_object.pop(key) for key in change_annotation_keys if key in stix_object},
+        **annotations,
+    }
+    for key in change_annotation_keys:
+        if key in annotations:
+            stix_object[key] = annotations[key]
 
-    Returns
-    -------
-    Optional[str]
+
+def get_stix_object_hash(stix_obj: dict) -> str:
+    """Get a SHA-256 hash of the content of an ATT&CK object, which does not depend on the order of its keys.
+
+    Parameters
+    ----------
+    stix_obj : dict
+        An ATT&CK STIX Domain Object (SDO), as copied by deep_copy_stix().
+
+    Returns
+    -------
+    str
+        The hexadecimal SHA-256 hash.
+    """
+    content = json.dumps(stix_obj, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def get_detailed_diff(old_stix_obj: dict, new_stix_obj: dict) -> str:
+    """Get the detailed differences between two versions of an ATT&CK object, ignoring the keys added by DiffStix.
+
+    Parameters
+    ----------
+    old_stix_obj : dict
+        Old ATT&CK STIX Domain Object (SDO).
+    new_stix_obj : dict
+        New ATT&CK STIX Domain Object (SDO).
+
+    Returns
+    -------
+    str
+        The differences found by DeepDiff, as JSON.
+    """
+    new_stix_obj = {key: value for key, value in new_stix_obj.items() if key not in change_annotation_keys}
+    ddiff = DeepDiff(old_stix_obj, new_stix_obj, ignore_order=True, verbose_level=2)
+    return ddiff.to_json()
+
+
+def get_description_lines(stix_obj: dict) -> List[str]:
+    """Get the lines of the description of an ATT&CK object, as compared between releases."""
+    return stix_obj["description"].replace("\n", " ").splitlines()
+
+
+def description_changed(old_stix_obj: dict, new_stix_obj: dict) -> bool:
+    """Return whether a line of the description of an ATT&CK object is only found in one of its versions.
+
+    Parameters
+    ----------
+    old_stix_obj : dict
+        Old ATT&CK STIX Domain Object (SDO).
+    new_stix_obj : dict
+        New ATT&CK STIX Domain Object (SDO).
+
+    Returns
+    -------
+    bool
+        True if the old and new description do not have the same lines, regardless of their order.
+    """
+    return set(get_description_lines(old_stix_obj)) != set(get_description_lines(new_stix_obj))
+
+
+class DescriptionHtmlDiff(difflib.HtmlDiff):
+    """HtmlDiff numbering the anchors of its tables with a given number.
+
+    difflib numbers the anchors of the tables of every HtmlDiff from a counter shared by the whole process.
+    """
+
+    def __init__(self, anchor_number: int, **kwargs):
+        super().__init__(**kwargs)
+        self.anchor_number = anchor_number
+
+    def _make_prefix(self):
+        self._prefix = [f"from{self.anchor_number}_", f"to{self.anchor_number}_"]
+
+
+def get_description_change_table(old_stix_obj: dict, new_stix_obj: dict, anchor_number: int = 0) -> Optional[str]:
+    """Get an HTML table of the changes in the description of an ATT&CK object.
+
+    Parameters
+    ----------
+    old_stix_obj : dict
+        Old ATT&CK STIX Domain Object (SDO).
+    new_stix_obj : dict
+        New ATT&CK STIX Domain Object (SDO).
+    anchor_number : int, optional
+        Number of the anchors of the table, which must be different for each table of an HTML page, by default 0.
+
+    Returns
+    -------
+    Optional[str]
+        The HTML table of the old and new description, or None if the description did not change.
+    """
+    if not description_changed(old_stix_obj=old_stix_obj, new_stix_obj=new_stix_obj):
+        return None
+
+    html_diff = DescriptionHtmlDiff(anchor_number=anchor_number, wrapcolumn=60)
+    html_diff._legend = ""
+    return html_diff.make_table(
+        get_description_lines(old_stix_obj), get_description_lines(new_stix_obj), "Old Description", "New Description"
+    )
+
+
+def _render_description_change_tables(tasks: List[tuple]) -> List[str]:
+    """Render the description change tables of (anchor number, old description, new description) tasks."""
+    tables = []
+    for anchor_number, old_description, new_description in tasks:
+        tables.append(
+            get_description_change_table(
+                old_stix_obj={"description": old_description},
+                new_stix_obj={"description": new_description},
+                anchor_number=anchor_number,
+            )
+        )
+    return tables
+
+
+def get_relative_url_from_stix(stix_object: dict) -> Optional[str]:
+    """Parse the website url from a stix object.
+
+    Parameters
+    ----------
+    stix_object : dict
+        An ATT&CK STIX Domain Object (SDO).
+
+    Returns
+    -------
+    Optional[str]
         The relative URL for the ATT&CK object.
     """
     is_subtechnique = stix_object["type"] == "attack-pattern" and stix_object.get("x_mitre_is_subtechnique")
@@ -1446,6 +2261,16 @@ def markdown_to_html(outfile: str, content: str, diffStix: DiffStix):
         An instance of a DiffStix object.
     """
     logger.info("Writing HTML to file")
+    html_string = get_html_frontmatter(diffStix=diffStix)
+    html_string += markdown.markdown(content)
+    html_string += "</div>"
+
+    with open(outfile, "w", encoding="utf-8") as outputfile:
+        outputfile.write(html_string)
+
+
+def get_html_frontmatter(diffStix: DiffStix) -> str:
+    """Get the start of the HTML page of the changelog, up to its content converted from markdown."""
     old_version = diffStix.data["old"]["enterprise-attack"]["attack_release_version"]
     new_version = diffStix.data["new"]["enterprise-attack"]["attack_release_version"]
     if new_version:
@@ -1457,11 +2282,166 @@ def markdown_to_html(outfile: str, content: str, diffStix: DiffStix):
     html_string = """<div style='max-width: 55em;margin: auto;margin-top:20px;font-family: "Roboto", sans-serif;'>"""
     html_string += "<meta charset='utf-8'>"
     html_string += header
-    html_string += markdown.markdown(content)
-    html_string += "</div>"
+    return html_string
 
-    with open(outfile, "w", encoding="utf-8") as outputfile:
-        outputfile.write(html_string)
+
+def write_markdown_files(
+    diffStix: DiffStix,
+    markdown_file: Optional[str] = None,
+    html_file: Optional[str] = None,
+    return_markdown: bool = False,
+) -> Optional[str]:
+    """Write the markdown of the changes, and the HTML page converted from it, section by section.
+
+    Each section is written as soon as it is generated, so the changelog is never held in memory as a whole unless
+    `return_markdown` is set. The HTML page is the same as `markdown_to_html` writes from the whole markdown.
+
+    Parameters
+    ----------
+    diffStix : DiffStix
+        An instance of a DiffStix object.
+    markdown_file : str, optional
+        If set, writes a markdown file, by default None
+    html_file : str, optional
+        If set, writes an HTML file from the parsed markdown, by default None
+    return_markdown : bool, optional
+        Also return the whole markdown, by default False
+
+    Returns
+    -------
+    Optional[str]
+        The markdown of the changes, if `return_markdown` is set.
+    """
+    markdown_chunks = [] if return_markdown else None
+    with ExitStack() as stack:
+        markdown_output = None
+        if markdown_file:
+            logger.info("Writing markdown to file")
+            markdown_output = stack.enter_context(open(markdown_file, "w"))
+
+        html_output = None
+        if html_file:
+            logger.info("Writing HTML to file")
+            html_output = stack.enter_context(open(html_file, "w", encoding="utf-8"))
+            html_output.write(get_html_frontmatter(diffStix=diffStix))
+
+        # the markdown converter separates the blocks of the page with a newline
+        html_separator = ""
+        for chunk in diffStix.iter_markdown():
+            if markdown_output:
+                markdown_output.write(chunk)
+            if html_output:
+                html_chunk = markdown.markdown(chunk)
+                if html_chunk:
+                    html_output.write(html_separator + html_chunk)
+                    html_separator = "\n"
+            if markdown_chunks is not None:
+                markdown_chunks.append(chunk)
+
+        if html_output:
+            html_output.write("</div>")
+
+    if markdown_chunks is not None:
+        return "".join(markdown_chunks)
+    return None
+
+
+def write_changes_json(json_file: str, diffStix: DiffStix):
+    """Write the changes, as returned by `DiffStix.get_changes_dict`, to a JSON file section by section.
+
+    The file is the same as dumping the whole changes dict with 4 spaces of indentation.
+
+    Parameters
+    ----------
+    json_file : str
+        File to write the JSON changes to.
+    diffStix : DiffStix
+        An instance of a DiffStix object.
+    """
+    logger.info("Writing JSON updates to file")
+    indent = " " * 4
+
+    with diffStix.description_table_executor() as executor, open(json_file, "w") as file:
+        file.write("{")
+        for domain in diffStix.domains:
+            file.write(f"\n{indent}{json.dumps(domain)}: ")
+            object_types = [
+                object_type for object_type, domains in diffStix.data["changes"].items() if domain in domains
+            ]
+            if not object_types:
+                file.write("{},")
+                continue
+
+            file.write("{")
+            for type_index, object_type in enumerate(object_types):
+                file.write(f"{',' if type_index else ''}\n{indent * 2}{json.dumps(object_type)}: ")
+                sections = diffStix.data["changes"][object_type][domain]
+                if not sections:
+                    file.write("{}")
+                    continue
+
+                file.write("{")
+                for section_index, section in enumerate(sections):
+                    section_changes = diffStix.get_section_changes(
+                        object_type=object_type, domain=domain, section=section
+                    )
+                    # the detailed differences and description change tables are only held for one section
+                    section_changes = list(
+                        diffStix.iter_detailed_changes(
+                            object_type=object_type,
+                            domain=domain,
+                            section=section,
+                            stix_objects=section_changes,
+                            executor=executor,
+                        )
+                    )
+                    # JSON strings never contain a newline, so every newline starts an indented line
+                    section_json = json.dumps(section_changes, cls=AttackChangesEncoder, indent=4)
+                    section_json = section_json.replace("\n", f"\n{indent * 3}")
+                    file.write(f"{',' if section_index else ''}\n{indent * 3}{json.dumps(section)}: {section_json}")
+                file.write(f"\n{indent * 2}}}")
+            file.write(f"\n{indent}}},")
+
+        contributors_json = json.dumps(diffStix.get_new_contributors(), indent=4).replace("\n", f"\n{indent}")
+        file.write(f'\n{indent}"new-contributors": {contributors_json}\n}}')
+
+
+def write_changes_ndjson(ndjson_file: str, diffStix: DiffStix):
+    """Write the changes to a newline-delimited JSON file, with one changed object per line.
+
+    Each line is an object with the "domain", "object_type" and "section" of a changed object, and the changed
+    object as in the JSON changes as "stix_object". The last line is an object with the "new-contributors".
+
+    Parameters
+    ----------
+    ndjson_file : str
+        File to write the NDJSON changes to.
+    diffStix : DiffStix
+        An instance of a DiffStix object.
+    """
+    logger.info("Writing NDJSON updates to file")
+
+    with diffStix.description_table_executor() as executor, open(ndjson_file, "w") as file:
+        for domain in diffStix.domains:
+            for object_type, domains in diffStix.data["changes"].items():
+                for section in domains.get(domain, {}):
+                    for stix_object in diffStix.iter_detailed_changes(
+                        object_type=object_type,
+                        domain=domain,
+                        section=section,
+                        stix_objects=diffStix.get_section_changes(
+                            object_type=object_type, domain=domain, section=section
+                        ),
+                        executor=executor,
+                    ):
+                        line = {
+                            "domain": domain,
+                            "object_type": object_type,
+                            "section": section,
+                            "stix_object": stix_object,
+                        }
+                        file.write(json.dumps(line, cls=AttackChangesEncoder) + "\n")
+        file.write(json.dumps({"new-contributors": diffStix.get_new_contributors()}) + "\n")
 
 
 def layers_dict_to_files(outfiles, layers):
@@ -1504,8 +2484,7 @@ def write_detailed_html(html_file_detailed: str, diffStix: DiffStix):
         header = f"<h1>ATT&CK Changes Between v{old_version} and new content</h1>"
 
     frontmatter = [
-        textwrap.dedent(
-            """\
+        textwrap.dedent("""\
         <!DOCTYPE html>
         <html>
             <head>
@@ -1522,12 +2501,10 @@ def write_detailed_html(html_file_detailed: str, diffStix: DiffStix):
                 </style>
             </head>
             <body>
-        """
-        ),
+        """),
         header,
         markdown.markdown(diffStix.get_md_key()),
-        textwrap.dedent(
-            """\
+        textwrap.dedent("""\
         <table class=diff summary=Legends>
             <tr>
                 <td>
@@ -1548,11 +2525,10 @@ def write_detailed_html(html_file_detailed: str, diffStix: DiffStix):
             <li><a href="layer-ics.json">ICS changes</a></li>
         </ul>
         <p>This JSON file contains the machine readble output used to create this page: <a href="changelog.json">changelog.json</a></p>
-        """
-        ),
+        """),
     ]
 
-    with open(html_file_detailed, "w") as file:
+    with diffStix.description_table_executor() as executor, open(html_file_detailed, "w") as file:
         file.writelines(frontmatter)
         lines = []
         for object_type, domain_data in diffStix.data["changes"].items():
@@ -1579,7 +2555,14 @@ def write_detailed_html(html_file_detailed: str, diffStix: DiffStix):
                         lines.append("<details>")
                         lines.append(f"<summary>{diffStix.section_headers[object_type][change_type]}</summary>")
 
-                    for stix_object in change_data:
+                    # the detailed differences and description change tables are only held for one section
+                    for stix_object in diffStix.iter_detailed_changes(
+                        object_type=object_type,
+                        domain=domain,
+                        section=change_type,
+                        stix_objects=change_data,
+                        executor=executor,
+                    ):
                         attack_id = get_attack_id(stix_object)
                         object_version = get_attack_object_version(stix_obj=stix_object)
 
@@ -1668,6 +2651,23 @@ def write_detailed_html(html_file_detailed: str, diffStix: DiffStix):
                                         lines.append(f"  <li>{detection}</li>")
                                     lines.append("</ul>")
 
+                        if stix_object.get("changelog_relationships"):
+                            for relationship_change, title in [
+                                ("new", "New Relationships"),
+                                ("dropped", "Dropped Relationships"),
+                                ("changed", "Changed Relationships"),
+                            ]:
+                                relationships = stix_object["changelog_relationships"][relationship_change]
+                                if relationships:
+                                    lines.append(f"<p><b>{title}</b>:</p>")
+                                    lines.append("<ul>")
+                                    for relationship in relationships:
+                                        lines.append(
+                                            f"  <li>{relationship['source']} {relationship['relationship_type']} "
+                                            f"{relationship['target']}</li>"
+                                        )
+                                    lines.append("</ul>")
+
                         detailed_diff = json.loads(stix_object.get("detailed_diff", "{}"))
                         if detailed_diff:
                             lines.append("<details>")
@@ -1748,15 +2748,17 @@ def write_detailed_html(html_file_detailed: str, diffStix: DiffStix):
                                 lines.append("</tbody></table>")
                             lines.append("</details>")
 
+                        # write each object once it is rendered, rather than the whole page at the end
+                        file.writelines(lines)
+                        lines.clear()
+
                     if change_data:
                         lines.append("</details>")
 
-        lines.append(
-            """
+        lines.append("""
             </body>
         </html>
-        """
-        )
+        """)
 
         file.writelines(lines)
 
@@ -1783,10 +2785,23 @@ def get_parsed_args():
     parser.add_argument(
         "--new",
         type=str,
-        default="new",
+        # Default is really "new", set below
+        default=None,
         help="Directory to load new STIX data from.",
     )
 
+    parser.add_argument(
+        "--releases",
+        type=str,
+        nargs="+",
+        help=(
+            "Directories of consecutive releases, from the oldest to the newest, to create the changelogs of each "
+            "pair of in one run, loading each release once. Output filenames can contain {old} and {new}, replaced "
+            "by the directory names of the old and new release of each pair, and must contain either with more than "
+            "two releases."
+        ),
+    )
+
     parser.add_argument(
         "--domains",
         type=str,
@@ -1820,6 +2835,12 @@ def get_parsed_args():
         help="Create a JSON file reporting changes.",
     )
 
+    parser.add_argument(
+        "--ndjson-file",
+        type=str,
+        help="Create a newline-delimited JSON file reporting changes, with one changed object per line.",
+    )
+
     parser.add_argument(
         "--layers",
         type=str,
@@ -1869,6 +2890,20 @@ def get_parsed_args():
     )
     parser.set_defaults(contributors=True)
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes to load the domains and find the changes of each object type in parallel",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Directory to cache the parsed releases in, to not parse unchanged STIX files again",
+    )
+
     parser.add_argument(
         "-v",
         "--verbose",
@@ -1888,9 +2923,29 @@ def get_parsed_args():
     if args.use_mitre_cti and args.old:
         parser.error("--use-mitre-cti and -old cannot be used together")
 
+    if args.releases is not None:
+        if args.old or args.new or args.use_mitre_cti:
+            parser.error("--releases cannot be used with --old, --new or --use-mitre-cti")
+        if len(args.releases) < 2:
+            parser.error("--releases requires at least two directories")
+        output_files = {
+            "--markdown-file": args.markdown_file,
+            "--html-file": args.html_file,
+            "--html-file-detailed": args.html_file_detailed,
+            "--json-file": args.json_file,
+            "--ndjson-file": args.ndjson_file,
+            "--layers": args.layers,
+        }
+        try:
+            check_chained_output_files(releases=args.releases, output_files=output_files)
+        except ValueError as e:
+            parser.error(str(e))
+
     # set a default directory that doesn't conflict with use_mitre_cti
     if not args.old:
         args.old = "old"
+    if not args.new:
+        args.new = "new"
 
     if args.layers is not None:
         if len(args.layers) not in [0, 3]:
@@ -1910,10 +2965,14 @@ def get_new_changelog_md(
     use_mitre_cti: bool = False,
     verbose: bool = False,
     include_contributors: bool = False,
+    workers: int = None,
+    cache_dir: str = None,
     markdown_file: Optional[str] = None,
     html_file: Optional[str] = None,
     html_file_detailed: Optional[str] = None,
     json_file: Optional[str] = None,
+    ndjson_file: Optional[str] = None,
+    return_markdown: bool = True,
 ) -> str:
     """Get a Markdown string representation of differences between two ATT&CK versions.
 
@@ -1941,6 +3000,10 @@ def get_new_changelog_md(
         Print progress bar and status messages to stdout, by default False
     include_contributors : bool, optional
         Include contributor information for new contributors, by default False
+    workers : int, optional
+        Number of worker processes to find the changes with, by default None, which finds them in the current process
+    cache_dir : str, optional
+        Directory to cache the parsed releases in, by default None
     markdown_file : str, optional
         If set, writes a markdown file, by default None
     html_file : str, optional
@@ -1949,6 +3012,11 @@ def get_new_changelog_md(
         If set, writes a more detailed HTML page, by default None
     json_file : str, optional
         If set, writes JSON file of the changes, by default None
+    ndjson_file : str, optional
+        If set, writes a newline-delimited JSON file of the changes with one changed object per line, by default None
+    return_markdown : bool, optional
+        Return the markdown of the differences, by default True. Otherwise, the markdown is only written to files
+        section by section, and never held in memory as a whole.
 
     Returns
     -------
@@ -1978,20 +3046,68 @@ def get_new_changelog_md(
         use_mitre_cti=use_mitre_cti,
         verbose=verbose,
         include_contributors=include_contributors,
+        workers=workers,
+        cache_dir=cache_dir,
+    )
+
+    return write_changelog_files(
+        diffStix=diffStix,
+        layers=layers,
+        markdown_file=markdown_file,
+        html_file=html_file,
+        html_file_detailed=html_file_detailed,
+        json_file=json_file,
+        ndjson_file=ndjson_file,
+        return_markdown=return_markdown,
     )
 
-    md_string = None
-    if markdown_file or html_file:
-        md_string = diffStix.get_markdown_string()
 
-    if markdown_file:
-        logger.info("Writing markdown to file")
-        Path(markdown_file).parent.mkdir(parents=True, exist_ok=True)
-        with open(markdown_file, "w") as file:
-            file.write(md_string)
+def write_changelog_files(
+    diffStix: DiffStix,
+    layers: List[str] = None,
+    markdown_file: Optional[str] = None,
+    html_file: Optional[str] = None,
+    html_file_detailed: Optional[str] = None,
+    json_file: Optional[str] = None,
+    ndjson_file: Optional[str] = None,
+    return_markdown: bool = True,
+) -> Optional[str]:
+    """Write the changelog files of the differences found by a DiffStix object.
+
+    The files are written section by section as the changes are rendered.
+
+    Parameters
+    ----------
+    diffStix : DiffStix
+        An instance of a DiffStix object
+    layers : List[str], optional
+        Array of output filenames for layer files, by default None
+    markdown_file : str, optional
+        If set, writes a markdown file, by default None
+    html_file : str, optional
+        If set, writes an HTML file from the parsed markdown, by default None
+    html_file_detailed : str, optional
+        If set, writes a more detailed HTML page, by default None
+    json_file : str, optional
+        If set, writes JSON file of the changes, by default None
+    ndjson_file : str, optional
+        If set, writes a newline-delimited JSON file of the changes with one changed object per line, by default None
+    return_markdown : bool, optional
+        Return the markdown of the differences, by default True. Otherwise, the markdown is only written to files.
 
-    if html_file:
-        markdown_to_html(outfile=html_file, content=md_string, diffStix=diffStix)
+    Returns
+    -------
+    Optional[str]
+        A Markdown string representation of the differences, if a markdown or HTML file is written and
+        `return_markdown` is set.
+    """
+    md_string = None
+    if markdown_file or html_file:
+        if markdown_file:
+            Path(markdown_file).parent.mkdir(parents=True, exist_ok=True)
+        md_string = write_markdown_files(
+            diffStix=diffStix, markdown_file=markdown_file, html_file=html_file, return_markdown=return_markdown
+        )
 
     if html_file_detailed:
         Path(html_file_detailed).parent.mkdir(parents=True, exist_ok=True)
@@ -2012,19 +3128,286 @@ def get_new_changelog_md(
         layers_dict_to_files(outfiles=layers, layers=layers_dict)
 
     if json_file:
-        changes_dict = diffStix.get_changes_dict()
-
-        logger.info("Writing JSON updates to file")
         Path(json_file).parent.mkdir(parents=True, exist_ok=True)
-        json.dump(changes_dict, open(json_file, "w"), cls=AttackChangesEncoder, indent=4)
+        write_changes_json(json_file=json_file, diffStix=diffStix)
+
+    if ndjson_file:
+        Path(ndjson_file).parent.mkdir(parents=True, exist_ok=True)
+        write_changes_ndjson(ndjson_file=ndjson_file, diffStix=diffStix)
 
     return md_string
 
 
+def get_chained_changelogs(
+    releases: List[str],
+    domains: List[str] = ["enterprise-attack", "mobile-attack", "ics-attack"],
+    layers: List[str] = None,
+    unchanged: bool = False,
+    show_key: bool = False,
+    site_prefix: str = "",
+    verbose: bool = False,
+    include_contributors: bool = False,
+    workers: int = None,
+    cache_dir: str = None,
+    markdown_file: Optional[str] = None,
+    html_file: Optional[str] = None,
+    html_file_detailed: Optional[str] = None,
+    json_file: Optional[str] = None,
+    ndjson_file: Optional[str] = None,
+    return_markdown: bool = True,
+) -> List[Optional[str]]:
+    """Get Markdown string representations of the differences between each pair of consecutive ATT&CK versions.
+
+    Each release is loaded once, and compared with both the release before and the release after it. The files of
+    each pair are the same as `get_new_changelog_md` writes for the pair on its own.
+
+    The output filenames can contain "{old}" and "{new}", which are replaced by the names of the directories of the
+    old and new release of each pair, e.g. "output/{old}-{new}/changelog.md". With more than two releases, each
+    filename must contain either, so that the files of each pair are not overwritten by the next pair.
+
+    Parameters
+    ----------
+    releases : List[str]
+        Directories to load the STIX data of the releases from, from the oldest to the newest
+    domains : List[str], optional
+        List of domains to parse, by default ["enterprise-attack", "mobile-attack", "ics-attack"]
+    layers : List[str], optional
+        Array of output filenames for layer files, by default None
+    unchanged : bool, optional
+        Include unchanged ATT&CK objects in diff comparison, by default False
+    show_key : bool, optional
+        Output key to markdown file, by default False
+    site_prefix : str, optional
+        Prefix links in markdown output, by default ""
+    verbose : bool, optional
+        Print progress bar and status messages to stdout, by default False
+    include_contributors : bool, optional
+        Include contributor information for new contributors, by default False
+    workers : int, optional
+        Number of worker processes to load the releases, and then compare the pairs of releases, with in parallel,
+        by default None, which does everything in the current process
+    cache_dir : str, optional
+        Directory to cache the parsed releases in, by default None
+    markdown_file : str, optional
+        If set, writes a markdown file for each pair, by default None
+    html_file : str, optional
+        If set, writes an HTML file from the parsed markdown for each pair, by default None
+    html_file_detailed : str, optional
+        If set, writes a more detailed HTML page for each pair, by default None
+    json_file : str, optional
+        If set, writes JSON file of the changes for each pair, by default None
+    ndjson_file : str, optional
+        If set, writes a newline-delimited JSON file of the changes for each pair, by default None
+    return_markdown : bool, optional
+        Return the markdown of the differences between each pair, by default True
+
+    Returns
+    -------
+    List[Optional[str]]
+        A Markdown string representation of the differences between each pair of releases, if a markdown or HTML
+        file is written.
+    """
+    # the default loguru logger logs up to Debug by default
+    logger.remove()
+    if verbose:
+        logger.add(lambda msg: tqdm.write(msg, end=""), colorize=True)
+    else:
+        logger.add(lambda msg: tqdm.write(msg, end=""), colorize=True, level="INFO")
+
+    if len(releases) < 2:
+        raise ValueError("At least two releases are needed to create a changelog")
+    check_chained_output_files(
+        releases=releases,
+        output_files={
+            "markdown_file": markdown_file,
+            "html_file": html_file,
+            "html_file_detailed": html_file_detailed,
+            "json_file": json_file,
+            "ndjson_file": ndjson_file,
+            "layers": layers,
+        },
+    )
+
+    # the STIX datastores are not kept, they take a lot of memory and cannot be sent between processes
+    releases_data = [{} for _ in releases]
+    datastores = [(index, domain) for index in range(len(releases)) for domain in domains]
+    if not workers or workers <= 1:
+        for index, domain in track(datastores, description="Loading releases"):
+            releases_data[index][domain] = load_release_domain(
+                directory=releases[index], domain=domain, keep_datastore=False, cache_dir=cache_dir
+            )
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(datastores))) as executor:
+            futures = {
+                (index, domain): executor.submit(
+                    load_release_domain,
+                    directory=releases[index],
+                    domain=domain,
+                    keep_datastore=False,
+                    cache_dir=cache_dir,
+                )
+                for index, domain in datastores
+            }
+            for (index, domain), future in track(futures.items(), description="Loading releases"):
+                releases_data[index][domain] = future.result()
+
+    pair_kwargs = [
+        {
+            "releases": releases,
+            "index": index,
+            "diff_stix_kwargs": {
+                "domains": domains,
+                "unchanged": unchanged,
+                "show_key": show_key,
+                "site_prefix": site_prefix,
+                "verbose": verbose,
+                "include_contributors": include_contributors,
+            },
+            "output_files": {
+                "layers": layers,
+                "markdown_file": markdown_file,
+                "html_file": html_file,
+                "html_file_detailed": html_file_detailed,
+                "json_file": json_file,
+                "ndjson_file": ndjson_file,
+            },
+            "return_markdown": return_markdown,
+        }
+        for index in range(len(releases) - 1)
+    ]
+    if not workers or workers <= 1:
+        md_strings = []
+        for kwargs in pair_kwargs:
+            md_strings.append(_write_chained_changelog(releases_data=releases_data, **kwargs))
+            # the old release of this pair is not compared again
+            releases_data[kwargs["index"]] = None
+        return md_strings
+
+    logger.info(f"Comparing releases with {workers} worker processes")
+    max_workers = min(workers, len(pair_kwargs))
+    try:
+        executor = get_worker_pool(
+            max_workers=max_workers,
+            worker_state=_worker_state,
+            state={"releases_data": releases_data},
+            initializer=_init_chain_worker,
+            get_initargs=lambda: (releases_data,),
+        )
+        with executor:
+            futures = [executor.submit(_write_chained_changelog_in_worker, **kwargs) for kwargs in pair_kwargs]
+            return [future.result() for future in track(futures, description="Comparing releases")]
+    finally:
+        _worker_state.clear()
+
+
+def check_chained_output_files(releases: List[str], output_files: Dict[str, Union[str, List[str], None]]):
+    """Check that `get_chained_changelogs` writes the files of each pair of releases to different paths.
+
+    Parameters
+    ----------
+    releases : List[str]
+        Directories of the releases, from the oldest to the newest
+    output_files : Dict[str, Union[str, List[str], None]]
+        Name of each output option => its filename, or list of filenames for the layers
+
+    Raises
+    ------
+    ValueError
+        If several releases have the same directory name, which the "{old}" and "{new}" placeholders are replaced
+        by, or if a filename has neither placeholder and there is more than one pair of releases.
+    """
+    names = [os.path.basename(os.path.normpath(release)) for release in releases]
+    duplicate_names = sorted(name for name, count in Counter(names).items() if count > 1)
+    if duplicate_names:
+        raise ValueError(f"The directories of the releases must have different names: {', '.join(duplicate_names)}")
+
+    if len(releases) <= 2:
+        return
+    for option, filenames in output_files.items():
+        if isinstance(filenames, str):
+            filenames = [filenames]
+        for filename in filenames or []:
+            if "{old}" not in filename and "{new}" not in filename:
+                raise ValueError(
+                    f"{option} must contain {{old}} or {{new}} to write the changelog of each pair of releases to "
+                    f"a different file: {filename}"
+                )
+
+
+def _write_chained_changelog(
+    releases_data: List[Dict[str, dict]],
+    releases: List[str],
+    index: int,
+    diff_stix_kwargs: dict,
+    output_files: dict,
+    return_markdown: bool,
+) -> Optional[str]:
+    """Compare a release of `get_chained_changelogs` with the next release, and write their changelog files."""
+    old = releases[index]
+    new = releases[index + 1]
+    new_release_data = releases_data[index + 1]
+    if index + 1 < len(releases) - 1:
+        # the new release is the old release of the next pair too, and its objects are annotated with their changes
+        new_release_data = copy.deepcopy(new_release_data)
+
+    diffStix = DiffStix(
+        old=old,
+        new=new,
+        release_data={"old": releases_data[index], "new": new_release_data},
+        **diff_stix_kwargs,
+    )
+
+    old_name = os.path.basename(os.path.normpath(old))
+    new_name = os.path.basename(os.path.normpath(new))
+
+    def get_filename(filename: Optional[str]) -> Optional[str]:
+        if filename is None:
+            return None
+        return filename.replace("{old}", old_name).replace("{new}", new_name)
+
+    layers = output_files["layers"]
+    if layers:
+        layers = [get_filename(layer) for layer in layers]
+
+    logger.info(f"Writing the changelog of {old} → {new}")
+    return write_changelog_files(
+        diffStix=diffStix,
+        layers=layers,
+        markdown_file=get_filename(output_files["markdown_file"]),
+        html_file=get_filename(output_files["html_file"]),
+        html_file_detailed=get_filename(output_files["html_file_detailed"]),
+        json_file=get_filename(output_files["json_file"]),
+        ndjson_file=get_filename(output_files["ndjson_file"]),
+        return_markdown=return_markdown,
+    )
+
+
 def main():
     """Entrypoint for running this file as a script or as a Python console command."""
     args = get_parsed_args()
 
+    if args.releases:
+        get_chained_changelogs(
+            releases=args.releases,
+            domains=args.domains,
+            layers=args.layers,
+            unchanged=args.unchanged,
+            show_key=args.show_key,
+            site_prefix=args.site_prefix,
+            verbose=args.verbose,
+            include_contributors=args.contributors,
+            workers=args.workers,
+            cache_dir=args.cache_dir,
+            markdown_file=args.markdown_file,
+            html_file=args.html_file,
+            html_file_detailed=args.html_file_detailed,
+            json_file=args.json_file,
+            ndjson_file=args.ndjson_file,
+            # the markdown is only written to files
+            return_markdown=False,
+        )
+        return
+
     get_new_changelog_md(
         domains=args.domains,
         layers=args.layers,
@@ -2036,10 +3419,15 @@ def main():
         use_mitre_cti=args.use_mitre_cti,
         verbose=args.verbose,
         include_contributors=args.contributors,
+        workers=args.workers,
+        cache_dir=args.cache_dir,
         markdown_file=args.markdown_file,
         html_file=args.html_file,
         html_file_detailed=args.html_file_detailed,
         json_file=args.json_file,
+        ndjson_file=args.ndjson_file,
+        # the markdown is only written to files
+        return_markdown=False,
     )
 
 
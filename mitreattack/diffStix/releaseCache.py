@@ -0,0 +1,89 @@
+"""On-disk cache of the releases parsed by the changelog helper, addressed by the SHA-256 hash of their bundles."""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from importlib import metadata
+from typing import Optional
+
+# bump when the parsed data of a release changes in a way the library version does not capture
+CACHE_FORMAT_VERSION = 2
+
+
+def _get_library_version() -> str:
+    """Get the installed version of mitreattack-python."""
+    try:
+        return metadata.version("mitreattack-python")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class ReleaseCache:
+    """Directory of the parsed data of ATT&CK releases, as loaded by `changelog_helper.load_release_domain`.
+
+    The data of a domain of a release is cached under a key hashing the domain, the library version and the SHA-256
+    hash of its STIX bundle, so a bundle is only parsed again when its content changes. The STIX datastore of the
+    release is not cached.
+
+    Cached releases are pickled, so a cache directory must only be shared with trusted users.
+    """
+
+    def __init__(self, cache_dir: str):
+        """Initialize the cache, creating `cache_dir` if it does not exist.
+
+        Parameters
+        ----------
+        cache_dir : str
+            the directory to store the parsed releases in
+        """
+        self.cache_dir = cache_dir
+        self.library_version = _get_library_version()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_key(self, domain: str, stix_hash: str) -> str:
+        """Get the key of a domain of a release.
+
+        Parameters
+        ----------
+        domain : str
+            domain of ATT&CK the bundle corresponds to, e.g "enterprise-attack"
+        stix_hash : str
+            the SHA-256 hash of the STIX bundle, as returned by `release_info.get_stix_hash`
+
+        Returns
+        -------
+        str
+            the key of the parsed release
+        """
+        key = [CACHE_FORMAT_VERSION, self.library_version, domain, stix_hash]
+        return hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pickle")
+
+    def load(self, key: str) -> Optional[dict]:
+        """Load a parsed release, or return None if there is no release for the key."""
+        path = self._get_path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def store(self, key: str, domain_data: dict):
+        """Store a parsed release, without its STIX datastore.
+
+        The release is written to a temporary file that is then renamed, so that concurrent runs never read a
+        partially written release.
+        """
+        path = self._get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump({**domain_data, "stix_datastore": None}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
@@ -4,11 +4,11 @@ import json
 
 import requests
 from loguru import logger
-from stix2 import Filter, MemoryStore, TAXIICollectionSource
+from stix2 import MemoryStore, TAXIICollectionSource
 from stix2.datastore.memory import _add
 from taxii2client.v20 import Collection, Server
 
-from mitreattack.constants import MITRE_ATTACK_ID_SOURCE_NAMES
+from mitreattack.stix20.matrix_layout import MatrixLayoutCache
 
 
 class DomainNotLoadedError(Exception):
@@ -125,13 +125,15 @@ class Tactic:
 class MatrixGen:
     """A MatrixGen object."""
 
-    def __init__(self, source="taxii", resource=None, domain="enterprise"):
+    def __init__(self, source="taxii", resource=None, domain="enterprise", cache_dir=None):
         """Initialize - Creates a matrix generator object.
 
         :param source: Source to utilize (taxii, remote, or local)
         :param resource: string path to local cache of stix data (local) or url of an ATT&CK Workbench (remote)
+        :param cache_dir: [Optional] directory to cache the matrix layouts in, in addition to memory
         """
         self.convert_data = {}
+        self.cache_dir = cache_dir
         self.collections = dict()
         if source.lower() not in ["taxii", "local", "remote", "memorystore"]:
             logger.error(
@@ -205,61 +207,6 @@ class MatrixGen:
         self.matrix = {}
         self._build_matrix(domain=domain)
 
-    @staticmethod
-    def _remove_revoked_deprecated(content):
-        """Remove any revoked or deprecated objects from queries made to the data source."""
-        return list(
-            filter(lambda x: x.get("x_mitre_deprecated", False) is False and x.get("revoked", False) is False, content)
-        )
-
-    def _search(self, domain, query):
-        interum = self.collections[domain].query(query)
-        return self._remove_revoked_deprecated(interum)
-
-    def _get_tactic_listing(self, domain="enterprise"):
-        """Retrieve tactics for the associated domain.
-
-        :param domain: The domain to draw from
-        """
-        tactics = {}
-        t_filt = []
-        matrix = self._search(domain, [Filter("type", "=", "x-mitre-matrix")])
-        for i in range(len(matrix)):
-            tactics[matrix[i]["name"]] = []
-            for tactic_id in matrix[i]["tactic_refs"]:
-                tactics[matrix[i]["name"]].append(self._search(domain, ([Filter("id", "=", tactic_id)]))[0])
-        for entry in tactics[matrix[0]["name"]]:
-            self.convert_data[entry["x_mitre_shortname"]] = entry["name"]
-            self.convert_data[entry["name"]] = entry["x_mitre_shortname"]
-            t_filt.append(MatrixEntry(id=entry["external_references"][0]["external_id"], name=entry["name"]))
-        return t_filt
-
-    def _get_technique_listing(self, tactic, domain="enterprise"):
-        """Retrieve techniques for a given tactic and domain.
-
-        :param tactic: The tactic to grab techniques from
-        :param domain: The domain to draw from
-        """
-        techniques = []
-        subtechs = {}
-        techs = self._search(
-            domain, [Filter("type", "=", "attack-pattern"), Filter("kill_chain_phases.phase_name", "=", tactic)]
-        )
-        for entry in techs:
-            if entry["kill_chain_phases"][0]["kill_chain_name"] in MITRE_ATTACK_ID_SOURCE_NAMES:
-                tid = [t["external_id"] for t in entry["external_references"][:1] if t["source_name"] == "mitre-attack"]
-                platform_tags = []
-                if "x_mitre_platforms" in entry:
-                    platform_tags = entry["x_mitre_platforms"]
-                if "." not in tid[0]:
-                    techniques.append(MatrixEntry(id=tid[0], name=entry["name"], platforms=platform_tags))
-                else:
-                    parent = tid[0].split(".")[0]
-                    if parent not in subtechs:
-                        subtechs[parent] = []
-                    subtechs[parent].append(MatrixEntry(id=tid[0], name=entry["name"], platforms=platform_tags))
-        return techniques, subtechs
-
     def _adjust_ordering(self, codex, mode, scores=[]):
         """Adjust ordering of matrix based on sort mode.
 
@@ -416,19 +363,27 @@ class MatrixGen:
         if domain not in self.collections:
             raise DomainNotLoadedError
         self.matrix[domain] = []
-        tacs = self._get_tactic_listing(domain)
-        for tac in tacs:
-            techs, subtechs = self._get_technique_listing(tac.name.lower().replace(" ", "-"), domain)
+        layout = MatrixLayoutCache(self.collections[domain], cache_dir=self.cache_dir).get_layouts()[0]
+        for column in layout.columns:
+            self.convert_data[column.tactic["x_mitre_shortname"]] = column.tactic["name"]
+            self.convert_data[column.tactic["name"]] = column.tactic["x_mitre_shortname"]
+            tac = MatrixEntry(id=column.tactic["attack_id"], name=column.tactic["name"])
+            # techniques and sub-techniques are already sorted by name
+            techs = [self._matrix_entry(technique) for technique in column.techniques]
             stemp = {}
-            # sort subtechniques via id, append to column
-            for par in subtechs:
-                subtechs[par].sort(key=lambda x: x.name)
-                stemp[par] = subtechs[par]
-            # sort techniques alphabetically, append to column
-            techs.sort(key=lambda x: x.name)
+            for technique in column.techniques:
+                if column.subtechniques.get(technique["id"]):
+                    stemp[technique["attack_id"]] = [
+                        self._matrix_entry(subtechnique) for subtechnique in column.subtechniques[technique["id"]]
+                    ]
             colm = Tactic(tactic=tac, techniques=techs, subtechniques=stemp)
             self.matrix[domain].append(colm)
 
+    @staticmethod
+    def _matrix_entry(entry):
+        """Create a MatrixEntry for a technique of a matrix layout."""
+        return MatrixEntry(id=entry["attack_id"], name=entry["name"], platforms=entry.get("x_mitre_platforms", []))
+
     def get_matrix(self, domain="enterprise", filters=None):
         """Retrieve an ATT&CK Domain object.
 
@@ -206,8 +206,40 @@ STIX21 = {
 }
 
 
+def get_stix_hash(stix_file: str = None, stix_content: bytes = None) -> str:
+    """Get the SHA256 hash of an ATT&CK release STIX file, or of the contents of a file.
+
+    Parameters
+    ----------
+    stix_file : str, optional
+        Path to an ATT&CK release STIX file (use this or stix_content), by default None
+    stix_content : bytes, optional
+        Contents of an ATT&CK release STIX file (use this or stix_file), by default None
+
+    Returns
+    -------
+    str
+        The hexadecimal SHA256 hash
+    """
+    sha256_hash = hashlib.sha256()
+
+    if stix_file:
+        with open(stix_file, "rb") as f:
+            # Read and update hash string value in blocks of 4K
+            for byte_block in iter(lambda: f.read(4096), b""):
+                sha256_hash.update(byte_block)
+    elif stix_content:
+        sha256_hash.update(stix_content)
+
+    return sha256_hash.hexdigest()
+
+
 def get_attack_version(
-    domain: str, stix_version: str = "2.0", stix_file: str = None, stix_content: bytes = None
+    domain: str,
+    stix_version: str = "2.0",
+    stix_file: str = None,
+    stix_content: bytes = None,
+    stix_hash: str = None,
 ) -> Optional[str]:
     """Determine the version of ATT&CK based on either a file or contents of a file.
 
@@ -221,6 +253,8 @@ def get_attack_version(
         Path to an ATT&CK release STIX file (use this or stix_content), by default None
     stix_content : bytes, optional
         Contents of an ATT&CK release STIX file (use this or stix_file), by default None
+    stix_hash : str, optional
+        SHA256 hash of the file, as returned by get_stix_hash, to not hash the file again, by default None
 
     Returns
     -------
@@ -237,17 +271,7 @@ def get_attack_version(
             "domain must be one of [enterprise-attack | mobile-attack | ics-attack | pre-attack] to determine version"
         )
         return None
-    sha256_hash = hashlib.sha256()
-
-    if stix_file:
-        with open(stix_file, "rb") as f:
-            # Read and update hash string value in blocks of 4K
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-    elif stix_content:
-        sha256_hash.update(stix_content)
-
-    sha256_hash = sha256_hash.hexdigest()
+    sha256_hash = stix_hash or get_stix_hash(stix_file=stix_file, stix_content=stix_content)
 
     if stix_version == "2.0":
         stix_hash_data = STIX20
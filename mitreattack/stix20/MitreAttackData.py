@@ -7,7 +7,12 @@ from dateutil import parser
 from stix2 import Filter
 from stix2.utils import get_type_from_id
 
+from mitreattack.stix20 import columnar
+from mitreattack.stix20.compact import CompactRelationshipMap, StixIdIndex, load_interned_bundle
 from mitreattack.stix20.custom_attack_objects import StixObjectFactory
+from mitreattack.stix20.entity_extractor import EntityExtractor
+from mitreattack.stix20.name_resolver import NameResolver
+from mitreattack.stix20.similarity import SimilarityIndex
 
 
 class MitreAttackData:
@@ -79,10 +84,20 @@ class MitreAttackData:
         self.stix_filepath = None
         self.src = None
 
+        # dense integer IDs and ID-only relationship mappings used by `get_all_*(compact=True)`
+        self.stix_id_index = StixIdIndex()
+        self.compact_maps = {}
+
+        # search indexes, built on first use
+        self.name_resolver = None
+        self.entity_extractor = None
+        self.similarity_index = None
+
         if stix_filepath:
             self.stix_filepath = stix_filepath
             self.src = stix2.MemoryStore()
-            self.src.load_from_file(stix_filepath)
+            # repeated strings such as STIX IDs and platform names are interned while loading
+            self.src.add(load_interned_bundle(stix_filepath))
         elif src:
             self.src = src
 
@@ -490,7 +505,7 @@ class MitreAttackData:
                 technique_tactics.append(tactic)
 
         return technique_tactics
-    
+
     def get_procedure_examples_by_technique(self, stix_id) -> list:
         """Retrieve the list of procedure examples by technique.
 
@@ -745,6 +760,150 @@ class MitreAttackData:
         software = list(chain.from_iterable(self.src.query(f) for f in [malware_filter, tool_filter]))
         return software
 
+    def get_name_resolver(self) -> NameResolver:
+        """Get an index of the names, aliases and ATT&CK IDs of all objects, built on first use.
+
+        Returns
+        -------
+        NameResolver
+            the name resolver for the data source
+        """
+        if self.name_resolver is None:
+            objects = self.src.query([Filter("type", "in", self.stix_types)])
+            self.name_resolver = NameResolver(objects)
+        return self.name_resolver
+
+    def resolve_name(self, query: str, stix_types: list = None, limit: int = 10, fuzzy: bool = True) -> list:
+        """Find the objects best matching a partial or misspelled name, alias or ATT&CK ID.
+
+        Unlike the other lookup methods, matching is case-insensitive and ignores whitespace and punctuation,
+        e.g. "apt 29", "cozy bea" and "t1059.1" all find results.
+
+        Parameters
+        ----------
+        query : str
+            the name, alias or ATT&CK ID to look up, or a prefix of one
+        stix_types : list, optional
+            only return objects of these STIX types, by default all of `MitreAttackData.stix_types`
+        limit : int, optional
+            maximum number of candidates to return, by default 10
+        fuzzy : bool, optional
+            include near-matches for misspelled queries, by default True
+
+        Returns
+        -------
+        list
+            a list of NameMatch candidates, best match first
+        """
+        if stix_types:
+            for stix_type in stix_types:
+                if stix_type not in self.stix_types:
+                    raise ValueError(f"stix_type must be one of {self.stix_types}")
+
+        return self.get_name_resolver().resolve(query, stix_types=stix_types, limit=limit, fuzzy=fuzzy)
+
+    def get_entity_extractor(self) -> EntityExtractor:
+        """Get an Aho-Corasick automaton of the names, aliases and ATT&CK IDs of all objects, built on first use.
+
+        Revoked and deprecated objects are not included.
+
+        Returns
+        -------
+        EntityExtractor
+            the entity extractor for the data source
+        """
+        if self.entity_extractor is None:
+            objects = self.remove_revoked_deprecated(self.src.query([Filter("type", "in", self.stix_types)]))
+            self.entity_extractor = EntityExtractor(objects)
+        return self.entity_extractor
+
+    def extract_entities(self, text: str) -> list:
+        """Find mentions of ATT&CK objects by name, alias or ATT&CK ID in text.
+
+        Matching is case-insensitive and only matches whole words. Use `get_entity_extractor().extract_many()` to
+        process many documents in parallel.
+
+        Parameters
+        ----------
+        text : str
+            the text to search, e.g. a threat report
+
+        Returns
+        -------
+        list
+            a list of EntityMatch mentions with their offsets and STIX IDs, in order of their position in the text
+        """
+        return self.get_entity_extractor().extract(text)
+
+    def get_similarity_index(self) -> SimilarityIndex:
+        """Get the TF-IDF index of the names, descriptions and detections of all objects, built on first use.
+
+        Revoked and deprecated objects are not included.
+
+        Returns
+        -------
+        SimilarityIndex
+            the similarity index for the data source
+        """
+        if self.similarity_index is None:
+            objects = self.remove_revoked_deprecated(self.src.query([Filter("type", "in", self.stix_types)]))
+            self.similarity_index = SimilarityIndex(objects)
+        return self.similarity_index
+
+    def get_similar_objects(self, stix_id: str, stix_types: list = None, limit: int = 10) -> list:
+        """Find the objects with the most similar descriptions to an object.
+
+        Parameters
+        ----------
+        stix_id : str
+            the STIX ID of the object
+        stix_types : list, optional
+            only return objects of these STIX types, by default objects of the same type as the object
+        limit : int, optional
+            maximum number of objects to return, by default 10
+
+        Returns
+        -------
+        list
+            a list of {"object": object, "score": float} for each similar object, most similar first, where
+            score is the cosine similarity of the objects' TF-IDF vectors
+        """
+        stix_types = stix_types or [self.get_stix_type(stix_id)]
+        for stix_type in stix_types:
+            if stix_type not in self.stix_types:
+                raise ValueError(f"stix_type must be one of {self.stix_types}")
+
+        try:
+            similar = self.get_similarity_index().most_similar(stix_id, stix_types=stix_types, limit=limit)
+        except KeyError:
+            raise ValueError(f"{stix_id} not found") from None
+        return [{"object": self.get_object_by_stix_id(similar_id), "score": score} for similar_id, score in similar]
+
+    def get_objects_similar_to_text(self, text: str, stix_types: list = None, limit: int = 10) -> list:
+        """Find the objects with the most similar descriptions to text.
+
+        Parameters
+        ----------
+        text : str
+            the text to compare, e.g. a description of adversary behavior
+        stix_types : list, optional
+            only return objects of these STIX types, by default all of `MitreAttackData.stix_types`
+        limit : int, optional
+            maximum number of objects to return, by default 10
+
+        Returns
+        -------
+        list
+            a list of {"object": object, "score": float} for each similar object, most similar first
+        """
+        if stix_types:
+            for stix_type in stix_types:
+                if stix_type not in self.stix_types:
+                    raise ValueError(f"stix_type must be one of {self.stix_types}")
+
+        similar = self.get_similarity_index().most_similar_to_text(text, stix_types=stix_types, limit=limit)
+        return [{"object": self.get_object_by_stix_id(similar_id), "score": score} for similar_id, score in similar]
+
     ###################################
     # Get Object Information
     ###################################
@@ -974,19 +1133,50 @@ class MitreAttackData:
             deduplicated_map[stix_id] = sdo_list
         return deduplicated_map
 
+    def _get_compact_map(self, relationship_map_name: str) -> CompactRelationshipMap:
+        """Get an ID-only version of a relationship mapping from one of the `get_all_*` methods.
+
+        The full relationship mapping is only kept in memory if it had already been fetched.
+
+        Parameters
+        ----------
+        relationship_map_name : str
+            the name of the relationship mapping, e.g. 'all_software_used_by_all_groups'
+
+        Returns
+        -------
+        CompactRelationshipMap
+            a mapping of stix_id => [RelatedIds]
+        """
+        if relationship_map_name not in self.compact_maps:
+            already_fetched = bool(getattr(self, relationship_map_name))
+            relationship_map = getattr(self, f"get_{relationship_map_name}")()
+            self.compact_maps[relationship_map_name] = CompactRelationshipMap(relationship_map, self.stix_id_index)
+            if not already_fetched:
+                setattr(self, relationship_map_name, None)
+        return self.compact_maps[relationship_map_name]
+
     ###################################
     # Software/Group Relationships
     ###################################
 
-    def get_all_software_used_by_all_groups(self) -> dict:
+    def get_all_software_used_by_all_groups(self, compact: bool = False) -> dict:
         """Retrieve all software used by all groups.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of group_stix_id => [{"object": Malware|Tool, "relationships": Relationship[]}] for each software used by the group and each software used
             by campaigns attributed to the group
         """
+        if compact:
+            return self._get_compact_map("all_software_used_by_all_groups")
+
         # return data if it has already been fetched
         if self.all_software_used_by_all_groups:
             return self.all_software_used_by_all_groups
@@ -1029,15 +1219,23 @@ class MitreAttackData:
         software_used_by_groups = self.get_all_software_used_by_all_groups()
         return software_used_by_groups[group_stix_id] if group_stix_id in software_used_by_groups else []
 
-    def get_all_groups_using_all_software(self) -> dict:
+    def get_all_groups_using_all_software(self, compact: bool = False) -> dict:
         """Get all groups using all software.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of software_stix_id => [{"object": IntrusionSet, "relationships": Relationship[]}] for each group using the software and each attributed campaign
             using the software
         """
+        if compact:
+            return self._get_compact_map("all_groups_using_all_software")
+
         # return data if it has already been fetched
         if self.all_groups_using_all_software:
             return self.all_groups_using_all_software
@@ -1084,14 +1282,22 @@ class MitreAttackData:
     # Software/Campaign Relationships
     ###################################
 
-    def get_all_software_used_by_all_campaigns(self) -> dict:
+    def get_all_software_used_by_all_campaigns(self, compact: bool = False) -> dict:
         """Get all software used by all campaigns.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of campaign_stix_id => [{"object": Malware|Tool, "relationships": Relationship[]}] for each software used by the campaign
         """
+        if compact:
+            return self._get_compact_map("all_software_used_by_all_campaigns")
+
         # return data if it has already been fetched
         if self.all_software_used_by_all_campaigns:
             return self.all_software_used_by_all_campaigns
@@ -1118,14 +1324,22 @@ class MitreAttackData:
         software_used_by_campaigns = self.get_all_software_used_by_all_campaigns()
         return software_used_by_campaigns[campaign_stix_id] if campaign_stix_id in software_used_by_campaigns else []
 
-    def get_all_campaigns_using_all_software(self) -> dict:
+    def get_all_campaigns_using_all_software(self, compact: bool = False) -> dict:
         """Get all campaigns using all software.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of software_stix_id => [{"object": Campaign, "relationships": Relationship[]}] for each campaign using the software
         """
+        if compact:
+            return self._get_compact_map("all_campaigns_using_all_software")
+
         # return data if it has already been fetched
         if self.all_campaigns_using_all_software:
             return self.all_campaigns_using_all_software
@@ -1156,14 +1370,22 @@ class MitreAttackData:
     # Campaign/Group Relationships
     ###################################
 
-    def get_all_groups_attributing_to_all_campaigns(self) -> dict:
+    def get_all_groups_attributing_to_all_campaigns(self, compact: bool = False) -> dict:
         """Get all groups attributing to all campaigns.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of campaign_stix_id => [{"object": IntrusionSet, "relationships: Relationship[]}] for each group attributing to the campaign
         """
+        if compact:
+            return self._get_compact_map("all_groups_attributing_to_all_campaigns")
+
         # return data if it has already been fetched
         if self.all_groups_attributing_to_all_campaigns:
             return self.all_groups_attributing_to_all_campaigns
@@ -1192,14 +1414,22 @@ class MitreAttackData:
             else []
         )
 
-    def get_all_campaigns_attributed_to_all_groups(self) -> dict:
+    def get_all_campaigns_attributed_to_all_groups(self, compact: bool = False) -> dict:
         """Get all campaigns attributed to all groups.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of group_stix_id => [{"object": Campaign, "relationships": Relationship[]}] for each campaign attributed to the group
         """
+        if compact:
+            return self._get_compact_map("all_campaigns_attributed_to_all_groups")
+
         # return data if it has already been fetched
         if self.all_campaigns_attributed_to_all_groups:
             return self.all_campaigns_attributed_to_all_groups
@@ -1230,15 +1460,23 @@ class MitreAttackData:
     # Technique/Group Relationships
     ###################################
 
-    def get_all_techniques_used_by_all_groups(self) -> dict:
+    def get_all_techniques_used_by_all_groups(self, compact: bool = False) -> dict:
         """Get all techniques used by all groups.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of group_stix_id => [{"object": AttackPattern, "relationships": Relationship[]}] for each technique used by the group and
             each technique used by campaigns attributed to the group
         """
+        if compact:
+            return self._get_compact_map("all_techniques_used_by_all_groups")
+
         # return data if it has already been fetched
         if self.all_techniques_used_by_all_groups:
             return self.all_techniques_used_by_all_groups
@@ -1277,15 +1515,23 @@ class MitreAttackData:
         techniques_used_by_groups = self.get_all_techniques_used_by_all_groups()
         return techniques_used_by_groups[group_stix_id] if group_stix_id in techniques_used_by_groups else []
 
-    def get_all_groups_using_all_techniques(self) -> dict:
+    def get_all_groups_using_all_techniques(self, compact: bool = False) -> dict:
         """Get all groups using all techniques.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of technique_stix_id => [{"object": IntrusionSet, "relationships": Relationship[]}] for each group using the
             technique and each campaign attributed to groups using the technique
         """
+        if compact:
+            return self._get_compact_map("all_groups_using_all_techniques")
+
         # return data if it has already been fetched
         if self.all_groups_using_all_techniques:
             return self.all_groups_using_all_techniques
@@ -1328,14 +1574,22 @@ class MitreAttackData:
     # Technique/Campaign Relationships
     ###################################
 
-    def get_all_techniques_used_by_all_campaigns(self) -> dict:
+    def get_all_techniques_used_by_all_campaigns(self, compact: bool = False) -> dict:
         """Get all techniques used by all campaigns.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of campaign_stix_id => [{"object": AttackPattern, "relationships": Relationship[]}] for each technique used by the campaign
         """
+        if compact:
+            return self._get_compact_map("all_techniques_used_by_all_campaigns")
+
         # return data if it has already been fetched
         if self.all_techniques_used_by_all_campaigns:
             return self.all_techniques_used_by_all_campaigns
@@ -1362,14 +1616,22 @@ class MitreAttackData:
             techniques_used_by_campaigns[campaign_stix_id] if campaign_stix_id in techniques_used_by_campaigns else []
         )
 
-    def get_all_campaigns_using_all_techniques(self) -> dict:
+    def get_all_campaigns_using_all_techniques(self, compact: bool = False) -> dict:
         """Get all campaigns using all techniques.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of technique_stix_id => [{"object": Campaign, "relationships": Relationship[]}] for each campaign using the technique
         """
+        if compact:
+            return self._get_compact_map("all_campaigns_using_all_techniques")
+
         # return data if it has already been fetched
         if self.all_campaigns_using_all_techniques:
             return self.all_campaigns_using_all_techniques
@@ -1398,14 +1660,22 @@ class MitreAttackData:
     # Technique/Software Relationships
     ###################################
 
-    def get_all_techniques_used_by_all_software(self) -> dict:
+    def get_all_techniques_used_by_all_software(self, compact: bool = False) -> dict:
         """Get all techniques used by all software.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of software_stix_id => [{"object": AttackPattern, "relationships": Relationship[]}] for each technique used by the software
         """
+        if compact:
+            return self._get_compact_map("all_techniques_used_by_all_software")
+
         # return data if it has already been fetched
         if self.all_techniques_used_by_all_software:
             return self.all_techniques_used_by_all_software
@@ -1432,14 +1702,22 @@ class MitreAttackData:
         techniques_used_by_software = self.get_all_techniques_used_by_all_software()
         return techniques_used_by_software[software_stix_id] if software_stix_id in techniques_used_by_software else []
 
-    def get_all_software_using_all_techniques(self) -> dict:
+    def get_all_software_using_all_techniques(self, compact: bool = False) -> dict:
         """Get all software using all techniques.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of technique_stix_id => [{"object": Malware|Tool, "relationships": Relationship[]}] for each software using the technique
         """
+        if compact:
+            return self._get_compact_map("all_software_using_all_techniques")
+
         # return data if it has already been fetched
         if self.all_software_using_all_techniques:
             return self.all_software_using_all_techniques
@@ -1470,14 +1748,22 @@ class MitreAttackData:
     # Technique/Mitigation Relationships
     ###################################
 
-    def get_all_techniques_mitigated_by_all_mitigations(self) -> dict:
+    def get_all_techniques_mitigated_by_all_mitigations(self, compact: bool = False) -> dict:
         """Get all techniques mitigated by all mitigations.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of mitigation_stix_id => [{"object": AttackPattern, "relationships": Relationship[]}] for each technique mitigated by the mitigation
         """
+        if compact:
+            return self._get_compact_map("all_techniques_mitigated_by_all_mitigations")
+
         # return data if it has already been fetched
         if self.all_techniques_mitigated_by_all_mitigations:
             return self.all_techniques_mitigated_by_all_mitigations
@@ -1508,14 +1794,22 @@ class MitreAttackData:
             else []
         )
 
-    def get_all_mitigations_mitigating_all_techniques(self) -> dict:
+    def get_all_mitigations_mitigating_all_techniques(self, compact: bool = False) -> dict:
         """Get all mitigations mitigating all techniques.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of technique_stix_id => [{"object": CourseOfAction, "relationships": Relationship[]}] for each mitigation mitigating the technique
         """
+        if compact:
+            return self._get_compact_map("all_mitigations_mitigating_all_techniques")
+
         # return data if it has already been fetched
         if self.all_mitigations_mitigating_all_techniques:
             return self.all_mitigations_mitigating_all_techniques
@@ -1550,14 +1844,22 @@ class MitreAttackData:
     # Technique/Subtechnique Relationships
     ###################################
 
-    def get_all_parent_techniques_of_all_subtechniques(self) -> dict:
+    def get_all_parent_techniques_of_all_subtechniques(self, compact: bool = False) -> dict:
         """Get all parent techniques of all sub-techniques.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of subtechnique_stix_id => [{"object": AttackPattern, "relationships": Relationship[]}] describing the parent technique of the subtechnique
         """
+        if compact:
+            return self._get_compact_map("all_parent_techniques_of_all_subtechniques")
+
         # return data if it has already been fetched
         if self.all_parent_techniques_of_all_subtechniques:
             return self.all_parent_techniques_of_all_subtechniques
@@ -1588,14 +1890,22 @@ class MitreAttackData:
             else []
         )
 
-    def get_all_subtechniques_of_all_techniques(self) -> dict:
+    def get_all_subtechniques_of_all_techniques(self, compact: bool = False) -> dict:
         """Get all subtechniques of all parent techniques.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of technique_stix_id => [{"object": AttackPattern, "relationships": Relationship[]}] for each subtechnique of the technique
         """
+        if compact:
+            return self._get_compact_map("all_subtechniques_of_all_techniques")
+
         # return data if it has already been fetched
         if self.all_subtechniques_of_all_techniques:
             return self.all_subtechniques_of_all_techniques
@@ -1628,14 +1938,22 @@ class MitreAttackData:
     # Technique/Data Component Relationships
     ###################################
 
-    def get_all_techniques_detected_by_all_datacomponents(self) -> dict:
+    def get_all_techniques_detected_by_all_datacomponents(self, compact: bool = False) -> dict:
         """Get all techniques detected by all data components.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of datacomponent_stix_id => [{"object": AttackPattern, "relationships": Relationship[]}] describing the detections of the data component
         """
+        if compact:
+            return self._get_compact_map("all_techniques_detected_by_all_datacomponents")
+
         # return data if it has already been fetched
         if self.all_techniques_detected_by_all_datacomponents:
             return self.all_techniques_detected_by_all_datacomponents
@@ -1666,14 +1984,22 @@ class MitreAttackData:
             else []
         )
 
-    def get_all_datacomponents_detecting_all_techniques(self) -> dict:
+    def get_all_datacomponents_detecting_all_techniques(self, compact: bool = False) -> dict:
         """Get all data components detecting all techniques.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of technique_stix_id => [{"object": DataComponent, "relationships": Relationship[]}] describing the data components that can detect the technique
         """
+        if compact:
+            return self._get_compact_map("all_datacomponents_detecting_all_techniques")
+
         # return data if it has already been fetched
         if self.all_datacomponents_detecting_all_techniques:
             return self.all_datacomponents_detecting_all_techniques
@@ -1729,14 +2055,22 @@ class MitreAttackData:
     # Technique/Asset Relationships
     ###################################
 
-    def get_all_techniques_targeting_all_assets(self) -> dict:
+    def get_all_techniques_targeting_all_assets(self, compact: bool = False) -> dict:
         """Get all techniques targeting all assets.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of asset_stix_id => [{'object': AttackPattern, 'relationships': Relationship[]}] for each technique targeting the asset
         """
+        if compact:
+            return self._get_compact_map("all_techniques_targeting_all_assets")
+
         # return data if it has already been fetched
         if self.all_techniques_targeting_all_assets:
             return self.all_techniques_targeting_all_assets
@@ -1763,14 +2097,22 @@ class MitreAttackData:
         techniques_targeting_assets = self.get_all_techniques_targeting_all_assets()
         return techniques_targeting_assets[asset_stix_id] if asset_stix_id in techniques_targeting_assets else []
 
-    def get_all_assets_targeted_by_all_techniques(self) -> dict:
+    def get_all_assets_targeted_by_all_techniques(self, compact: bool = False) -> dict:
         """Get all assets targeted by all techniques.
 
+        Parameters
+        ----------
+        compact : bool, optional
+            return an ID-only CompactRelationshipMap of stix_id => [RelatedIds], by default False
+
         Returns
         -------
         dict
             a mapping of technique_stix_id => [{'object': Asset, 'relationships': Relationship[]}] for each asset targeted by the technique
         """
+        if compact:
+            return self._get_compact_map("all_assets_targeted_by_all_techniques")
+
         # return data if it has already been fetched
         if self.all_assets_targeted_by_all_techniques:
             return self.all_assets_targeted_by_all_techniques
@@ -1798,3 +2140,82 @@ class MitreAttackData:
             if technique_stix_id in assets_targeted_by_techniques
             else []
         )
+
+    ###################################
+    # Columnar Export Section
+    ###################################
+
+    def to_arrow_tables(self, stix_types: list = None, remove_revoked_deprecated=False) -> dict:
+        """Export ATT&CK objects and relationships as typed Apache Arrow tables.
+
+        Requires the optional `pyarrow` dependency.
+
+        Parameters
+        ----------
+        stix_types : list, optional
+            the STIX types to export, by default all of `MitreAttackData.stix_types`
+        remove_revoked_deprecated : bool, optional
+            remove revoked or deprecated objects and relationships from the tables, by default False
+
+        Returns
+        -------
+        dict
+            a mapping of STIX type => pyarrow.Table, with one row per object, plus a "relationship" edge table
+            with the ATT&CK ID, name and type of each relationship's source and target resolved
+
+        Raises
+        ------
+        ValueError
+            Raised if any of `stix_types` is not a supported STIX type
+        ImportError
+            Raised if pyarrow is not installed
+        """
+        stix_types = stix_types or self.stix_types
+        for stix_type in stix_types:
+            if stix_type not in self.stix_types:
+                raise ValueError(f"stix_type must be one of {self.stix_types}")
+
+        objects_by_id = {}
+        tables = {}
+        for stix_type in self.stix_types:
+            objects = self.src.query([Filter("type", "=", stix_type)])
+            for stix_object in objects:
+                objects_by_id[stix_object["id"]] = stix_object
+            if stix_type in stix_types:
+                if remove_revoked_deprecated:
+                    objects = self.remove_revoked_deprecated(objects)
+                tables[stix_type] = columnar.objects_to_table(stix_type, objects)
+
+        relationships = self.src.query([Filter("type", "=", "relationship")])
+        if remove_revoked_deprecated:
+            relationships = self.remove_revoked_deprecated(relationships)
+        tables["relationship"] = columnar.relationships_to_table(relationships, objects_by_id)
+
+        return tables
+
+    def to_parquet(
+        self, output_dir: str, stix_types: list = None, remove_revoked_deprecated=False, compression: str = "zstd"
+    ) -> dict:
+        """Export ATT&CK objects and relationships as Parquet files, one file per table.
+
+        Requires the optional `pyarrow` dependency. See `to_arrow_tables` for the contents of each table.
+
+        Parameters
+        ----------
+        output_dir : str
+            directory to write the Parquet files to, created if it does not exist
+        stix_types : list, optional
+            the STIX types to export, by default all of `MitreAttackData.stix_types`
+        remove_revoked_deprecated : bool, optional
+            remove revoked or deprecated objects and relationships from the tables, by default False
+        compression : str, optional
+            Parquet compression codec, by default "zstd"
+
+        Returns
+        -------
+        dict
+            a mapping of table name => path of the written Parquet file, e.g. "attack-pattern" =>
+            "<output_dir>/attack-pattern.parquet"
+        """
+        tables = self.to_arrow_tables(stix_types=stix_types, remove_revoked_deprecated=remove_revoked_deprecated)
+        return columnar.write_parquet(tables, output_dir=output_dir, compression=compression)
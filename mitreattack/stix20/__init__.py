@@ -1,2 +1,8 @@
 from .MitreAttackData import MitreAttackData
 from .custom_attack_objects import StixObjectFactory, Matrix, Tactic, DataSource, DataComponent, Asset
+from .versioned_store import VersionedAttackStore
+from .compact import CompactRelationshipMap, RelatedIds, StixIdIndex
+from .name_resolver import NameMatch, NameResolver
+from .entity_extractor import EntityExtractor, EntityMatch
+from .similarity import SimilarityIndex
+from .matrix_layout import MatrixLayout, MatrixLayoutCache, TacticColumn
@@ -0,0 +1,288 @@
+"""Columnar (Apache Arrow / Parquet) export of ATT&CK STIX 2.0 content."""
+
+import os
+from datetime import datetime
+
+from dateutil import parser
+
+# Columns shared by every object table: (column name, STIX property, column kind)
+COMMON_COLUMNS = [
+    ("id", "id", "string"),
+    ("type", "type", "category"),
+    ("attack_id", None, "string"),
+    ("name", "name", "string"),
+    ("description", "description", "string"),
+    ("url", None, "string"),
+    ("created", "created", "timestamp"),
+    ("modified", "modified", "timestamp"),
+    ("version", "x_mitre_version", "category"),
+    ("attack_spec_version", "x_mitre_attack_spec_version", "category"),
+    ("domains", "x_mitre_domains", "category_list"),
+    ("deprecated", "x_mitre_deprecated", "bool"),
+    ("revoked", "revoked", "bool"),
+]
+
+# Additional columns for each STIX type
+TYPE_COLUMNS = {
+    "attack-pattern": [
+        ("tactics", None, "category_list"),
+        ("platforms", "x_mitre_platforms", "category_list"),
+        ("is_subtechnique", "x_mitre_is_subtechnique", "bool"),
+        ("detection", "x_mitre_detection", "string"),
+        ("data_sources", "x_mitre_data_sources", "category_list"),
+        ("defense_bypassed", "x_mitre_defense_bypassed", "category_list"),
+        ("permissions_required", "x_mitre_permissions_required", "category_list"),
+        ("system_requirements", "x_mitre_system_requirements", "string_list"),
+        ("effective_permissions", "x_mitre_effective_permissions", "category_list"),
+        ("impact_type", "x_mitre_impact_type", "category_list"),
+        ("remote_support", "x_mitre_remote_support", "bool"),
+        ("network_requirements", "x_mitre_network_requirements", "bool"),
+        ("tactic_type", "x_mitre_tactic_type", "category_list"),
+        ("contributors", "x_mitre_contributors", "category_list"),
+    ],
+    "malware": [
+        ("aliases", "x_mitre_aliases", "string_list"),
+        ("platforms", "x_mitre_platforms", "category_list"),
+        ("contributors", "x_mitre_contributors", "category_list"),
+    ],
+    "tool": [
+        ("aliases", "x_mitre_aliases", "string_list"),
+        ("platforms", "x_mitre_platforms", "category_list"),
+        ("contributors", "x_mitre_contributors", "category_list"),
+    ],
+    "intrusion-set": [
+        ("aliases", "aliases", "string_list"),
+        ("contributors", "x_mitre_contributors", "category_list"),
+    ],
+    "campaign": [
+        ("aliases", "aliases", "string_list"),
+        ("first_seen", "first_seen", "timestamp"),
+        ("last_seen", "last_seen", "timestamp"),
+        ("first_seen_citation", "x_mitre_first_seen_citation", "string"),
+        ("last_seen_citation", "x_mitre_last_seen_citation", "string"),
+        ("contributors", "x_mitre_contributors", "category_list"),
+    ],
+    "course-of-action": [],
+    "x-mitre-matrix": [
+        ("tactic_refs", "tactic_refs", "string_list"),
+    ],
+    "x-mitre-tactic": [
+        ("shortname", "x_mitre_shortname", "category"),
+    ],
+    "x-mitre-data-source": [
+        ("platforms", "x_mitre_platforms", "category_list"),
+        ("collection_layers", "x_mitre_collection_layers", "category_list"),
+        ("contributors", "x_mitre_contributors", "category_list"),
+    ],
+    "x-mitre-data-component": [
+        ("data_source_ref", "x_mitre_data_source_ref", "category"),
+    ],
+    "x-mitre-asset": [
+        ("platforms", "x_mitre_platforms", "category_list"),
+        ("sectors", "x_mitre_sectors", "category_list"),
+        ("contributors", "x_mitre_contributors", "category_list"),
+    ],
+}
+
+RELATIONSHIP_COLUMNS = [
+    ("id", "id", "string"),
+    ("relationship_type", "relationship_type", "category"),
+    ("source_ref", "source_ref", "string"),
+    ("source_type", None, "category"),
+    ("source_attack_id", None, "category"),
+    ("source_name", None, "category"),
+    ("target_ref", "target_ref", "string"),
+    ("target_type", None, "category"),
+    ("target_attack_id", None, "category"),
+    ("target_name", None, "category"),
+    ("description", "description", "string"),
+    ("created", "created", "timestamp"),
+    ("modified", "modified", "timestamp"),
+    ("domains", "x_mitre_domains", "category_list"),
+    ("deprecated", "x_mitre_deprecated", "bool"),
+    ("revoked", "revoked", "bool"),
+]
+
+
+def import_pyarrow():
+    """Import pyarrow, raising a helpful error if it is not installed."""
+    try:
+        import pyarrow
+    except ImportError as err:
+        raise ImportError(
+            "Columnar export requires pyarrow. Install it with `pip install pyarrow` "
+            "or `pip install mitreattack-python[arrow]`."
+        ) from err
+    return pyarrow
+
+
+def _arrow_type(pa, kind: str):
+    """Get the Arrow data type for a column kind."""
+    category = pa.dictionary(pa.int32(), pa.string())
+    return {
+        "string": pa.string(),
+        "category": category,
+        "string_list": pa.list_(pa.string()),
+        "category_list": pa.list_(category),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("ms", tz="UTC"),
+    }[kind]
+
+
+def _to_timestamp(value):
+    """Convert a STIX timestamp (string or datetime) to a datetime."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return parser.isoparse(value)
+
+
+def get_attack_id(stix_object, source_names=("mitre-attack",)) -> str | None:
+    """Get the ATT&CK ID of a STIX object from its first external reference.
+
+    By default only "mitre-attack" references are read, as by `MitreAttackData.get_attack_id`. Pass
+    `mitreattack.constants.MITRE_ATTACK_ID_SOURCE_NAMES` as `source_names` to also read the source names of older
+    Mobile and ICS content.
+    """
+    external_references = stix_object.get("external_references")
+    if external_references:
+        attack_source = external_references[0]
+        if attack_source.get("external_id") and attack_source.get("source_name") in source_names:
+            return attack_source["external_id"]
+    return None
+
+
+def get_attack_url(stix_object) -> str | None:
+    """Get the ATT&CK URL of a STIX object."""
+    external_references = stix_object.get("external_references")
+    if external_references:
+        attack_source = external_references[0]
+        if attack_source.get("source_name") == "mitre-attack":
+            return attack_source.get("url")
+    return None
+
+
+def _column_value(stix_object, column: str, stix_property: str | None, kind: str):
+    """Extract the value of a single column from a STIX object."""
+    if column == "attack_id":
+        return get_attack_id(stix_object)
+    if column == "url":
+        return get_attack_url(stix_object)
+    if column == "tactics":
+        return [phase["phase_name"] for phase in stix_object.get("kill_chain_phases", [])] or None
+
+    value = stix_object.get(stix_property)
+    if kind == "timestamp":
+        return _to_timestamp(value)
+    if kind == "bool":
+        return bool(value) if value is not None else False
+    if kind in ("string_list", "category_list"):
+        return list(value) if value else None
+    return value
+
+
+def build_table(columns: list, rows: list):
+    """Build an Arrow table from column definitions and pre-extracted row values.
+
+    Parameters
+    ----------
+    columns : list
+        list of (column name, STIX property, column kind) tuples
+    rows : list
+        list of dicts of column name => value
+
+    Returns
+    -------
+    pyarrow.Table
+        a table with one column per column definition, with dictionary-encoded string columns
+        for low-cardinality values
+    """
+    pa = import_pyarrow()
+    fields = [pa.field(name, _arrow_type(pa, kind)) for name, _, kind in columns]
+    schema = pa.schema(fields)
+    arrays = [pa.array([row[name] for row in rows], type=field.type) for (name, _, _), field in zip(columns, fields)]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def objects_to_table(stix_type: str, stix_objects: list):
+    """Build an Arrow table for STIX objects of a single type.
+
+    Parameters
+    ----------
+    stix_type : str
+        the STIX type of the objects, e.g. 'attack-pattern'
+    stix_objects : list
+        list of STIX objects of `stix_type`
+
+    Returns
+    -------
+    pyarrow.Table
+        one row per object
+    """
+    columns = COMMON_COLUMNS + TYPE_COLUMNS.get(stix_type, [])
+    rows = [
+        {name: _column_value(stix_object, name, stix_property, kind) for name, stix_property, kind in columns}
+        for stix_object in stix_objects
+    ]
+    return build_table(columns, rows)
+
+
+def relationships_to_table(relationships: list, objects_by_id: dict):
+    """Build an Arrow edge table for relationships, resolving both endpoints.
+
+    Parameters
+    ----------
+    relationships : list
+        list of STIX relationship objects
+    objects_by_id : dict
+        mapping of STIX ID => STIX object, used to resolve the ATT&CK ID, name and type of
+        each relationship's source and target
+
+    Returns
+    -------
+    pyarrow.Table
+        one row per relationship
+    """
+    rows = []
+    for relationship in relationships:
+        row = {
+            name: _column_value(relationship, name, stix_property, kind)
+            for name, stix_property, kind in RELATIONSHIP_COLUMNS
+            if stix_property
+        }
+        for end in ("source", "target"):
+            stix_id = relationship[f"{end}_ref"]
+            stix_object = objects_by_id.get(stix_id, {})
+            row[f"{end}_type"] = stix_id.split("--")[0]
+            row[f"{end}_attack_id"] = get_attack_id(stix_object)
+            row[f"{end}_name"] = stix_object.get("name")
+        rows.append(row)
+    return build_table(RELATIONSHIP_COLUMNS, rows)
+
+
+def write_parquet(tables: dict, output_dir: str, compression: str = "zstd") -> dict:
+    """Write Arrow tables to Parquet files, one file per table.
+
+    Parameters
+    ----------
+    tables : dict
+        mapping of table name => pyarrow.Table
+    output_dir : str
+        directory to write the files to, created if it does not exist
+    compression : str, optional
+        Parquet compression codec, by default "zstd"
+
+    Returns
+    -------
+    dict
+        mapping of table name => path of the written file
+    """
+    import_pyarrow()
+    import pyarrow.parquet as pq
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for name, table in tables.items():
+        path = os.path.join(output_dir, f"{name}.parquet")
+        pq.write_table(table, path, compression=compression)
+        paths[name] = path
+    return paths
@@ -0,0 +1,233 @@
+"""Compact representations of ATT&CK STIX 2.0 content and relationship mappings."""
+
+import json
+import sys
+from array import array
+from collections.abc import Mapping
+
+# STIX properties whose string values (or list items) are repeated across many objects
+INTERNED_PROPERTIES = {
+    "id",
+    "type",
+    "source_ref",
+    "target_ref",
+    "relationship_type",
+    "created_by_ref",
+    "x_mitre_modified_by_ref",
+    "object_marking_refs",
+    "x_mitre_data_source_ref",
+    "tactic_refs",
+    "source_name",
+    "kill_chain_name",
+    "phase_name",
+    "x_mitre_shortname",
+    "x_mitre_platforms",
+    "x_mitre_domains",
+    "x_mitre_version",
+    "x_mitre_attack_spec_version",
+    "x_mitre_collection_layers",
+    "x_mitre_permissions_required",
+    "x_mitre_effective_permissions",
+    "x_mitre_defense_bypassed",
+    "x_mitre_data_sources",
+    "x_mitre_contributors",
+    "labels",
+    "spec_version",
+}
+
+
+def _intern_pairs(pairs: list) -> dict:
+    """Build a JSON object, interning the values of properties in `INTERNED_PROPERTIES`."""
+    stix_dict = {}
+    for key, value in pairs:
+        if key in INTERNED_PROPERTIES:
+            if isinstance(value, str):
+                value = sys.intern(value)
+            elif isinstance(value, list):
+                value = [sys.intern(item) if isinstance(item, str) else item for item in value]
+        stix_dict[key] = value
+    return stix_dict
+
+
+def load_interned_bundle(stix_filepath: str) -> dict:
+    """Load a STIX bundle from JSON, interning frequently repeated strings.
+
+    STIX IDs, relationship types, platform names, kill chain phase names, etc. are shared between every
+    object that references them instead of being stored once per occurrence.
+
+    Parameters
+    ----------
+    stix_filepath : str
+        Filepath to a STIX 2.0 bundle
+
+    Returns
+    -------
+    dict
+        the STIX bundle
+    """
+    with open(stix_filepath, "r", encoding="utf-8") as f:
+        return json.load(f, object_pairs_hook=_intern_pairs)
+
+
+class StixIdIndex:
+    """Bidirectional mapping of STIX IDs to dense integers."""
+
+    __slots__ = ("_ids", "_indexes")
+
+    def __init__(self):
+        """Initialize an empty StixIdIndex."""
+        self._ids = []
+        self._indexes = {}
+
+    def __len__(self) -> int:
+        """Get the number of STIX IDs in the index."""
+        return len(self._ids)
+
+    def __contains__(self, stix_id: str) -> bool:
+        """Check if a STIX ID is in the index."""
+        return stix_id in self._indexes
+
+    def add(self, stix_id: str) -> int:
+        """Get the integer for a STIX ID, adding the STIX ID to the index if needed.
+
+        Parameters
+        ----------
+        stix_id : str
+            the STIX ID
+
+        Returns
+        -------
+        int
+            the integer for the STIX ID
+        """
+        index = self._indexes.get(stix_id)
+        if index is None:
+            index = len(self._ids)
+            stix_id = sys.intern(stix_id)
+            self._ids.append(stix_id)
+            self._indexes[stix_id] = index
+        return index
+
+    def index(self, stix_id: str) -> int:
+        """Get the integer for a STIX ID.
+
+        Raises
+        ------
+        KeyError
+            Raised if the STIX ID is not in the index
+        """
+        return self._indexes[stix_id]
+
+    def stix_id(self, index: int) -> str:
+        """Get the STIX ID for an integer."""
+        return self._ids[index]
+
+
+class RelatedIds:
+    """ID-only record of a related object and the relationships relating it."""
+
+    __slots__ = ("id", "relationship_ids")
+
+    def __init__(self, id: str, relationship_ids: tuple):
+        """Initialize a RelatedIds record.
+
+        Parameters
+        ----------
+        id : str
+            the STIX ID of the related object
+        relationship_ids : tuple
+            the STIX IDs of the relationships relating the object
+        """
+        self.id = id
+        self.relationship_ids = relationship_ids
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RelatedIds) and (self.id, self.relationship_ids) == (other.id, other.relationship_ids)
+
+    def __repr__(self) -> str:
+        return f"RelatedIds(id={self.id!r}, relationship_ids={self.relationship_ids!r})"
+
+
+class CompactRelationshipMap(Mapping):
+    """Read-only, ID-only version of a relationship mapping from `MitreAttackData`.
+
+    A mapping of stix_id => [RelatedIds] equivalent to the stix_id => [{"object", "relationships"}] mappings
+    returned by the `get_all_*` methods of `MitreAttackData`. STIX IDs are stored as dense integers from a
+    `StixIdIndex` in flat arrays, and records are only created when an entry is accessed.
+    """
+
+    def __init__(self, relationship_map: dict, id_index: StixIdIndex):
+        """Build a CompactRelationshipMap.
+
+        Parameters
+        ----------
+        relationship_map : dict
+            a relationship mapping of stix_id => [{"object": object, "relationships": Relationship[]}]
+        id_index : StixIdIndex
+            the index used to map STIX IDs to integers, which may be shared with other mappings
+        """
+        self._id_index = id_index
+        # stix_id integer => (start, end) in self._related
+        self._entries = {}
+        # STIX ID integers of related objects
+        self._related = array("l")
+        # related object i has relationships self._relationships[self._offsets[i]:self._offsets[i + 1]]
+        self._offsets = array("l", [0])
+        self._relationships = array("l")
+
+        for stix_id, related_objects in relationship_map.items():
+            start = len(self._related)
+            for related in related_objects:
+                self._related.append(id_index.add(related["object"]["id"]))
+                self._relationships.extend(id_index.add(r["id"]) for r in related["relationships"])
+                self._offsets.append(len(self._relationships))
+            self._entries[id_index.add(stix_id)] = (start, len(self._related))
+
+    def _slice(self, stix_id: str):
+        """Get the (start, end) of an entry in self._related, or None if the STIX ID has no entry."""
+        if stix_id not in self._id_index:
+            return None
+        return self._entries.get(self._id_index.index(stix_id))
+
+    def __getitem__(self, stix_id: str) -> list:
+        entry = self._slice(stix_id)
+        if entry is None:
+            raise KeyError(stix_id)
+        start, end = entry
+        stix_ids = self._id_index.stix_id
+        return [
+            RelatedIds(
+                stix_ids(self._related[i]),
+                tuple(stix_ids(r) for r in self._relationships[self._offsets[i] : self._offsets[i + 1]]),
+            )
+            for i in range(start, end)
+        ]
+
+    def __iter__(self):
+        stix_ids = self._id_index.stix_id
+        return (stix_ids(index) for index in self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, stix_id) -> bool:
+        return self._slice(stix_id) is not None
+
+    def get_related_ids(self, stix_id: str) -> list:
+        """Get the STIX IDs of the objects related to an object.
+
+        Parameters
+        ----------
+        stix_id : str
+            the STIX ID of the object
+
+        Returns
+        -------
+        list
+            the STIX IDs of the related objects, or an empty list if the object has none
+        """
+        entry = self._slice(stix_id)
+        if entry is None:
+            return []
+        start, end = entry
+        return [self._id_index.stix_id(index) for index in self._related[start:end]]
@@ -0,0 +1,203 @@
+"""Extract mentions of ATT&CK objects from text with an Aho-Corasick automaton."""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+
+from mitreattack.stix20.name_resolver import get_object_terms
+
+# the extractor used by each worker process of EntityExtractor.extract_many()
+_worker_extractor = None
+
+
+@dataclass
+class EntityMatch:
+    """A mention of an ATT&CK object in text."""
+
+    start: int
+    end: int
+    text: str
+    stix_id: str
+    stix_type: str
+    attack_id: str | None
+    name: str
+    kind: str
+
+
+def _init_worker(extractor):
+    global _worker_extractor
+    _worker_extractor = extractor
+
+
+def _extract_in_worker(text: str, whole_words: bool, overlapping: bool) -> list:
+    return _worker_extractor.extract(text, whole_words=whole_words, overlapping=overlapping)
+
+
+class EntityExtractor:
+    """Find every mention of the names, aliases and ATT&CK IDs of ATT&CK objects in text.
+
+    All terms are matched in a single pass over the text, regardless of the number of terms.
+    """
+
+    def __init__(self, stix_objects: list, case_sensitive: bool = False, min_term_length: int = 3):
+        """Build the automaton.
+
+        Parameters
+        ----------
+        stix_objects : list
+            the STIX objects whose names, aliases (`aliases` and `x_mitre_aliases`) and ATT&CK IDs to match
+        case_sensitive : bool, optional
+            match terms case-sensitively, by default False
+        min_term_length : int, optional
+            ignore names and aliases shorter than this, by default 3. ATT&CK IDs are always matched.
+        """
+        self.case_sensitive = case_sensitive
+        # node => {character: child node}
+        self._goto = [{}]
+        # node => node of the longest proper suffix of the node that is also in the trie
+        self._fail = [0]
+        # node => [term index] of the terms ending at the node, including those of its suffixes
+        self._output = [[]]
+        # term index => (term length, [(stix_id, stix_type, attack_id, name, kind)])
+        self._terms = []
+        term_indexes = {}
+
+        for stix_object in stix_objects:
+            terms = get_object_terms(stix_object)
+            attack_id = next((term for term, kind in terms if kind == "attack_id"), None)
+            for term, kind in terms:
+                if kind != "attack_id" and len(term) < min_term_length:
+                    continue
+                key = term if case_sensitive else term.lower()
+                entity = (stix_object["id"], stix_object["type"], attack_id, stix_object.get("name"), kind)
+                if key in term_indexes:
+                    self._terms[term_indexes[key]][1].append(entity)
+                    continue
+                term_indexes[key] = len(self._terms)
+                self._terms.append((len(key), [entity]))
+                self._add_term(key, term_indexes[key])
+
+        self._build_failure_links()
+
+    def _add_term(self, key: str, term_index: int):
+        """Add a term to the trie."""
+        node = 0
+        for character in key:
+            child = self._goto[node].get(character)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][character] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = child
+        self._output[node].append(term_index)
+
+    def _build_failure_links(self):
+        """Compute failure links breadth-first and merge the outputs of each node's suffixes."""
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for character, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and character not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(character, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def _scan(self, text: str):
+        """Yield (start, end, term index) for every occurrence of every term in the text."""
+        if not self.case_sensitive:
+            lowered = text.lower()
+            # lowercasing some characters changes their length, which would shift the offsets
+            if len(lowered) != len(text):
+                lowered = "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+            text = lowered
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        terms = self._terms
+        node = 0
+        for position, character in enumerate(text):
+            while node and character not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(character, 0)
+            for term_index in output[node]:
+                yield position + 1 - terms[term_index][0], position + 1, term_index
+
+    def extract(self, text: str, whole_words: bool = True, overlapping: bool = False) -> list:
+        """Extract the ATT&CK objects mentioned in text.
+
+        Parameters
+        ----------
+        text : str
+            the text to search
+        whole_words : bool, optional
+            only match terms that are not part of a longer word, e.g. do not match "APT1" in "APT12", by default True
+        overlapping : bool, optional
+            return every match, including matches that overlap a longer match, by default False, which keeps the
+            longest match at each position, scanning left to right
+
+        Returns
+        -------
+        list
+            list of EntityMatch mentions in order of their position in the text. A term shared by several objects
+            results in one mention per object.
+        """
+        occurrences = []
+        for start, end, term_index in self._scan(text):
+            if whole_words and (
+                (start > 0 and text[start - 1].isalnum() and text[start].isalnum())
+                or (end < len(text) and text[end].isalnum() and text[end - 1].isalnum())
+            ):
+                continue
+            occurrences.append((start, end, term_index))
+
+        # longest match first at each position
+        occurrences.sort(key=lambda occurrence: (occurrence[0], -occurrence[1]))
+        if not overlapping:
+            selected = []
+            covered_until = 0
+            for start, end, term_index in occurrences:
+                if start >= covered_until:
+                    selected.append((start, end, term_index))
+                    covered_until = end
+            occurrences = selected
+
+        return [
+            EntityMatch(start, end, text[start:end], *entity)
+            for start, end, term_index in occurrences
+            for entity in self._terms[term_index][1]
+        ]
+
+    def extract_many(
+        self, texts: list, workers: int = None, whole_words: bool = True, overlapping: bool = False
+    ) -> list:
+        """Extract the ATT&CK objects mentioned in many documents.
+
+        Parameters
+        ----------
+        texts : list
+            the documents to search
+        workers : int, optional
+            number of worker processes to search the documents in parallel, by default None, which searches them
+            in the current process
+        whole_words : bool, optional
+            only match terms that are not part of a longer word, by default True
+        overlapping : bool, optional
+            return every match, including matches that overlap a longer match, by default False
+
+        Returns
+        -------
+        list
+            a list of EntityMatch mentions for each document, in the same order as `texts`
+        """
+        if not workers or workers <= 1:
+            return [self.extract(text, whole_words=whole_words, overlapping=overlapping) for text in texts]
+
+        texts = list(texts)
+        chunksize = max(1, len(texts) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as executor:
+            extract = partial(_extract_in_worker, whole_words=whole_words, overlapping=overlapping)
+            return list(executor.map(extract, texts, chunksize=chunksize))
@@ -0,0 +1,312 @@
+"""Layout of the ATT&CK matrices: the tactic columns, their techniques, and the sub-techniques of each technique."""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+
+from stix2.serialization import STIXJSONEncoder
+
+from mitreattack.constants import MITRE_ATTACK_ID_SOURCE_NAMES
+from mitreattack.stix20.columnar import get_attack_id
+
+# bump when the layouts change in a way the hashed properties do not capture
+LAYOUT_FORMAT_VERSION = 1
+
+# the STIX properties the layouts are computed from, hashed to key the cached layouts
+LAYOUT_PROPERTIES = (
+    "id",
+    "type",
+    "modified",
+    "name",
+    "description",
+    "revoked",
+    "x_mitre_deprecated",
+    "x_mitre_is_subtechnique",
+    "x_mitre_platforms",
+    "x_mitre_shortname",
+    "kill_chain_phases",
+    "tactic_refs",
+    "relationship_type",
+    "source_ref",
+    "target_ref",
+)
+
+# maximum number of (bundle, platform filter) layouts kept in memory
+MEMORY_CACHE_SIZE = 32
+
+# (layout key, platform filter) => list of MatrixLayout, most recently used last
+_memory_cache = OrderedDict()
+
+
+@dataclass
+class TacticColumn:
+    """A tactic column of a matrix.
+
+    Objects are represented by dicts of their "id", "name", "attack_id" and, when present, "x_mitre_platforms" and
+    "x_mitre_shortname", so that they can be passed to the helpers that take STIX objects.
+    """
+
+    # the tactic
+    tactic: dict
+    # techniques in the tactic that are not sub-techniques, sorted by name
+    techniques: list
+    # technique STIX ID => its sub-techniques sorted by name, for each technique with subtechnique-of relationships
+    subtechniques: dict
+
+
+@dataclass
+class MatrixLayout:
+    """The tactic columns of a matrix, in the order of its `tactic_refs`."""
+
+    # the "id", "name" and "description" of the matrix
+    matrix: dict
+    columns: list
+
+
+def _is_active(stix_object) -> bool:
+    return stix_object.get("x_mitre_deprecated", False) is False and stix_object.get("revoked", False) is False
+
+
+def _is_layout_object(stix_object) -> bool:
+    if stix_object["type"] == "relationship":
+        return stix_object["relationship_type"] == "subtechnique-of"
+    return stix_object["type"] in ("x-mitre-matrix", "x-mitre-tactic", "attack-pattern")
+
+
+def _layout_entry(stix_object) -> dict:
+    entry = {
+        "id": stix_object["id"],
+        "name": stix_object["name"],
+        "attack_id": get_attack_id(stix_object, source_names=MITRE_ATTACK_ID_SOURCE_NAMES),
+    }
+    if "x_mitre_platforms" in stix_object:
+        entry["x_mitre_platforms"] = list(stix_object["x_mitre_platforms"])
+    if "x_mitre_shortname" in stix_object:
+        entry["x_mitre_shortname"] = stix_object["x_mitre_shortname"]
+    return entry
+
+
+def _normalize_platforms(platforms) -> tuple:
+    return tuple(sorted({platform.lower() for platform in platforms})) if platforms else ()
+
+
+def _filter_platforms(entries: list, platforms: tuple) -> list:
+    return [
+        entry
+        for entry in entries
+        if any(platform.lower() in platforms for platform in entry.get("x_mitre_platforms", []))
+    ]
+
+
+def build_matrix_layouts(stix_objects: list) -> list:
+    """Compute the layout of every matrix that is not revoked or deprecated, with a single pass over the objects.
+
+    Parameters
+    ----------
+    stix_objects : list
+        the STIX objects of the domain, including revoked and deprecated objects and relationships
+
+    Returns
+    -------
+    list
+        a MatrixLayout for each matrix, in the order of `stix_objects`
+    """
+    # STIX ID => latest version of the object, including revoked and deprecated objects
+    objects_by_id = {}
+    # parent technique STIX ID => sub-technique STIX IDs of its subtechnique-of relationships
+    subtechnique_refs = defaultdict(list)
+    matrices = []
+    # tactic shortname => techniques in the tactic that are not sub-techniques
+    techniques_by_tactic = defaultdict(list)
+
+    for stix_object in stix_objects:
+        latest = objects_by_id.get(stix_object["id"])
+        if latest is None or str(stix_object.get("modified", "")) > str(latest.get("modified", "")):
+            objects_by_id[stix_object["id"]] = stix_object
+
+        if stix_object["type"] == "relationship" and stix_object["relationship_type"] == "subtechnique-of":
+            subtechnique_refs[stix_object["target_ref"]].append(stix_object["source_ref"])
+        elif stix_object["type"] == "x-mitre-matrix" and _is_active(stix_object):
+            matrices.append(stix_object)
+        elif (
+            stix_object["type"] == "attack-pattern"
+            and _is_active(stix_object)
+            and not stix_object.get("x_mitre_is_subtechnique")
+        ):
+            for shortname in dict.fromkeys(kcp["phase_name"] for kcp in stix_object.get("kill_chain_phases", [])):
+                techniques_by_tactic[shortname].append(stix_object)
+
+    # STIX ID => layout entry, shared between the columns an object appears in
+    entries = {}
+
+    def get_entry(stix_object):
+        if stix_object["id"] not in entries:
+            entries[stix_object["id"]] = _layout_entry(stix_object)
+        return entries[stix_object["id"]]
+
+    layouts = []
+    for matrix in matrices:
+        columns = []
+        for tactic_ref in matrix["tactic_refs"]:
+            tactic = objects_by_id[tactic_ref]
+            techniques = sorted(techniques_by_tactic.get(tactic["x_mitre_shortname"], []), key=lambda x: x["name"])
+            subtechniques = {}
+            for technique in techniques:
+                if technique["id"] in subtechnique_refs:
+                    subtechnique_objects = [
+                        objects_by_id[ref] for ref in subtechnique_refs[technique["id"]] if ref in objects_by_id
+                    ]
+                    subtechnique_objects = filter(_is_active, subtechnique_objects)
+                    subtechniques[technique["id"]] = [
+                        get_entry(subtechnique)
+                        for subtechnique in sorted(subtechnique_objects, key=lambda x: x["name"])
+                    ]
+            columns.append(
+                TacticColumn(
+                    tactic=get_entry(tactic),
+                    techniques=[get_entry(technique) for technique in techniques],
+                    subtechniques=subtechniques,
+                )
+            )
+        layouts.append(
+            MatrixLayout(
+                matrix={"id": matrix["id"], "name": matrix["name"], "description": matrix.get("description")},
+                columns=columns,
+            )
+        )
+    return layouts
+
+
+def filter_matrix_layouts(layouts: list, platforms: list) -> list:
+    """Keep only the techniques and sub-techniques of the given platforms in matrix layouts.
+
+    Every tactic column is kept, even when none of its techniques are of the platforms, so that the columns of the
+    filtered layouts line up with the columns of `layouts`.
+
+    Parameters
+    ----------
+    layouts : list
+        the MatrixLayout objects to filter
+    platforms : list
+        the platforms to keep, compared case-insensitively
+
+    Returns
+    -------
+    list
+        new MatrixLayout objects
+    """
+    platforms = _normalize_platforms(platforms)
+    if not platforms:
+        return layouts
+
+    filtered = []
+    for layout in layouts:
+        columns = []
+        for column in layout.columns:
+            techniques = _filter_platforms(column.techniques, platforms)
+            subtechniques = {
+                technique["id"]: _filter_platforms(column.subtechniques[technique["id"]], platforms)
+                for technique in techniques
+                if technique["id"] in column.subtechniques
+            }
+            columns.append(TacticColumn(tactic=column.tactic, techniques=techniques, subtechniques=subtechniques))
+        filtered.append(MatrixLayout(matrix=layout.matrix, columns=columns))
+    return filtered
+
+
+class MatrixLayoutCache:
+    """Matrix layouts of a bundle, computed once per platform filter and cached in memory and optionally on disk.
+
+    The layouts are keyed by a hash of only the properties of the matrices, tactics, techniques and subtechnique-of
+    relationships they are computed from, so every exporter that lays out the same bundle shares the same layouts,
+    even when each loads its own copy of the bundle. Cached layouts are shared and must not be modified.
+
+    Layouts cached on disk are pickled, so a cache directory must only be shared with trusted users.
+    """
+
+    def __init__(self, src, cache_dir: str = None, stix_objects: list = None):
+        """Hash the domain data.
+
+        Parameters
+        ----------
+        src : MemoryStore
+            MemoryStore or other stix2 DataSource object holding the domain data
+        cache_dir : str, optional
+            directory to also cache the layouts in, by default None, which only caches them in memory
+        stix_objects : list, optional
+            the objects of `src` that were already queried, such as the `objects_by_id` of a `StixIndexContext`,
+            by default None, which queries `src`
+        """
+        self.src = src
+        self.cache_dir = cache_dir
+        if stix_objects is None:
+            stix_objects = src.query()
+        self._stix_objects = [stix_object for stix_object in stix_objects if _is_layout_object(stix_object)]
+
+        sha256_hash = hashlib.sha256(str(LAYOUT_FORMAT_VERSION).encode("utf-8"))
+        for stix_object in self._stix_objects:
+            properties = {key: stix_object[key] for key in LAYOUT_PROPERTIES if key in stix_object}
+            properties["attack_id"] = get_attack_id(stix_object, source_names=MITRE_ATTACK_ID_SOURCE_NAMES)
+            sha256_hash.update(json.dumps(properties, cls=STIXJSONEncoder, sort_keys=True).encode("utf-8"))
+        self.key = sha256_hash.hexdigest()
+
+    def _get_path(self, platforms: tuple) -> str:
+        name = hashlib.sha256(json.dumps([self.key, platforms]).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, "matrix-layouts", f"{name}.pickle")
+
+    def _load(self, platforms: tuple):
+        path = self._get_path(platforms)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def _store(self, platforms: tuple, layouts: list):
+        path = self._get_path(platforms)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(layouts, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def get_layouts(self, platforms: list = None) -> list:
+        """Get the layouts of the matrices, optionally keeping only the techniques of some platforms.
+
+        Parameters
+        ----------
+        platforms : list, optional
+            platforms to filter the techniques and sub-techniques by, as in `filter_matrix_layouts`, by default None,
+            which keeps every technique
+
+        Returns
+        -------
+        list
+            a MatrixLayout for each matrix that is not revoked or deprecated
+        """
+        platforms = _normalize_platforms(platforms)
+        memory_key = (self.key, platforms)
+        if memory_key in _memory_cache:
+            _memory_cache.move_to_end(memory_key)
+            return _memory_cache[memory_key]
+
+        layouts = self._load(platforms) if self.cache_dir else None
+        if layouts is None:
+            if platforms:
+                layouts = filter_matrix_layouts(self.get_layouts(), platforms)
+            else:
+                layouts = build_matrix_layouts(self._stix_objects)
+            if self.cache_dir:
+                self._store(platforms, layouts)
+
+        _memory_cache[memory_key] = layouts
+        if len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+        return layouts
@@ -0,0 +1,218 @@
+"""Indexed lookup of ATT&CK objects by name, alias or ATT&CK ID, tolerant of prefixes and typos."""
+
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from itertools import chain
+
+from mitreattack.constants import MITRE_ATTACK_ID_SOURCE_NAMES
+
+# e.g. "T1059.1" => "T1059.001"
+SUBTECHNIQUE_ID_REGEX = re.compile(r"^([a-z]{1,2})(\d{4})\.(\d{1,3})$")
+NON_ALPHANUMERIC_REGEX = re.compile(r"[^0-9a-z]+")
+
+# minimum trigram similarity for a fuzzy match
+FUZZY_THRESHOLD = 0.3
+
+
+@dataclass
+class NameMatch:
+    """A candidate object for a name resolver query."""
+
+    stix_id: str
+    stix_type: str
+    attack_id: str | None
+    name: str
+    matched: str
+    match_type: str
+    score: float
+
+
+def normalize_term(term: str) -> str:
+    """Normalize a name, alias or ATT&CK ID for matching.
+
+    Matching is case-insensitive and ignores whitespace and punctuation, so "APT 29", "apt29" and "APT-29"
+    all match. Sub-technique IDs are zero padded, so "t1059.1" matches "T1059.001".
+
+    Parameters
+    ----------
+    term : str
+        the term to normalize
+
+    Returns
+    -------
+    str
+        the normalized term
+    """
+    term = term.strip().lower()
+    match = SUBTECHNIQUE_ID_REGEX.match(term)
+    if match:
+        term = f"{match.group(1)}{match.group(2)}.{int(match.group(3)):03d}"
+    return NON_ALPHANUMERIC_REGEX.sub("", term)
+
+
+def get_object_terms(stix_object) -> list:
+    """Get the names, aliases and ATT&CK IDs of a STIX object.
+
+    Parameters
+    ----------
+    stix_object : stix2.v20.sdo._DomainObject | CustomStixObject | dict
+        the STIX object
+
+    Returns
+    -------
+    list
+        list of (term, kind) tuples, where kind is one of "name", "alias" or "attack_id"
+    """
+    terms = []
+    seen = set()
+
+    def add(term, kind):
+        if term and term not in seen:
+            seen.add(term)
+            terms.append((term, kind))
+
+    add(stix_object.get("name"), "name")
+    for alias in stix_object.get("aliases", []) + stix_object.get("x_mitre_aliases", []):
+        add(alias, "alias")
+    for external_reference in stix_object.get("external_references", []):
+        if external_reference.get("source_name") in MITRE_ATTACK_ID_SOURCE_NAMES:
+            add(external_reference.get("external_id"), "attack_id")
+    return terms
+
+
+def _trigrams(key: str) -> set:
+    """Get the trigrams of a normalized term, padded so that short terms have trigrams."""
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class NameResolver:
+    """Ranked lookup of ATT&CK objects by name, alias or ATT&CK ID.
+
+    Exact matches rank first, then prefix matches (found with a trie, shortest completion first), then
+    near-matches found with a trigram index, ranked by trigram similarity.
+    """
+
+    def __init__(self, stix_objects: list):
+        """Build the resolver indexes.
+
+        Parameters
+        ----------
+        stix_objects : list
+            the STIX objects to index
+        """
+        # term index => (normalized key, term, kind, stix object)
+        self._terms = []
+        # normalized key => [term index]
+        self._exact = defaultdict(list)
+        # trie of normalized keys: character => child node, and "" => [term index] for the keys below the node
+        self._trie = {"": []}
+        # trigram => [term index]
+        self._trigrams = defaultdict(list)
+        self._trigram_counts = []
+
+        for stix_object in stix_objects:
+            for term, kind in get_object_terms(stix_object):
+                key = normalize_term(term)
+                if not key:
+                    continue
+                term_index = len(self._terms)
+                self._terms.append((key, term, kind, stix_object))
+                self._exact[key].append(term_index)
+
+                node = self._trie
+                node[""].append(term_index)
+                for character in key:
+                    node = node.setdefault(character, {"": []})
+                    node[""].append(term_index)
+
+                trigrams = _trigrams(key)
+                self._trigram_counts.append(len(trigrams))
+                for trigram in trigrams:
+                    self._trigrams[trigram].append(term_index)
+
+        # shortest completions of a prefix are the best candidates, so keep each trie node sorted by key length
+        nodes = [self._trie]
+        while nodes:
+            node = nodes.pop()
+            node[""].sort(key=lambda term_index: len(self._terms[term_index][0]))
+            nodes.extend(child for character, child in node.items() if character)
+
+    def _find_prefix_node(self, key: str) -> dict | None:
+        """Get the trie node for a normalized prefix."""
+        node = self._trie
+        for character in key:
+            node = node.get(character)
+            if node is None:
+                return None
+        return node
+
+    def _make_match(self, term_index: int, match_type: str, score: float) -> NameMatch:
+        key, term, kind, stix_object = self._terms[term_index]
+        attack_id = next((t for t, k in get_object_terms(stix_object) if k == "attack_id"), None)
+        return NameMatch(
+            stix_id=stix_object["id"],
+            stix_type=stix_object["type"],
+            attack_id=attack_id,
+            name=stix_object.get("name"),
+            matched=term,
+            match_type=match_type,
+            score=score,
+        )
+
+    def resolve(self, query: str, stix_types: list = None, limit: int = 10, fuzzy: bool = True) -> list:
+        """Find the objects best matching a name, alias or ATT&CK ID.
+
+        Parameters
+        ----------
+        query : str
+            the name, alias or ATT&CK ID to look up, or a prefix of one, e.g. "apt 29", "cozy bea" or "t1059.1"
+        stix_types : list, optional
+            only return objects of these STIX types, by default all types
+        limit : int, optional
+            maximum number of candidates to return, by default 10
+        fuzzy : bool, optional
+            include near-matches for misspelled queries, by default True
+
+        Returns
+        -------
+        list
+            list of NameMatch candidates, one per object, best match first. Scores are 3.0 for an exact match,
+            between 2.0 and 3.0 for a prefix match and between 0.0 and 1.0 for a near-match.
+        """
+        key = normalize_term(query)
+        if not key or limit <= 0:
+            return []
+
+        candidates = {}
+
+        def consider(term_index: int, match_type: str, score: float):
+            stix_object = self._terms[term_index][3]
+            if stix_types and stix_object["type"] not in stix_types:
+                return
+            best = candidates.get(stix_object["id"])
+            if best is None or score > best[2]:
+                candidates[stix_object["id"]] = (term_index, match_type, score)
+
+        for term_index in self._exact.get(key, []):
+            consider(term_index, "exact", 3.0)
+
+        node = self._find_prefix_node(key)
+        if node is not None:
+            for term_index in node[""]:
+                if len(candidates) >= limit:
+                    break
+                consider(term_index, "prefix", 2.0 + len(key) / len(self._terms[term_index][0]))
+
+        if fuzzy and len(candidates) < limit:
+            query_trigrams = _trigrams(key)
+            shared = Counter(chain.from_iterable(self._trigrams.get(trigram, ()) for trigram in query_trigrams))
+            for term_index, count in shared.items():
+                # Dice coefficient of the trigram sets
+                score = 2 * count / (len(query_trigrams) + self._trigram_counts[term_index])
+                if score >= FUZZY_THRESHOLD:
+                    consider(term_index, "fuzzy", score)
+
+        ranked = sorted(candidates.values(), key=lambda candidate: (-candidate[2], self._terms[candidate[0]][0]))
+        return [self._make_match(*candidate) for candidate in ranked[:limit]]
@@ -0,0 +1,156 @@
+"""Nearest-neighbor search over the descriptions of ATT&CK objects."""
+
+import re
+import zlib
+
+import numpy as np
+
+CITATION_REGEX = re.compile(r"\(Citation: [^)]*\)")
+TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset(
+    "a an and are as at be been but by can could do for from has have if in into is it its may might not of on or "
+    "such that the their then there these they this to was were which while will with would".split()
+)
+
+
+def tokenize(text: str) -> list:
+    """Split text into lowercase word tokens, ignoring citations and stop words.
+
+    Parameters
+    ----------
+    text : str
+        the text to tokenize
+
+    Returns
+    -------
+    list
+        the tokens of the text
+    """
+    text = CITATION_REGEX.sub(" ", text.lower())
+    return [token for token in TOKEN_REGEX.findall(text) if len(token) > 1 and token not in STOP_WORDS]
+
+
+def get_object_text(stix_object) -> str:
+    """Get the text of a STIX object used for similarity: its name, description and detection."""
+    return " ".join(stix_object.get(field) or "" for field in ("name", "description", "x_mitre_detection"))
+
+
+class SimilarityIndex:
+    """TF-IDF vectors of the text of ATT&CK objects, for finding similar objects.
+
+    Tokens are hashed into a fixed number of features, so the index is a dense (objects x features) NumPy
+    matrix of L2-normalized rows. A nearest-neighbor query is a single matrix-vector product.
+    """
+
+    def __init__(self, stix_objects: list, n_features: int = 2**12):
+        """Build the index.
+
+        Parameters
+        ----------
+        stix_objects : list
+            the STIX objects to index
+        n_features : int, optional
+            number of hashed token features, by default 4096
+        """
+        self.n_features = n_features
+        self.stix_ids = [stix_object["id"] for stix_object in stix_objects]
+        # STIX type of each row, as an index into self._type_names
+        self._type_names = sorted({stix_object["type"] for stix_object in stix_objects})
+        self._types = np.array([self._type_names.index(stix_object["type"]) for stix_object in stix_objects])
+        self._rows = {stix_id: row for row, stix_id in enumerate(self.stix_ids)}
+
+        counts = np.zeros((len(stix_objects), n_features), dtype=np.float32)
+        for row, stix_object in enumerate(stix_objects):
+            features = self._hash_tokens(tokenize(get_object_text(stix_object)))
+            np.add.at(counts[row], features, 1)
+
+        # smoothed inverse document frequency, as in scikit-learn's TfidfTransformer
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(stix_objects)) / (1 + document_frequency)) + 1).astype(np.float32)
+        self.matrix = self._normalize(np.log1p(counts) * self.idf)
+
+    def _hash_tokens(self, tokens: list) -> np.ndarray:
+        """Get the feature of each token, using a hash that is stable between processes."""
+        return np.array([zlib.crc32(token.encode("utf-8")) % self.n_features for token in tokens], dtype=np.int64)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    def vectorize(self, text: str) -> np.ndarray:
+        """Get the normalized TF-IDF vector of text.
+
+        Parameters
+        ----------
+        text : str
+            the text to vectorize
+
+        Returns
+        -------
+        np.ndarray
+            a vector of `n_features` floats
+        """
+        counts = np.zeros(self.n_features, dtype=np.float32)
+        np.add.at(counts, self._hash_tokens(tokenize(text)), 1)
+        return self._normalize(np.log1p(counts) * self.idf)
+
+    def _nearest(self, vector: np.ndarray, stix_types: list, limit: int, exclude_row: int = None) -> list:
+        scores = self.matrix @ vector
+        if stix_types:
+            types = [self._type_names.index(stix_type) for stix_type in stix_types if stix_type in self._type_names]
+            scores[~np.isin(self._types, types)] = -np.inf
+        if exclude_row is not None:
+            scores[exclude_row] = -np.inf
+
+        limit = min(limit, len(scores))
+        if limit <= 0:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.stix_ids[row], float(scores[row])) for row in top if scores[row] > 0]
+
+    def most_similar(self, stix_id: str, stix_types: list = None, limit: int = 10) -> list:
+        """Find the objects most similar to an indexed object.
+
+        Parameters
+        ----------
+        stix_id : str
+            the STIX ID of the object
+        stix_types : list, optional
+            only return objects of these STIX types, by default all types
+        limit : int, optional
+            maximum number of objects to return, by default 10
+
+        Returns
+        -------
+        list
+            list of (stix_id, cosine similarity) tuples, most similar first
+
+        Raises
+        ------
+        KeyError
+            Raised if the object is not in the index
+        """
+        row = self._rows[stix_id]
+        return self._nearest(self.matrix[row], stix_types, limit, exclude_row=row)
+
+    def most_similar_to_text(self, text: str, stix_types: list = None, limit: int = 10) -> list:
+        """Find the objects most similar to text.
+
+        Parameters
+        ----------
+        text : str
+            the text to compare with the indexed objects
+        stix_types : list, optional
+            only return objects of these STIX types, by default all types
+        limit : int, optional
+            maximum number of objects to return, by default 10
+
+        Returns
+        -------
+        list
+            list of (stix_id, cosine similarity) tuples, most similar first
+        """
+        return self._nearest(self.vectorize(text), stix_types, limit)
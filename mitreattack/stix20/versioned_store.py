@@ -0,0 +1,205 @@
+"""Store for multiple ATT&CK releases of a domain that shares unchanged objects between releases."""
+
+import json
+import os
+
+import stix2
+from loguru import logger
+
+from mitreattack.stix20.MitreAttackData import MitreAttackData
+
+
+def _normalize_version(version: str) -> str:
+    """Strip a leading "v" from a release version, e.g. "v14.1" => "14.1"."""
+    version = str(version)
+    return version[1:] if version.startswith("v") else version
+
+
+def _version_key(version: str) -> tuple:
+    """Sort key for release versions, e.g. "9.0" sorts before "14.1"."""
+    return tuple(int(part) if part.isdigit() else part for part in version.split("."))
+
+
+def _iter_bits(bitmap: int):
+    """Yield the position of each set bit in a membership bitmap."""
+    for position, bit in enumerate(bin(bitmap)[:1:-1]):
+        if bit == "1":
+            yield position
+
+
+class VersionedAttackStore:
+    """Multiple releases of an ATT&CK domain, deduplicated by object `(id, modified)`.
+
+    Each distinct object version is parsed and stored once, regardless of how many releases contain it.
+    Membership of each object version in each release is tracked with a bitmap per release, so memory
+    grows with the number of changes between releases rather than with the number of releases.
+
+    Any `MitreAttackData` query can be run against a single release with `as_of()`, e.g.
+    `store.as_of("14.1").get_techniques()`.
+    """
+
+    def __init__(self):
+        """Initialize an empty VersionedAttackStore."""
+        # slot => parsed STIX object
+        self._objects = []
+        # (id, modified) => slot
+        self._slots = {}
+        # release version => bitmap of slots in the release
+        self._membership = {}
+        # release version => MitreAttackData, built on first use
+        self._views = {}
+
+    @classmethod
+    def from_download_dir(cls, download_dir: str, domain: str, versions: list = None):
+        """Build a store from releases downloaded with `download_attack_stix --all`.
+
+        Parameters
+        ----------
+        download_dir : str
+            directory containing one `v<version>/<domain>.json` folder per release
+        domain : str
+            the ATT&CK domain to load, e.g. "enterprise-attack"
+        versions : list, optional
+            the releases to load, by default every release found in `download_dir`
+
+        Returns
+        -------
+        VersionedAttackStore
+            a store containing the loaded releases
+        """
+        store = cls()
+        if versions is None:
+            versions = [
+                entry
+                for entry in os.listdir(download_dir)
+                if os.path.isfile(os.path.join(download_dir, entry, f"{domain}.json"))
+            ]
+        for version in sorted((_normalize_version(v) for v in versions), key=_version_key):
+            store.add_release(version, stix_filepath=os.path.join(download_dir, f"v{version}", f"{domain}.json"))
+        return store
+
+    @property
+    def releases(self) -> list:
+        """Release versions in the store, oldest first."""
+        return sorted(self._membership, key=_version_key)
+
+    def __len__(self) -> int:
+        """Get the number of distinct object versions in the store."""
+        return len(self._objects)
+
+    def add_release(self, version: str, stix_filepath: str = None, bundle: dict = None):
+        """Add a release to the store.
+
+        Parameters
+        ----------
+        version : str
+            the ATT&CK release version, e.g. "14.1"
+        stix_filepath : str, optional
+            Filepath to a STIX 2.0 bundle. Mutually exclusive with `bundle`.
+        bundle : dict, optional
+            A STIX 2.0 bundle that has already been loaded from JSON. Mutually exclusive with `stix_filepath`.
+
+        Raises
+        ------
+        TypeError
+            Raised if neither or both of `stix_filepath` and `bundle` are passed
+        ValueError
+            Raised if the release is already in the store
+        """
+        if not stix_filepath and not bundle:
+            raise TypeError("add_release requires one of `stix_filepath` or `bundle`.")
+        elif stix_filepath and bundle:
+            raise TypeError("add_release cannot be called with both `stix_filepath` and `bundle`.")
+
+        version = _normalize_version(version)
+        if version in self._membership:
+            raise ValueError(f"Release {version} is already in the store")
+
+        if stix_filepath:
+            with open(stix_filepath, "r", encoding="utf-8") as f:
+                bundle = json.load(f)
+
+        bitmap = 0
+        added = 0
+        for stix_object in bundle.get("objects", []):
+            key = (stix_object["id"], stix_object.get("modified", stix_object.get("created")))
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = len(self._objects)
+                self._slots[key] = slot
+                self._objects.append(stix2.parse(stix_object, allow_custom=True))
+                added += 1
+            bitmap |= 1 << slot
+
+        self._membership[version] = bitmap
+        logger.debug(f"Added ATT&CK v{version} to the versioned store ({added} new object versions)")
+
+    def get_release_objects(self, version: str) -> list:
+        """Get every STIX object in a release.
+
+        Parameters
+        ----------
+        version : str
+            the ATT&CK release version, e.g. "14.1"
+
+        Returns
+        -------
+        list
+            the STIX objects of the release
+
+        Raises
+        ------
+        ValueError
+            Raised if the release is not in the store
+        """
+        version = _normalize_version(version)
+        if version not in self._membership:
+            raise ValueError(f"version must be one of {self.releases}")
+        return [self._objects[slot] for slot in _iter_bits(self._membership[version])]
+
+    def as_of(self, version: str) -> MitreAttackData:
+        """Get a MitreAttackData for a single release.
+
+        The underlying STIX objects are shared with every other release that contains them.
+
+        Parameters
+        ----------
+        version : str
+            the ATT&CK release version, e.g. "14.1"
+
+        Returns
+        -------
+        MitreAttackData
+            a MitreAttackData that queries the objects of the release
+
+        Raises
+        ------
+        ValueError
+            Raised if the release is not in the store
+        """
+        version = _normalize_version(version)
+        if version not in self._views:
+            src = stix2.MemoryStore(stix_data=self.get_release_objects(version), allow_custom=True)
+            self._views[version] = MitreAttackData(src=src)
+        return self._views[version]
+
+    def get_object_releases(self, stix_id: str) -> dict:
+        """Get the releases containing each version of an object.
+
+        Parameters
+        ----------
+        stix_id : str
+            the STIX ID of the object
+
+        Returns
+        -------
+        dict
+            a mapping of the object's modified timestamp => list of release versions containing that version of
+            the object, oldest first
+        """
+        object_releases = {}
+        for (object_id, modified), slot in self._slots.items():
+            if object_id != stix_id:
+                continue
+            object_releases[modified] = [version for version in self.releases if self._membership[version] >> slot & 1]
+        return object_releases
@@ -0,0 +1,39 @@
+"""Pools of worker processes that share the data already loaded by the parent process."""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+
+def get_worker_pool(
+    max_workers: int, worker_state: dict, state: dict, initializer: Callable, get_initargs: Callable[[], tuple]
+) -> ProcessPoolExecutor:
+    """Get a pool of worker processes sharing `state` with the current process.
+
+    Where "fork" is the default multiprocessing start method, `state` is added to `worker_state`, a module-level dict
+    that the forked worker processes inherit. Elsewhere, such as on macOS and Windows, forking is unsafe or not
+    available, and each worker process is started with `initializer(*get_initargs())` to load its own copy of the
+    state instead.
+
+    Parameters
+    ----------
+    max_workers : int
+        Number of worker processes
+    worker_state : dict
+        Module-level dict the worker processes read the state from. The caller clears it once the pool is shut down.
+    state : dict
+        State to add to `worker_state` before forking the worker processes
+    initializer : Callable
+        Function that loads the state into `worker_state` in each worker process that is not forked
+    get_initargs : Callable[[], tuple]
+        Function returning the arguments of `initializer`, only called when the worker processes are not forked
+
+    Returns
+    -------
+    ProcessPoolExecutor
+        The pool of worker processes
+    """
+    if multiprocessing.get_start_method() == "fork":
+        worker_state.update(state)
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("fork"))
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=initializer, initargs=get_initargs())
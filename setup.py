@@ -60,4 +60,7 @@ setuptools.setup(
         "typer",
         "xlsxwriter",
     ],
+    extras_require={
+        "arrow": ["pyarrow"],
+    },
 )
@@ -0,0 +1,249 @@
+import json
+from pathlib import Path
+
+import markdown
+import pytest
+from stix2 import MemoryStore
+
+from mitreattack.diffStix.changelog_helper import (
+    AttackChangesEncoder,
+    DiffStix,
+    diff_relationships,
+    get_chained_changelogs,
+    get_new_changelog_md,
+    get_parsed_args,
+    write_changes_json,
+    write_changes_ndjson,
+    write_markdown_files,
+)
+
+ICS_BUNDLE = Path(__file__).parent / "resources" / "ics-bundle.json"
+
+
+@pytest.fixture()
+def ics_releases(tmp_path: Path):
+    """Write an old release of the ICS bundle, and a new release with a few changes."""
+    bundle = json.loads(ICS_BUNDLE.read_text(encoding="utf-8"))
+    old_dir = tmp_path / "old"
+    old_dir.mkdir()
+    (old_dir / "ics-attack.json").write_text(json.dumps(bundle), encoding="utf-8")
+
+    techniques = [
+        stix_object
+        for stix_object in bundle["objects"]
+        if stix_object["type"] == "attack-pattern" and not stix_object.get("x_mitre_deprecated")
+    ]
+    # major version change of a technique, with a new contributor. The objects of this old bundle have no version,
+    # which is read as 0.0
+    techniques[0]["x_mitre_version"] = "1.0"
+    techniques[0]["description"] += "\nA new paragraph."
+    techniques[0]["x_mitre_contributors"] = ["New Contributor"]
+    # deprecation of a technique
+    techniques[1]["x_mitre_deprecated"] = True
+    # deletion of a technique and its relationships
+    deleted_id = techniques[2]["id"]
+    bundle["objects"] = [
+        stix_object
+        for stix_object in bundle["objects"]
+        if deleted_id not in (stix_object["id"], stix_object.get("source_ref"), stix_object.get("target_ref"))
+    ]
+    # dropped mitigation of the changed technique
+    for stix_object in bundle["objects"]:
+        if stix_object.get("relationship_type") == "mitigates" and stix_object["target_ref"] == techniques[0]["id"]:
+            bundle["objects"].remove(stix_object)
+            break
+
+    new_dir = tmp_path / "new"
+    new_dir.mkdir()
+    (new_dir / "ics-attack.json").write_text(json.dumps(bundle), encoding="utf-8")
+    return str(old_dir), str(new_dir)
+
+
+def test_diff_stix_workers(ics_releases):
+    old, new = ics_releases
+    diff_stix = DiffStix(domains=["ics-attack"], old=old, new=new, include_contributors=True)
+    parallel = DiffStix(domains=["ics-attack"], old=old, new=new, include_contributors=True, workers=2)
+
+    changes = diff_stix.data["changes"]["techniques"]["ics-attack"]
+    assert len(changes["major_version_changes"]) == 1
+    assert changes["major_version_changes"][0]["changelog_mitigations"]["dropped"]
+    assert len(changes["deprecations"]) == 1
+    assert len(changes["deletions"]) == 1
+    assert diff_stix.release_contributors == {"New Contributor": 1}
+
+    assert parallel.release_contributors == diff_stix.release_contributors
+    assert parallel.get_markdown_string() == diff_stix.get_markdown_string()
+    assert parallel.get_changes_dict() == diff_stix.get_changes_dict()
+    assert parallel.data["new"]["ics-attack"]["stix_datastore"] is None
+
+
+def test_detailed_diff_is_lazy(ics_releases, tmp_path: Path):
+    old, new = ics_releases
+    diff_stix = DiffStix(domains=["ics-attack"], old=old, new=new, unchanged=True)
+    changes = diff_stix.data["changes"]["techniques"]["ics-attack"]
+    changed_technique = changes["major_version_changes"][0]
+    unchanged_technique = changes["unchanged"][0]
+    assert "detailed_diff" not in changed_technique
+    assert "detailed_diff" not in unchanged_technique
+    assert "description_change_table" not in changed_technique
+    diff_stix.get_markdown_string()
+    assert "description_change_table" not in changed_technique
+
+    # the writers only hold the differences and tables of the section they are writing
+    json_file = tmp_path / "changelog.json"
+    write_changes_json(json_file=str(json_file), diffStix=diff_stix)
+    assert "detailed_diff" not in changed_technique
+    assert "description_change_table" not in changed_technique
+
+    changes_dict = diff_stix.get_changes_dict()
+    assert json_file.read_text() == json.dumps(changes_dict, cls=AttackChangesEncoder, indent=4)
+    detailed_diff = json.loads(changed_technique["detailed_diff"])
+    assert detailed_diff["values_changed"]["root['description']"]
+    assert unchanged_technique["detailed_diff"] == "{}"
+    assert "new&nbsp;paragraph." in changed_technique["description_change_table"]
+    assert "description_change_table" not in unchanged_technique
+
+
+def test_relationship_indexes(ics_releases):
+    old, new = ics_releases
+    diff_stix = DiffStix(domains=["ics-attack"], old=old, new=new)
+    for datastore_version in ["old", "new"]:
+        domain_data = diff_stix.data[datastore_version]["ics-attack"]
+        for relationship_type in ["subtechniques", "mitigations", "detections"]:
+            relationships = domain_data["relationships"][relationship_type]
+            for ref, index in [
+                ("source_ref", domain_data["relationships_by_source"][relationship_type]),
+                ("target_ref", domain_data["relationships_by_target"][relationship_type]),
+            ]:
+                assert sum(len(indexed) for indexed in index.values()) == len(relationships)
+                for stix_id, indexed in index.items():
+                    assert indexed == [r for r in relationships.values() if r[ref] == stix_id]
+
+
+def test_relationship_changes(ics_releases):
+    old, new = ics_releases
+    diff_stix = DiffStix(domains=["ics-attack"], old=old, new=new, unchanged=True)
+    changes = diff_stix.data["changes"]["techniques"]["ics-attack"]
+    changed_technique = changes["major_version_changes"][0]
+    dropped = changed_technique["changelog_relationships"]["dropped"]
+    assert [relationship["relationship_type"] for relationship in dropped] == ["mitigates"]
+    assert dropped[0]["target_ref"] == changed_technique["id"]
+    assert dropped[0]["source"] == changed_technique["changelog_mitigations"]["dropped"][0]
+    # the mitigation is annotated with the same change
+    mitigation = diff_stix.data["new"]["ics-attack"]["attack_objects"]["mitigations"][dropped[0]["source_ref"]]
+    assert mitigation["changelog_relationships"]["dropped"] == dropped
+    # the deleted technique is not annotated, but the objects it was related to are
+    deleted_id = changes["deletions"][0]["id"]
+    relationship_changes = diff_stix.find_relationship_changes(domain="ics-attack")
+    assert deleted_id not in relationship_changes
+    assert any(r["target_ref"] == deleted_id for c in relationship_changes.values() for r in c["dropped"])
+
+    key = ("malware--1", "uses", "attack-pattern--1")
+    assert diff_relationships({key: "a"}, {key: "b"}) == {"new": set(), "dropped": set(), "changed": {key}}
+    assert diff_relationships({key: "a"}, {}) == {"new": set(), "dropped": {key}, "changed": set()}
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_chained_changelogs(ics_releases, tmp_path: Path, workers):
+    old, new = ics_releases
+    # the old release again, to compare the new release with in both directions
+    newest = tmp_path / "newest"
+    newest.mkdir()
+    (newest / "ics-attack.json").write_text((Path(old) / "ics-attack.json").read_text(encoding="utf-8"))
+
+    output_files = {
+        "markdown_file": "changelog.md",
+        "json_file": "changelog.json",
+    }
+    md_strings = get_chained_changelogs(
+        releases=[old, new, str(newest)],
+        domains=["ics-attack"],
+        include_contributors=True,
+        workers=workers,
+        **{key: str(tmp_path / "chained" / "{old}-{new}" / filename) for key, filename in output_files.items()},
+    )
+    assert len(md_strings) == 2
+
+    for (pair_old, pair_new), md_string in zip([(old, new), (new, str(newest))], md_strings):
+        pair = f"{Path(pair_old).name}-{Path(pair_new).name}"
+        assert md_string == get_new_changelog_md(
+            domains=["ics-attack"],
+            layers=None,
+            old=pair_old,
+            new=pair_new,
+            include_contributors=True,
+            **{key: str(tmp_path / "single" / pair / filename) for key, filename in output_files.items()},
+        )
+        for filename in output_files.values():
+            chained_file = tmp_path / "chained" / pair / filename
+            assert chained_file.read_text(encoding="utf-8") == (tmp_path / "single" / pair / filename).read_text(
+                encoding="utf-8"
+            )
+
+
+def test_chained_changelog_files_do_not_collide(ics_releases, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    old, new = ics_releases
+    newest = tmp_path / "newest"
+    # every pair would write the same file
+    with pytest.raises(ValueError, match="markdown_file"):
+        get_chained_changelogs(releases=[old, new, str(newest)], markdown_file=str(tmp_path / "changelog.md"))
+    with pytest.raises(ValueError, match="layers"):
+        get_chained_changelogs(releases=[old, new, str(newest)], layers=["{new}/a.json", "b.json", "{new}/c.json"])
+    # {old} and {new} are replaced by the directory names of the releases
+    with pytest.raises(ValueError, match="different names"):
+        get_chained_changelogs(releases=[old, str(tmp_path / "other" / "old")], markdown_file="{old}-{new}.md")
+
+    monkeypatch.setattr("sys.argv", ["diff_stix", "--releases", old, new, str(newest), "--json-file", "changes.json"])
+    with pytest.raises(SystemExit):
+        get_parsed_args()
+
+
+def test_release_cache(ics_releases, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    old, new = ics_releases
+    cache_dir = str(tmp_path / "cache")
+    diff_stix = DiffStix(domains=["ics-attack"], old=old, new=new, cache_dir=cache_dir)
+    assert len(list((tmp_path / "cache").glob("*/*.pickle"))) == 2
+
+    def load_from_file(*args, **kwargs):
+        raise AssertionError("cached releases are not parsed again")
+
+    monkeypatch.setattr(MemoryStore, "load_from_file", load_from_file)
+    cached = DiffStix(domains=["ics-attack"], old=old, new=new, cache_dir=cache_dir)
+    assert cached.data["new"]["ics-attack"]["stix_datastore"] is None
+    assert cached.get_markdown_string() == diff_stix.get_markdown_string()
+    assert cached.get_changes_dict() == diff_stix.get_changes_dict()
+
+
+def test_streaming_writers(ics_releases, tmp_path: Path):
+    old, new = ics_releases
+    diff_stix = DiffStix(domains=["ics-attack"], old=old, new=new, unchanged=True, show_key=True)
+    markdown_string = diff_stix.get_markdown_string()
+
+    markdown_file = tmp_path / "changelog.md"
+    assert write_markdown_files(diffStix=diff_stix, markdown_file=str(markdown_file)) is None
+    assert markdown_file.read_text() == markdown_string
+    assert write_markdown_files(diffStix=diff_stix, return_markdown=True) == markdown_string
+    # the HTML page is converted from the markdown section by section
+    html_chunks = [markdown.markdown(chunk) for chunk in diff_stix.iter_markdown()]
+    assert "\n".join(chunk for chunk in html_chunks if chunk) == markdown.markdown(markdown_string)
+
+    changes_dict = diff_stix.get_changes_dict()
+    json_file = tmp_path / "changelog.json"
+    write_changes_json(json_file=str(json_file), diffStix=diff_stix)
+    assert json_file.read_text() == json.dumps(changes_dict, cls=AttackChangesEncoder, indent=4)
+
+    ndjson_file = tmp_path / "changelog.ndjson"
+    write_changes_ndjson(ndjson_file=str(ndjson_file), diffStix=diff_stix)
+    lines = [json.loads(line) for line in ndjson_file.read_text().splitlines()]
+    assert lines[-1] == {"new-contributors": changes_dict["new-contributors"]}
+    sections = {}
+    for line in lines[:-1]:
+        sections.setdefault((line["domain"], line["object_type"], line["section"]), []).append(line["stix_object"])
+    assert sections == {
+        (domain, object_type, section): json.loads(json.dumps(stix_objects, cls=AttackChangesEncoder))
+        for domain, object_types in changes_dict.items()
+        if domain != "new-contributors"
+        for object_type, domain_sections in object_types.items()
+        for section, stix_objects in domain_sections.items()
+        if stix_objects
+    }
@@ -1,3 +1,5 @@
+import pytest
+
 from mitreattack.constants import PLATFORMS_LOOKUP
 from mitreattack.stix20 import MitreAttackData
 
@@ -91,6 +93,53 @@ class TestMitreAttackData:
     # Get STIX Object by Value
     # TODO: Finish this section
     ###################################
+    def test_resolve_name(self, mitre_attack_data_enterprise: MitreAttackData):
+        group = mitre_attack_data_enterprise.get_groups(remove_revoked_deprecated=True)[0]
+        group_attack_id = mitre_attack_data_enterprise.get_attack_id(group.id)
+
+        matches = mitre_attack_data_enterprise.resolve_name(group.name.lower().replace(" ", ""))
+        assert matches[0].stix_id == group.id
+        assert matches[0].match_type == "exact"
+
+        matches = mitre_attack_data_enterprise.resolve_name(group_attack_id.lower(), stix_types=["intrusion-set"])
+        assert matches[0].attack_id == group_attack_id
+
+        matches = mitre_attack_data_enterprise.resolve_name(group.name[:-1], limit=50)
+        assert group.id in [m.stix_id for m in matches]
+
+        typo = group.name + "x"
+        matches = mitre_attack_data_enterprise.resolve_name(typo, stix_types=["intrusion-set"], limit=50)
+        assert group.id in [m.stix_id for m in matches]
+
+    def test_extract_entities(self, mitre_attack_data_enterprise: MitreAttackData):
+        group = mitre_attack_data_enterprise.get_groups(remove_revoked_deprecated=True)[0]
+        technique = mitre_attack_data_enterprise.get_techniques(remove_revoked_deprecated=True)[0]
+        technique_attack_id = mitre_attack_data_enterprise.get_attack_id(technique.id)
+
+        text = f"The actor {group.name.upper()} used {technique_attack_id}, but not {technique_attack_id}999."
+        matches = mitre_attack_data_enterprise.extract_entities(text)
+        assert [(m.stix_id, m.text) for m in matches] == [
+            (group.id, group.name.upper()),
+            (technique.id, technique_attack_id),
+        ]
+        assert text[matches[1].start : matches[1].end] == technique_attack_id
+
+        extractor = mitre_attack_data_enterprise.get_entity_extractor()
+        assert extractor.extract_many([text, "nothing here"]) == [matches, []]
+        overlapping = extractor.extract(text, overlapping=True)
+        assert extractor.extract_many([text], workers=2, overlapping=True) == [overlapping]
+
+    def test_similar_objects(self, mitre_attack_data_enterprise: MitreAttackData):
+        technique = mitre_attack_data_enterprise.get_techniques(remove_revoked_deprecated=True)[0]
+
+        similar = mitre_attack_data_enterprise.get_similar_objects(technique.id, limit=5)
+        assert 0 < len(similar) <= 5
+        assert all(s["object"].type == "attack-pattern" and s["object"].id != technique.id for s in similar)
+        assert [s["score"] for s in similar] == sorted((s["score"] for s in similar), reverse=True)
+
+        similar = mitre_attack_data_enterprise.get_objects_similar_to_text(technique.description, limit=1)
+        assert similar[0]["object"].id == technique.id
+
     def test_groups_by_alias(self, mitre_attack_data_enterprise: MitreAttackData):
         # TODO: assert that Dynamite Panda is an alias of APT18
         alias = "Dynamite Panda"
@@ -183,3 +232,35 @@ class TestMitreAttackData:
     def test_all_techniques_used_by_all_software(self, mitre_attack_data_enterprise: MitreAttackData):
         techniques = mitre_attack_data_enterprise.get_all_techniques_used_by_all_software()
         assert techniques
+
+    def test_all_techniques_used_by_all_groups_compact(self, mitre_attack_data_enterprise: MitreAttackData):
+        techniques = mitre_attack_data_enterprise.get_all_techniques_used_by_all_groups()
+        compact = mitre_attack_data_enterprise.get_all_techniques_used_by_all_groups(compact=True)
+        assert set(compact) == set(techniques)
+
+        group_id = next(iter(techniques))
+        assert [(r.id, r.relationship_ids) for r in compact[group_id]] == [
+            (t["object"]["id"], tuple(r["id"] for r in t["relationships"])) for t in techniques[group_id]
+        ]
+        assert compact.get_related_ids(group_id) == [t["object"]["id"] for t in techniques[group_id]]
+
+    ###################################
+    # Columnar Export Section
+    ###################################
+    def test_to_arrow_tables(self, mitre_attack_data_enterprise: MitreAttackData):
+        pytest.importorskip("pyarrow")
+        tables = mitre_attack_data_enterprise.to_arrow_tables()
+        assert set(tables) == set(MitreAttackData.stix_types) | {"relationship"}
+        assert tables["attack-pattern"].num_rows == len(mitre_attack_data_enterprise.get_techniques())
+
+        relationships = tables["relationship"].to_pylist()
+        assert relationships
+        uses = [r for r in relationships if r["relationship_type"] == "uses" and r["source_type"] == "intrusion-set"]
+        assert all(r["source_attack_id"] and r["source_name"] for r in uses)
+
+    def test_to_parquet(self, tmp_path, mitre_attack_data_enterprise: MitreAttackData):
+        pq = pytest.importorskip("pyarrow.parquet")
+        paths = mitre_attack_data_enterprise.to_parquet(tmp_path, remove_revoked_deprecated=True)
+        groups = pq.read_table(paths["intrusion-set"])
+        assert groups.num_rows == len(mitre_attack_data_enterprise.get_groups(remove_revoked_deprecated=True))
+        assert groups.schema.field("aliases")
@@ -1,4 +1,12 @@
+import copy
+import json
+
+import pytest
+
+from mitreattack.stix20 import VersionedAttackStore
+from mitreattack.stix20 import matrix_layout
 from mitreattack.stix20.custom_attack_objects import DataComponent, DataSource, Matrix, StixObjectFactory, Tactic, Asset
+from mitreattack.stix20.matrix_layout import MatrixLayoutCache
 
 
 class TestCustomAttackObjects:
@@ -60,3 +68,54 @@ class TestCustomAttackObjects:
 
         assert asset.name == name
         assert asset.type == "x-mitre-asset"
+
+
+class TestVersionedAttackStore:
+    def test_dedupe_and_as_of(self, stix_file_enterprise_latest):
+        with open(stix_file_enterprise_latest, "r", encoding="utf-8") as f:
+            old_bundle = json.load(f)
+        new_bundle = copy.deepcopy(old_bundle)
+        technique = next(o for o in new_bundle["objects"] if o["type"] == "attack-pattern")
+        technique["modified"] = "2099-01-01T00:00:00.000Z"
+        technique["name"] = "Renamed technique"
+
+        store = VersionedAttackStore()
+        store.add_release("14.0", bundle=old_bundle)
+        store.add_release("v14.1", bundle=new_bundle)
+
+        assert store.releases == ["14.0", "14.1"]
+        assert len(store) == len(old_bundle["objects"]) + 1
+        assert store.as_of("14.0").get_object_by_stix_id(technique["id"])["name"] != "Renamed technique"
+        assert store.as_of("14.1").get_object_by_stix_id(technique["id"])["name"] == "Renamed technique"
+        assert len(store.get_object_releases(technique["id"])) == 2
+
+        with pytest.raises(ValueError):
+            store.as_of("1.0")
+
+
+class TestMatrixLayout:
+    def test_layouts_are_cached(self, memstore_ics_latest, tmp_path):
+        layout_cache = MatrixLayoutCache(memstore_ics_latest, cache_dir=str(tmp_path))
+        layouts = layout_cache.get_layouts()
+
+        assert layouts
+        assert layout_cache.get_layouts() is layouts
+        assert MatrixLayoutCache(memstore_ics_latest).get_layouts() is layouts
+
+        column = layouts[0].columns[0]
+        assert column.tactic["x_mitre_shortname"]
+        assert [technique["name"] for technique in column.techniques] == sorted(
+            technique["name"] for technique in column.techniques
+        )
+
+        windows = layout_cache.get_layouts(["Windows"])
+        assert len(windows[0].columns) == len(layouts[0].columns)
+        for windows_column in windows[0].columns:
+            for technique in windows_column.techniques:
+                assert "windows" in [platform.lower() for platform in technique["x_mitre_platforms"]]
+
+        # a new process only finds the layouts on disk
+        matrix_layout._memory_cache.clear()
+        cached_layouts = MatrixLayoutCache(memstore_ics_latest, cache_dir=str(tmp_path)).get_layouts()
+        assert cached_layouts is not layouts
+        assert cached_layouts == layouts
@@ -1,9 +1,17 @@
+import json
+import pstats
 from pathlib import Path
 
+import pandas as pd
+import pytest
 import stix2
 from loguru import logger
 
-from mitreattack.attackToExcel import attackToExcel
+from mitreattack import worker_pool
+from mitreattack.attackToExcel import attackToExcel, stixToDf
+from mitreattack.attackToExcel.exportProfiler import ExportProfiler
+from mitreattack.stix20 import matrix_layout
+from mitreattack.stix20.matrix_layout import MatrixLayoutCache
 
 # tmp_path is a built-in pytest tixture
 # https://docs.pytest.org/en/7.1.x/how-to/tmp_path.html
@@ -74,4 +82,245 @@ def test_enterprise_legacy(tmp_path: Path):
     assert (excel_folder / f"enterprise-attack-{version}-relationships.xlsx").exists()
     assert (excel_folder / f"enterprise-attack-{version}-mitigations.xlsx").exists()
     assert (excel_folder / f"enterprise-attack-{version}-matrices.xlsx").exists()
-    assert (excel_folder / f"enterprise-attack-{version}-groups.xlsx").exists()
\ No newline at end of file
+    assert (excel_folder / f"enterprise-attack-{version}-groups.xlsx").exists()
+
+
+def test_relationship_citations():
+    """Test relationship citations are collected per object and per relationship sheet"""
+    objects = pd.DataFrame({"ID": ["T1001", "T1002", "T1003"]})
+    relationships = {
+        "procedure examples": pd.DataFrame(
+            {
+                "source ID": ["G0001", "G0002", "G0001"],
+                "target ID": ["T1001", "T1001", "T1002"],
+                "mapping description": ["(Citation: A) and (Citation: B)", "(Citation: A)", float("nan")],
+            }
+        ),
+        "associated mitigations": pd.DataFrame(
+            {
+                "source ID": ["M0001"],
+                "target ID": ["T1002"],
+                "mapping description": ["(Citation: C)"],
+            }
+        ),
+        "citations": pd.DataFrame({"reference": ["A", "B", "C"]}),
+    }
+
+    citations = stixToDf._get_relationship_citations(objects, relationships)
+
+    assert len(citations) == 3
+    # one comma separated group of citations per sheet, including sheets without citations for the object
+    assert sorted(citations[0].split(",")) == ["", "(Citation: A)", "(Citation: B)"]
+    assert citations[0].endswith(",")
+    assert citations[1] == ",(Citation: C)"
+    assert citations[2] == ","
+
+
+def test_stix_index_context(memstore_ics_latest: stix2.MemoryStore):
+    """Test builders sharing a StixIndexContext return the same dataframes as builders indexing the data themselves"""
+    context = stixToDf.StixIndexContext(memstore_ics_latest)
+
+    tactics = memstore_ics_latest.query([stix2.Filter("type", "=", "x-mitre-tactic")])
+    assert len(context.get_objects("x-mitre-tactic")) == len(stixToDf.remove_revoked_deprecated(tactics))
+    for tactic in context.get_objects("x-mitre-tactic"):
+        assert context.tactic_names[tactic["x_mitre_shortname"]] == tactic["name"]
+
+    shared = stixToDf.groupsToDf(memstore_ics_latest, context=context)
+    separate = stixToDf.groupsToDf(memstore_ics_latest)
+    assert shared.keys() == separate.keys()
+    for sheet in shared:
+        pd.testing.assert_frame_equal(shared[sheet], separate[sheet])
+
+    # the matrices are laid out from the objects of the context, as they would be from the data source
+    stix_objects = context.objects_by_id.values()
+    layout_cache = MatrixLayoutCache(memstore_ics_latest, stix_objects=stix_objects)
+    assert layout_cache.key == MatrixLayoutCache(memstore_ics_latest).key
+
+
+def test_build_dataframes_workers(memstore_ics_latest: stix2.MemoryStore):
+    """Test building dataframes in worker processes gives the same dataframes in the same order"""
+    serial = attackToExcel.build_dataframes(src=memstore_ics_latest, domain="ics-attack")
+    parallel = attackToExcel.build_dataframes(src=memstore_ics_latest, domain="ics-attack", workers=2)
+
+    assert list(parallel) == list(serial)
+    for object_type in serial:
+        if object_type == "matrices":
+            for serial_matrix, parallel_matrix in zip(serial["matrices"][0], parallel["matrices"][0]):
+                pd.testing.assert_frame_equal(parallel_matrix["matrix"], serial_matrix["matrix"])
+            continue
+        for sheet in serial[object_type]:
+            pd.testing.assert_frame_equal(parallel[object_type][sheet], serial[object_type][sheet])
+
+
+def test_build_dataframes_workers_without_fork(memstore_ics_latest: stix2.MemoryStore, monkeypatch):
+    """Test worker processes that are not forked load the data themselves"""
+    serial = attackToExcel.build_dataframes(src=memstore_ics_latest, domain="ics-attack")
+    monkeypatch.setattr(worker_pool.multiprocessing, "get_start_method", lambda: "spawn")
+    parallel = attackToExcel.build_dataframes(src=memstore_ics_latest, domain="ics-attack", workers=2)
+
+    for object_type in serial:
+        if object_type != "matrices":
+            for sheet in serial[object_type]:
+                pd.testing.assert_frame_equal(parallel[object_type][sheet], serial[object_type][sheet])
+
+
+def test_export_batch(tmp_path: Path):
+    """Test exporting multiple versions of a domain from a download directory"""
+    bundle = Path(__file__).parent / "resources" / "ics-bundle.json"
+    for version in ["v13.0", "v13.1"]:
+        (tmp_path / "stix" / version).mkdir(parents=True)
+        (tmp_path / "stix" / version / "ics-attack.json").write_text(
+            bundle.read_text(encoding="utf-8"), encoding="utf-8"
+        )
+
+    timings = attackToExcel.export_batch(
+        domains=["ics-attack"],
+        versions=["v13.0", "13.1"],
+        output_dir=str(tmp_path / "excel"),
+        stix_dir=str(tmp_path / "stix"),
+        workers=2,
+    )
+
+    assert [(timing["domain"], timing["version"]) for timing in timings] == [
+        ("ics-attack", "v13.0"),
+        ("ics-attack", "v13.1"),
+    ]
+    for timing in timings:
+        assert timing["total"] >= timing["build"]
+        assert (
+            tmp_path / "excel" / f"ics-attack-{timing['version']}" / f"ics-attack-{timing['version']}.xlsx"
+        ).exists()
+
+
+def test_write_excel_constant_memory(tmp_path: Path, memstore_ics_latest: stix2.MemoryStore):
+    """Test streaming the dataframes into the Excel files gives the same spreadsheets as DataFrame.to_excel"""
+    dataframes = attackToExcel.build_dataframes(src=memstore_ics_latest, domain="ics-attack")
+    expected_files = attackToExcel.write_excel(dataframes=dataframes, domain="ics-attack", output_dir=tmp_path / "pd")
+
+    for workers in (None, 2):
+        written_files = attackToExcel.write_excel(
+            dataframes=dataframes,
+            domain="ics-attack",
+            output_dir=tmp_path / f"streamed-{workers}",
+            constant_memory=True,
+            workers=workers,
+        )
+        assert [Path(fp).name for fp in written_files] == [Path(fp).name for fp in expected_files]
+        for expected_fp, fp in zip(expected_files, written_files):
+            expected_sheets = pd.read_excel(expected_fp, sheet_name=None)
+            sheets = pd.read_excel(fp, sheet_name=None)
+            assert list(sheets) == list(expected_sheets)
+            for sheet_name, sheet in sheets.items():
+                pd.testing.assert_frame_equal(sheet, expected_sheets[sheet_name])
+
+
+def test_write_columnar(tmp_path: Path, memstore_ics_latest: stix2.MemoryStore):
+    """Test writing the dataframes to CSV, Parquet and Feather files with stable column types"""
+    pytest.importorskip("pyarrow")
+    dataframes = attackToExcel.build_dataframes(src=memstore_ics_latest, domain="ics-attack")
+
+    csv_files = attackToExcel.write_csv(dataframes=dataframes, domain="ics-attack", output_dir=tmp_path)
+    parquet_files = attackToExcel.write_parquet(dataframes=dataframes, domain="ics-attack", output_dir=tmp_path)
+    feather_files = attackToExcel.write_feather(dataframes=dataframes, domain="ics-attack", output_dir=tmp_path)
+    assert [Path(fp).stem for fp in csv_files] == [Path(fp).stem for fp in parquet_files]
+    assert [Path(fp).stem for fp in csv_files] == [Path(fp).stem for fp in feather_files]
+
+    output_dir = tmp_path / "ics-attack"
+    techniques = pd.read_parquet(output_dir / "ics-attack-techniques.parquet")
+    pd.testing.assert_frame_equal(techniques, pd.read_feather(output_dir / "ics-attack-techniques.feather"))
+    assert list(techniques["ID"]) == list(dataframes["techniques"]["techniques"]["ID"])
+    assert isinstance(techniques["platforms"].dtype, pd.CategoricalDtype)
+    assert isinstance(techniques["description"].dtype, pd.StringDtype)
+
+    relationships = pd.read_csv(output_dir / "ics-attack-relationships.csv")
+    assert len(relationships) == len(dataframes["relationships"]["relationships"])
+    assert (output_dir / "ics-attack-techniques-procedure-examples.parquet").exists()
+    assert (output_dir / "ics-attack-citations.parquet").exists()
+
+
+def test_build_dataframes_cache(tmp_path: Path, memstore_ics_latest: stix2.MemoryStore, monkeypatch):
+    """Test cached dataframes are reused, and only the ATT&CK types affected by a change are built again"""
+
+    def assert_dataframes_equal(dataframes, expected):
+        assert list(dataframes) == list(expected)
+        for object_type in expected:
+            if object_type == "matrices":
+                for matrix, expected_matrix in zip(dataframes["matrices"][0], expected["matrices"][0]):
+                    pd.testing.assert_frame_equal(matrix["matrix"], expected_matrix["matrix"])
+                continue
+            assert list(dataframes[object_type]) == list(expected[object_type])
+            for sheet in expected[object_type]:
+                pd.testing.assert_frame_equal(dataframes[object_type][sheet], expected[object_type][sheet])
+
+    cache_dir = tmp_path / "cache"
+    expected = attackToExcel.build_dataframes(src=memstore_ics_latest, domain="ics-attack")
+    # the matrix layouts are cached on disk too, unless they are found in memory first
+    matrix_layout._memory_cache.clear()
+    assert_dataframes_equal(
+        attackToExcel.build_dataframes(src=memstore_ics_latest, domain="ics-attack", cache_dir=cache_dir), expected
+    )
+    assert list((cache_dir / "matrix-layouts").glob("*.pickle"))
+
+    built_types = []
+    build_object_dataframes = attackToExcel._build_object_dataframes
+
+    def record_build(object_type, *args, **kwargs):
+        built_types.append(object_type)
+        return build_object_dataframes(object_type, *args, **kwargs)
+
+    monkeypatch.setattr(attackToExcel, "_build_object_dataframes", record_build)
+    cached = attackToExcel.build_dataframes(src=memstore_ics_latest, domain="ics-attack", cache_dir=cache_dir)
+    assert built_types == []
+    assert_dataframes_equal(cached, expected)
+
+    # a new version of a mitigation only affects the dataframes that include mitigations or their relationships
+    objects = list(memstore_ics_latest.query())
+    mitigation = next(stix_object for stix_object in objects if stix_object["type"] == "course-of-action")
+    objects[objects.index(mitigation)] = mitigation.new_version(description="An updated description")
+    src = stix2.MemoryStore(stix_data=objects)
+    rebuilt = attackToExcel.build_dataframes(src=src, domain="ics-attack", cache_dir=cache_dir)
+    assert "mitigations" in built_types
+    assert not {"tactics", "groups", "matrices"} & set(built_types)
+    monkeypatch.undo()
+    assert_dataframes_equal(rebuilt, attackToExcel.build_dataframes(src=src, domain="ics-attack"))
+
+
+def test_compact_dataframes(memstore_ics_latest: stix2.MemoryStore):
+    """Test repetitive columns are categorical and relationship descriptions are shared between dataframes"""
+    dataframes = attackToExcel.build_dataframes(src=memstore_ics_latest, domain="ics-attack")
+    relationships = dataframes["relationships"]["relationships"]
+    for column in ["mapping type", "source type", "target type", "source name", "target name"]:
+        assert isinstance(relationships[column].dtype, pd.CategoricalDtype)
+    assert isinstance(dataframes["techniques"]["techniques"]["platforms"].dtype, pd.CategoricalDtype)
+
+    procedure_examples = dataframes["techniques"]["procedure examples"]
+    row = procedure_examples.dropna(subset=["mapping description"]).iloc[0]
+    shared = relationships.loc[relationships["STIX ID"] == row["STIX ID"], "mapping description"].iloc[0]
+    assert shared is row["mapping description"]
+
+
+def test_export_profile(tmp_path: Path, memstore_ics_latest: stix2.MemoryStore):
+    """Test the stages of an export are recorded in the profile report"""
+    with ExportProfiler(cprofile_path=str(tmp_path / "export.prof")) as profiler:
+        attackToExcel.export(
+            domain="ics-attack", version="v15.1", output_dir=str(tmp_path), mem_store=memstore_ics_latest
+        )
+    profiler.write_report(str(tmp_path / "report.json"))
+
+    report = json.loads((tmp_path / "report.json").read_text())
+    stages = {stage["name"]: stage for stage in report["stages"]}
+    assert list(stages) == ["build_dataframes", "write_excel"]
+    for stage in report["stages"]:
+        assert 0 <= stage["cpu_time"]
+        assert 0 <= stage["wall_time"] <= report["wall_time"]
+        assert stage["start_memory"] <= stage["peak_memory"] <= report["peak_memory"]
+
+    builders = [stage["name"] for stage in stages["build_dataframes"]["stages"]]
+    assert builders[:2] == ["StixIndexContext", "relationshipsToDf"]
+    assert {"techniquesToDf", "matricesToDf", "datasourcesToDf"} <= set(builders)
+    workbooks = stages["write_excel"]["stages"][0]
+    assert workbooks["file"] == "ics-attack-v15.1.xlsx"
+    assert "ics-attack-v15.1-techniques.xlsx" in [stage.get("file") for stage in workbooks["stages"]]
+    assert "citations" in [stage["name"] for stage in workbooks["stages"]]
+
+    assert pstats.Stats(str(tmp_path / "export.prof")).total_calls > 0